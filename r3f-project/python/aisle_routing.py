@@ -0,0 +1,597 @@
+#!/usr/bin/env python3
+"""
+Aisle graph and pick-path distances for a bay
+
+Derives the walkable floor from a bay file and precomputes walking distances
+between every rack section, so pick lists can be costed in bulk:
+
+    1. Occupancy grid  the bay floor (floor_grid, else building_outline, else
+                       rack extents + margin) rasterized at cell_size. A cell
+                       is blocked when its center lies inside a rack footprint
+                       grown by clearance, or inside a zone in blocked_zones.
+    2. Aisle graph     free cells, 8-connected. Diagonal steps cost
+                       sqrt(2) cells and may not cut a blocked corner.
+    3. Access points   per rack section, the first free cell in front of each
+                       long face (only the front face when the rack has
+                       "facing"), at the middle of the section's span.
+    4. Distances       one multi-source Dijkstra per section, seeded with all
+                       of its access points, read off at every other section
+                       and depot (doors, loading docks). Feet; inf where a
+                       section has no reachable access point.
+
+The distance matrix is cached under cache_dir, keyed by a hash of the layout,
+the RoutingConfig and this module's source. Point-to-point paths (e.g. for
+drawing a route) use A* with an LRU cache.
+
+Reads generator output (racks[].bounds, containers[].row) and the viewer
+template schema (racks[].position/dimensions/facing, containers[].rack).
+
+Usage:
+    python aisle_routing.py output/bldg22_bay3E_containers.json --show-grid
+    python aisle_routing.py ../src/data/BLDG-template-Bay00.json --picks picks.json --start dock-01
+
+    table = load_or_build(bay_dict)
+    table.route_lengths([["3E01A1A", "3E05C2B"], ...], start="dock-01", order="nearest")
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+# (dz, dx) steps of the 8-connected grid
+STEPS = ((0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+Rect = Tuple[float, float, float, float]   # min_x, max_x, min_z, max_z
+
+
+@dataclass(frozen=True)
+class RoutingConfig:
+    cell_size: float = 1.0       # feet per grid cell
+    clearance: float = 0.0       # racks are grown by this much before rasterizing
+    margin: float = 5.0          # walkable border around the racks when the bay has no floor
+    reach: float = 3.0           # how far in front of a face to look for a free access cell
+    blocked_zones: Tuple[str, ...] = ()   # zone ids or labels that cannot be walked through
+
+
+# ============================================================================
+# LAYOUT
+# ============================================================================
+
+@dataclass
+class RackFootprint:
+    row: str
+    rect: Rect
+    sections: Dict[str, Tuple[float, float]]    # section -> span along the long axis
+    facing: Optional[Tuple[int, int]] = None     # XZ normal of the front face
+
+    @property
+    def long_axis(self) -> str:
+        min_x, max_x, min_z, max_z = self.rect
+        return 'x' if max_x - min_x >= max_z - min_z else 'z'
+
+
+@dataclass
+class Layout:
+    floor: Rect
+    racks: List[RackFootprint]
+    obstacles: List[Rect] = field(default_factory=list)
+    depots: Dict[str, Tuple[float, float]] = field(default_factory=dict)   # id -> (x, z)
+
+
+def _rack_ref(value) -> str:
+    value = str(value)
+    return value[1:] if value.startswith('R') else value
+
+
+def _box_rect(item: dict) -> Rect:
+    p, d = item['position'], item['dimensions']
+    return p['x'], p['x'] + d['x'], p['z'], p['z'] + d['z']
+
+
+def _box_center(item: dict) -> Tuple[float, float]:
+    min_x, max_x, min_z, max_z = _box_rect(item)
+    return (min_x + max_x) / 2, (min_z + max_z) / 2
+
+
+def location_key(row: str, section: str) -> str:
+    return f"{row}-{section}"
+
+
+def load_layout(bay: dict, config: RoutingConfig = RoutingConfig()) -> Layout:
+    """Rack footprints, section spans, floor, obstacles and depots of a bay dict"""
+    racks: Dict[str, RackFootprint] = {}
+    declared_sections: Dict[str, List[str]] = {}
+    for r in bay.get('racks', []):
+        if 'bounds' in r:   # generator output
+            lo, hi = r['bounds']['min'], r['bounds']['max']
+            row, rect = str(r['row']), (lo['x'], hi['x'], lo['z'], hi['z'])
+        else:               # viewer template
+            row, rect = _rack_ref(r['rack_number']), _box_rect(r)
+        facing = tuple(r['facing']) if r.get('facing') else None
+        racks[row] = RackFootprint(row, rect, {}, facing)
+        declared_sections[row] = list(r.get('sections', []))
+
+    # Section spans along each rack's long axis, from the containers
+    for c in bay.get('containers', []):
+        rack = racks.get(_rack_ref(c.get('row', c.get('rack'))))
+        if rack is None:
+            continue
+        axis = rack.long_axis
+        lo = c['position'][axis]
+        hi = lo + c['dimensions'][axis]
+        span = rack.sections.get(c['section'])
+        rack.sections[c['section']] = (lo, hi) if span is None else (min(span[0], lo), max(span[1], hi))
+
+    # Racks without containers: split the long side evenly between the declared sections
+    for row, rack in racks.items():
+        names = declared_sections[row]
+        if rack.sections or not names:
+            continue
+        min_x, max_x, min_z, max_z = rack.rect
+        lo, hi = (min_x, max_x) if rack.long_axis == 'x' else (min_z, max_z)
+        step = (hi - lo) / len(names)
+        rack.sections = {s: (lo + i * step, lo + (i + 1) * step) for i, s in enumerate(names)}
+
+    if bay.get('floor_grid'):
+        floor = _box_rect(bay['floor_grid'])
+    elif bay.get('building_outline'):
+        floor = _box_rect(bay['building_outline'])
+    elif racks:
+        m = config.margin
+        floor = (min(r.rect[0] for r in racks.values()) - m, max(r.rect[1] for r in racks.values()) + m,
+                 min(r.rect[2] for r in racks.values()) - m, max(r.rect[3] for r in racks.values()) + m)
+    else:
+        floor = (0.0, 0.0, 0.0, 0.0)
+
+    blocked = set(config.blocked_zones)
+    obstacles = [_box_rect(z) for z in bay.get('zones', [])
+                 if z.get('id') in blocked or z.get('label') in blocked]
+    depots = {d['id']: _box_center(d) for d in bay.get('doors', []) + bay.get('loading_docks', [])}
+    return Layout(floor, list(racks.values()), obstacles, depots)
+
+
+def container_locations(bay: dict) -> Dict[str, str]:
+    """Container id -> location key (rack row + section)"""
+    return {c['id']: location_key(_rack_ref(c.get('row', c.get('rack'))), c['section'])
+            for c in bay.get('containers', [])}
+
+
+# ============================================================================
+# OCCUPANCY GRID
+# ============================================================================
+
+class OccupancyGrid:
+    """Floor rasterized into cells (row-major over z, then x); blocked[j, i]"""
+
+    def __init__(self, floor: Rect, cell_size: float):
+        min_x, max_x, min_z, max_z = floor
+        self.origin = (min_x, min_z)
+        self.cell = cell_size
+        self.nx = max(1, math.ceil((max_x - min_x) / cell_size))
+        self.nz = max(1, math.ceil((max_z - min_z) / cell_size))
+        self.blocked = np.zeros((self.nz, self.nx), dtype=bool)
+        self.xs = min_x + (np.arange(self.nx) + 0.5) * cell_size   # cell centers
+        self.zs = min_z + (np.arange(self.nz) + 0.5) * cell_size
+
+    @classmethod
+    def rasterize(cls, layout: Layout, config: RoutingConfig) -> 'OccupancyGrid':
+        grid = cls(layout.floor, config.cell_size)
+        g = config.clearance
+        for rack in layout.racks:
+            min_x, max_x, min_z, max_z = rack.rect
+            grid.block((min_x - g, max_x + g, min_z - g, max_z + g))
+        for rect in layout.obstacles:
+            grid.block(rect)
+        return grid
+
+    def __len__(self) -> int:
+        return self.nx * self.nz
+
+    def block(self, rect: Rect):
+        min_x, max_x, min_z, max_z = rect
+        cols = (self.xs >= min_x) & (self.xs <= max_x)
+        rows = (self.zs >= min_z) & (self.zs <= max_z)
+        self.blocked[np.ix_(rows, cols)] = True
+
+    def cell_of(self, x: float, z: float) -> Optional[int]:
+        i = math.floor((x - self.origin[0]) / self.cell)
+        j = math.floor((z - self.origin[1]) / self.cell)
+        if 0 <= i < self.nx and 0 <= j < self.nz:
+            return j * self.nx + i
+        return None
+
+    def point_of(self, cell: int) -> Tuple[float, float]:
+        j, i = divmod(cell, self.nx)
+        return float(self.xs[i]), float(self.zs[j])
+
+    def is_free(self, cell: Optional[int]) -> bool:
+        return cell is not None and not self.blocked.flat[cell]
+
+    def nearest_free(self, x: float, z: float) -> Optional[int]:
+        free = np.flatnonzero(~self.blocked.ravel())
+        if not free.size:
+            return None
+        j, i = np.divmod(free, self.nx)
+        return int(free[np.argmin((self.xs[i] - x) ** 2 + (self.zs[j] - z) ** 2)])
+
+
+def access_cells(rack: RackFootprint, grid: OccupancyGrid,
+                 config: RoutingConfig) -> Dict[str, List[int]]:
+    """Section -> free cells in front of the rack's faces (front face only when facing is set)"""
+    min_x, max_x, min_z, max_z = rack.rect
+    if rack.long_axis == 'z':
+        faces = [((-1, 0), min_x), ((1, 0), max_x)]
+    else:
+        faces = [((0, -1), min_z), ((0, 1), max_z)]
+    if rack.facing is not None:
+        faces = [f for f in faces if f[0] == rack.facing] or faces
+
+    step = config.cell_size / 2
+    offsets = np.arange(config.clearance + step, config.reach + step, step)
+    out: Dict[str, List[int]] = {}
+    for section, (lo, hi) in rack.sections.items():
+        middle = (lo + hi) / 2
+        cells = []
+        for (nx, nz), face in faces:
+            for d in offsets:
+                x, z = (face + nx * d, middle) if nx else (middle, face + nz * d)
+                cell = grid.cell_of(x, z)
+                if grid.is_free(cell):
+                    cells.append(cell)
+                    break
+        out[section] = cells
+    return out
+
+
+# ============================================================================
+# AISLE GRAPH
+# ============================================================================
+
+class AisleGraph:
+    """Free grid cells, 8-connected, edge weights in feet"""
+
+    def __init__(self, grid: OccupancyGrid):
+        self.grid = grid
+        free = ~grid.blocked
+        nz, nx = free.shape
+        self.adjacency: List[List[Tuple[int, float]]] = [[] for _ in range(len(grid))]
+
+        for dz, dx in STEPS:
+            # Source cells whose step (dz, dx) stays on the grid
+            zs = slice(max(0, -dz), nz - max(0, dz))
+            xs = slice(max(0, -dx), nx - max(0, dx))
+            ok = free[zs, xs] & free[zs.start + dz:zs.stop + dz, xs.start + dx:xs.stop + dx]
+            if dz and dx:   # no corner cutting
+                ok &= free[zs.start + dz:zs.stop + dz, xs] & free[zs, xs.start + dx:xs.stop + dx]
+            weight = grid.cell * (math.sqrt(2) if dz and dx else 1.0)
+            j, i = np.nonzero(ok)
+            src = (j + zs.start) * nx + (i + xs.start)
+            for u in src.tolist():
+                self.adjacency[u].append((u + dz * nx + dx, weight))
+
+        self.edge_count = sum(len(a) for a in self.adjacency)
+        self.path = lru_cache(maxsize=4096)(self._astar)
+
+    def dijkstra(self, sources: Iterable[int], targets: Iterable[int] = None) -> np.ndarray:
+        """
+        Distance in feet from the nearest source to every cell (inf when unreachable).
+
+        With targets, stops once every target cell is settled; only the
+        targets' distances are final then.
+        """
+        dist = [math.inf] * len(self.adjacency)
+        heap = []
+        for s in sources:
+            dist[s] = 0.0
+            heap.append((0.0, s))
+        heapq.heapify(heap)
+        pending = None if targets is None else set(targets)
+        adjacency = self.adjacency
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            if pending is not None:
+                pending.discard(u)
+                if not pending:
+                    break
+            for v, w in adjacency[u]:
+                nd = d + w
+                if nd < dist[v]:
+                    dist[v] = nd
+                    heapq.heappush(heap, (nd, v))
+        return np.array(dist)
+
+    def _astar(self, start: int, goal: int) -> Tuple[float, Tuple[int, ...]]:
+        """(length in feet, cells) of a shortest path, octile heuristic"""
+        nx, cell = self.grid.nx, self.grid.cell
+        gz, gx = divmod(goal, nx)
+
+        def h(u: int) -> float:
+            z, x = divmod(u, nx)
+            a, b = abs(x - gx), abs(z - gz)
+            return cell * (max(a, b) + (math.sqrt(2) - 1) * min(a, b))
+
+        best = {start: 0.0}
+        came_from = {start: -1}
+        heap = [(h(start), 0.0, start)]
+        while heap:
+            _, d, u = heapq.heappop(heap)
+            if u == goal:
+                path = [u]
+                while came_from[path[-1]] != -1:
+                    path.append(came_from[path[-1]])
+                return d, tuple(reversed(path))
+            if d > best[u]:
+                continue
+            for v, w in self.adjacency[u]:
+                nd = d + w
+                if nd < best.get(v, math.inf):
+                    best[v] = nd
+                    came_from[v] = u
+                    heapq.heappush(heap, (nd + h(v), nd, v))
+        return math.inf, ()
+
+
+# ============================================================================
+# DISTANCE TABLE
+# ============================================================================
+
+class PickDistances:
+    """
+    Walking distances (feet) between rack sections and depots.
+
+    keys are location keys ("01-A") followed by depot ids; names passed to
+    the lookup methods can be keys or container ids (via container_locations).
+    """
+
+    def __init__(self, keys: List[str], matrix: np.ndarray, locations: Dict[str, str] = None):
+        self.keys = keys
+        self.matrix = matrix
+        self.index = {k: i for i, k in enumerate(keys)}
+        if locations:
+            self.index.update((cid, self.index[key]) for cid, key in locations.items() if key in self.index)
+
+    def resolve(self, name: str) -> int:
+        try:
+            return self.index[name]
+        except KeyError:
+            raise KeyError(f"Unknown location '{name}'") from None
+
+    def distance(self, a: str, b: str) -> float:
+        return float(self.matrix[self.resolve(a), self.resolve(b)])
+
+    def nearest_order(self, picks: Sequence[int], start: Optional[int] = None) -> List[int]:
+        """
+        Greedy visiting order: always walk to the closest remaining location.
+
+        Without start the route begins at picks[0]. Repeated picks are visited
+        once, and ties go to the earlier pick in the list.
+        """
+        # dict.fromkeys de-duplicates in list order; np.unique would sort by index
+        remaining = np.fromiter(dict.fromkeys(int(p) for p in picks), dtype=np.intp)
+        if not remaining.size:
+            return []
+        order = []
+        current = start
+        if current is None:
+            current, remaining = remaining[0], remaining[1:]
+            order.append(int(current))
+        while remaining.size:
+            k = int(np.argmin(self.matrix[current, remaining]))
+            current = remaining[k]
+            order.append(int(current))
+            remaining = np.delete(remaining, k)
+        return order
+
+    def route_lengths(self, pick_lists: Sequence[Sequence[str]], start: Optional[str] = None,
+                      end: Optional[str] = None, order: str = 'given') -> np.ndarray:
+        """
+        Walking distance of each pick list, in feet.
+
+        Routes start at start (a depot or location) if given, visit the picks
+        (in list order, or nearest-first with order='nearest') and end at end,
+        which defaults to start. inf where some pick is unreachable.
+        """
+        if order not in ('given', 'nearest'):
+            raise ValueError(f"Unknown order '{order}', expected 'given' or 'nearest'")
+        first = None if start is None else self.resolve(start)
+        last = first if end is None else self.resolve(end)
+        resolve = self.index.__getitem__
+
+        a_parts, b_parts, owners = [], [], []
+        for n, picks in enumerate(pick_lists):
+            try:
+                stops = [resolve(p) for p in picks]
+            except KeyError as e:
+                raise KeyError(f"Unknown location {e} in pick list {n}") from None
+            if order == 'nearest':
+                stops = self.nearest_order(stops, first)
+            if first is not None:
+                stops.insert(0, first)
+            if last is not None:
+                stops.append(last)
+            if len(stops) > 1:
+                a_parts.append(stops[:-1])
+                b_parts.append(stops[1:])
+                owners.append(np.full(len(stops) - 1, n))
+
+        if not owners:
+            return np.zeros(len(pick_lists))
+        a, b = np.concatenate(a_parts), np.concatenate(b_parts)
+        return np.bincount(np.concatenate(owners), weights=self.matrix[a, b], minlength=len(pick_lists))
+
+    def save(self, path: str):
+        np.savez_compressed(path, version=FORMAT_VERSION, keys=np.array(self.keys), matrix=self.matrix)
+
+    @classmethod
+    def load(cls, path: str, locations: Dict[str, str] = None) -> 'PickDistances':
+        with np.load(path) as data:
+            if int(data['version']) != FORMAT_VERSION:
+                raise ValueError(f"Unsupported route table version {int(data['version'])}")
+            return cls(data['keys'].tolist(), data['matrix'], locations)
+
+
+def build_distances(layout: Layout, config: RoutingConfig = RoutingConfig(),
+                    graph: AisleGraph = None) -> Tuple[PickDistances, dict]:
+    """Distance table for a layout, plus build stats"""
+    if graph is None:
+        graph = AisleGraph(OccupancyGrid.rasterize(layout, config))
+    grid = graph.grid
+
+    keys: List[str] = []
+    sources: List[List[int]] = []
+    for rack in layout.racks:
+        for section, cells in access_cells(rack, grid, config).items():
+            keys.append(location_key(rack.row, section))
+            sources.append(cells)
+    for depot, (x, z) in layout.depots.items():
+        cell = grid.cell_of(x, z)
+        cell = cell if grid.is_free(cell) else grid.nearest_free(x, z)
+        keys.append(depot)
+        sources.append([] if cell is None else [cell])
+
+    # Access cells grouped by owner, for reading each Dijkstra result off in one reduceat
+    owners = np.repeat(np.arange(len(keys)), [len(s) for s in sources])
+    cells = np.array([c for s in sources for c in s], dtype=np.intp)
+    starts = np.searchsorted(owners, np.arange(len(keys)))
+    has_access = np.array([bool(s) for s in sources])
+
+    # Distances are symmetric: the Dijkstra from location k only has to settle
+    # the access cells of locations after it, and can stop there
+    matrix = np.full((len(keys), len(keys)), np.inf)
+    for k, seeds in enumerate(sources):
+        later = has_access[k + 1:]
+        if not seeds or not later.any():
+            continue
+        dist = graph.dijkstra(seeds, targets=cells[starts[k + 1]:].tolist())
+        columns = np.flatnonzero(later) + k + 1
+        matrix[k, columns] = matrix[columns, k] = np.minimum.reduceat(dist[cells], starts[columns])
+    np.fill_diagonal(matrix, 0.0)
+
+    stats = {
+        "grid": (grid.nx, grid.nz),
+        "free_cells": int((~grid.blocked).sum()),
+        "edges": graph.edge_count,
+        "locations": len(keys) - len(layout.depots),
+        "depots": len(layout.depots),
+        "no_access": [k for k, s in zip(keys, sources) if not s],
+    }
+    return PickDistances(keys, matrix.astype(np.float32)), stats
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+def cache_key(layout: Layout, config: RoutingConfig) -> str:
+    h = hashlib.sha256()
+    h.update(json.dumps([asdict(layout), asdict(config)], sort_keys=True).encode())
+    with open(os.path.abspath(__file__), 'rb') as f:
+        h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def load_or_build(bay: dict, config: RoutingConfig = RoutingConfig(),
+                  cache_dir: str = '.route_cache') -> PickDistances:
+    """Distance table for a bay dict, from cache_dir when the layout was seen before"""
+    layout = load_layout(bay, config)
+    locations = container_locations(bay)
+    path = os.path.join(cache_dir, f"routes_{cache_key(layout, config)}.npz")
+    if os.path.exists(path):
+        return PickDistances.load(path, locations)
+    table, _ = build_distances(layout, config)
+    os.makedirs(cache_dir, exist_ok=True)
+    table.save(path)
+    return PickDistances(table.keys, table.matrix, locations)
+
+
+def render_grid(grid: OccupancyGrid, marks: Iterable[int] = ()) -> str:
+    """ASCII map, north (max z) at the top: '#' blocked, '.' free, 'o' access point"""
+    chars = np.where(grid.blocked, '#', '.')
+    for cell in marks:
+        chars.flat[cell] = 'o'
+    return '\n'.join(''.join(row) for row in chars[::-1])
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Aisle graph and pick-path distances for a bay')
+    parser.add_argument('bay_file', help='*_containers.json or a viewer bay JSON')
+    parser.add_argument('--cell-size', type=float, default=1.0, help='Grid cell in feet (default: 1.0)')
+    parser.add_argument('--clearance', type=float, default=0.0,
+                        help='Feet added around racks before rasterizing (default: 0)')
+    parser.add_argument('--block-zone', action='append', default=[],
+                        help='Zone id or label that cannot be walked through (repeatable)')
+    parser.add_argument('--cache-dir', default='.route_cache', help='Distance table cache')
+    parser.add_argument('--show-grid', action='store_true', help='Print the occupancy grid')
+    parser.add_argument('--picks', default=None,
+                        help='JSON list of pick lists (container ids or "row-section" keys)')
+    parser.add_argument('--start', default=None, help='Depot or location each route starts and ends at')
+    parser.add_argument('--order', choices=['given', 'nearest'], default='given',
+                        help='Visit picks in list order or nearest-first (default: given)')
+    args = parser.parse_args()
+
+    with open(args.bay_file) as f:
+        bay = json.load(f)
+    config = RoutingConfig(cell_size=args.cell_size, clearance=args.clearance,
+                           blocked_zones=tuple(args.block_zone))
+
+    layout = load_layout(bay, config)
+    graph = AisleGraph(OccupancyGrid.rasterize(layout, config))
+    path = os.path.join(args.cache_dir, f"routes_{cache_key(layout, config)}.npz")
+    start = time.perf_counter()
+    if os.path.exists(path):
+        table = PickDistances.load(path, container_locations(bay))
+        source = f"loaded from {path}"
+    else:
+        table, stats = build_distances(layout, config, graph)
+        os.makedirs(args.cache_dir, exist_ok=True)
+        table.save(path)
+        table = PickDistances(table.keys, table.matrix, container_locations(bay))
+        source = f"built in {time.perf_counter() - start:.2f} s -> {path}"
+
+    grid = graph.grid
+    sections = len(table.keys) - len(layout.depots)
+    print(f"{os.path.basename(args.bay_file)}: {len(layout.racks)} racks, {sections} sections, "
+          f"{len(layout.depots)} depots")
+    print(f"  grid {grid.nx} x {grid.nz} @ {config.cell_size} ft, {int((~grid.blocked).sum())} free cells, "
+          f"{graph.edge_count} edges")
+    print(f"  distances {source}")
+    others = ~np.eye(len(table.keys), dtype=bool)
+    unreachable = [k for k, row, mask in zip(table.keys, table.matrix, others) if np.isinf(row[mask]).all()]
+    if unreachable:
+        print(f"  {len(unreachable)} without a reachable access point: {', '.join(unreachable[:8])}"
+              f"{', ...' if len(unreachable) > 8 else ''}")
+    finite = table.matrix[np.isfinite(table.matrix)]
+    print(f"  longest walk between two locations {finite.max():.1f} ft")
+
+    if args.show_grid:
+        marks = [c for rack in layout.racks for cells in access_cells(rack, graph.grid, config).values()
+                 for c in cells]
+        print(render_grid(graph.grid, marks))
+
+    if args.picks:
+        with open(args.picks) as f:
+            pick_lists = json.load(f)
+        lengths = table.route_lengths(pick_lists, start=args.start, order=args.order)
+        for n, (picks, length) in enumerate(zip(pick_lists, lengths)):
+            print(f"  route {n}: {len(picks)} picks, {length:.1f} ft")
+
+
+if __name__ == '__main__':
+    main()
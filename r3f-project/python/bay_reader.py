@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Lazy reader for generated bay files (*_containers.json / .jsonl)
+
+json.load on a bay file parses and holds every container even when a script
+only needs one rack. BayFile instead scans the file once, streaming, and
+keeps a sidecar offset index next to it:
+
+    bldg22_bay3E_containers.json.idx.json   header, racks/errors/diagnostics, and
+                                            per rack the byte ranges of its containers
+    bldg22_bay3E_containers.json.geom.npy   float64 (N, 6): position xyz, dimensions
+                                            xyz per container, in file order
+
+Sidecars are named after the full file name, so a .json and a .jsonl of the
+same bay in one folder each keep their own index.
+
+Later opens read only the index. bay.rack('01') seeks to that rack's byte
+range and parses just those containers; bay.positions / bay.dimensions are
+views of the memory-mapped geometry array. The index is rebuilt whenever the
+bay file's size or mtime changes.
+
+Containers of one rack are normally contiguous in generator output, so a rack
+is a single read. If they are not, the rack has one range per run.
+
+Usage:
+    bay = BayFile('output/bldg22_bay3E_containers.json')
+    rack = bay.rack('01')
+    rack.ids, rack.positions, rack.centers      # NumPy (n, 3) arrays
+    bay.save('copy.json')                       # byte-identical round trip
+
+    python bay_reader.py output/bldg22_bay3E_containers.json --rack 01
+"""
+
+import argparse
+import json
+import os
+import re
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from bay_writer import BayFileWriter
+
+# 2: containers grouped by "rack" when they have no "row" (viewer template)
+INDEX_VERSION = 2
+
+GEOMETRY_COLUMNS = 6
+
+_WS = re.compile(r'[ \t\n\r]*')
+_DECODER = json.JSONDecoder()
+
+
+def sidecar_paths(path: str, index_dir: Optional[str] = None) -> Tuple[str, str]:
+    """(index, geometry) sidecar paths for a bay file, keyed by its full name (extension included)"""
+    stem = os.path.basename(path)
+    folder = index_dir or os.path.dirname(os.path.abspath(path))
+    return (os.path.join(folder, stem + '.idx.json'),
+            os.path.join(folder, stem + '.geom.npy'))
+
+
+def _utf8(obj):
+    """Undo the latin-1 decoding the scanner uses for byte offsets"""
+    if isinstance(obj, str):
+        return obj.encode('latin-1').decode('utf-8')
+    if isinstance(obj, list):
+        return [_utf8(v) for v in obj]
+    if isinstance(obj, dict):
+        return {_utf8(k): _utf8(v) for k, v in obj.items()}
+    return obj
+
+
+def rack_key(container: dict) -> str:
+    """Rack row of a container: "row" in generator output, "rack" in the viewer template"""
+    return str(container.get('row', container.get('rack', '')))
+
+
+def _geometry_row(container: dict) -> Tuple[float, ...]:
+    p, d = container['position'], container['dimensions']
+    return p['x'], p['y'], p['z'], d['x'], d['y'], d['z']
+
+
+# ============================================================================
+# STREAMING SCAN
+# ============================================================================
+
+class _Scanner:
+    """
+    Walks one JSON document in fixed-size chunks, decoding one value at a time.
+
+    Bytes are decoded as latin-1 so string positions are byte offsets (JSON
+    structure is ASCII, and UTF-8 continuation bytes never look like it).
+    """
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.base = 0       # file offset of buf[0]
+        self.pos = 0
+        self.eof = False
+
+    def _more(self) -> bool:
+        data = self.f.read(self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data.decode('latin-1')
+        self.base += self.pos
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self._more():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, ch: str):
+        if self.peek() != ch:
+            raise ValueError(f"Expected '{ch}' at byte {self.base + self.pos}")
+        self.pos += 1
+
+    def value(self):
+        """Next JSON value as (obj, start, end) with file byte offsets"""
+        self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._more():
+                    continue
+                raise
+            # A number ending exactly at the buffer edge may continue in the next chunk
+            if end == len(self.buf) and not self.eof and self._more():
+                continue
+            start = self.base + self.pos
+            self.pos = end
+            return obj, start, self.base + end
+
+    def separator(self, close: str) -> bool:
+        """Consume ',' (True) or the closing bracket (False)"""
+        if self.peek() == ',':
+            self.pos += 1
+            return True
+        self.expect(close)
+        return False
+
+
+def _scan_json(f, chunk_size: int) -> Iterator[tuple]:
+    """
+    Yield ('key', name, value) for top-level keys and
+    ('container', dict, start, end) for each element of "containers".
+    """
+    s = _Scanner(f, chunk_size)
+    s.expect('{')
+    if s.peek() == '}':
+        return
+    while True:
+        key = _utf8(s.value()[0])
+        s.expect(':')
+        if key == 'containers':
+            yield 'key', key, None
+            s.expect('[')
+            if s.peek() == ']':
+                s.pos += 1
+            else:
+                while True:
+                    container, start, end = s.value()
+                    yield 'container', container, start, end
+                    if not s.separator(']'):
+                        break
+        else:
+            yield 'key', key, _utf8(s.value()[0])
+        if not s.separator('}'):
+            return
+
+
+def _scan_jsonl(f) -> Iterator[tuple]:
+    """Same events as _scan_json for BayFileWriter's jsonl format"""
+    offset = 0
+    trailer: Dict[str, object] = {"racks": []}
+    for line in f:
+        start, offset = offset, offset + len(line)
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        kind = record.pop('record')
+        if kind == 'bay':
+            for key, value in record.items():
+                yield 'key', key, value
+            yield 'key', 'containers', None
+        elif kind == 'container':
+            yield 'container', record, start, start + len(line.rstrip(b'\r\n'))
+        elif kind == 'rack':
+            trailer['racks'].append(record)
+        elif kind == 'end':
+            trailer.update(record)
+    for key, value in trailer.items():
+        yield 'key', key, value
+
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+def build_index(path: str, chunk_size: int = 1 << 20) -> Tuple[dict, np.ndarray]:
+    """
+    Scan a bay file once and return (index, geometry).
+
+    Memory stays at one chunk plus the index; containers are decoded one at a
+    time and dropped.
+    """
+    fmt = 'jsonl' if path.endswith('.jsonl') else 'json'
+    keys: List[str] = []
+    header: Dict[str, object] = {}
+    trailer: Dict[str, object] = {}
+    racks: Dict[str, List[list]] = {}
+    geometry = array('d')
+    count = 0
+
+    with open(path, 'rb') as f:
+        events = _scan_jsonl(f) if fmt == 'jsonl' else _scan_json(f, chunk_size)
+        for event in events:
+            if event[0] == 'key':
+                _, key, value = event
+                keys.append(key)
+                if key != 'containers':
+                    (trailer if 'containers' in keys else header)[key] = value
+                continue
+
+            _, container, start, end = event
+            row = rack_key(container)
+            if fmt == 'json':
+                row = _utf8(row)
+            runs = racks.setdefault(row, [])
+            if runs and runs[-1][2] + runs[-1][3] == count:
+                # Extends the rack's current run: [start, end, first, count]
+                runs[-1][1] = end
+                runs[-1][3] += 1
+            else:
+                runs.append([start, end, count, 1])
+            geometry.extend(_geometry_row(container))
+            count += 1
+
+    stat = os.stat(path)
+    index = {
+        "version": INDEX_VERSION,
+        "source": {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns},
+        "format": fmt,
+        "keys": keys,
+        "header": header,
+        "trailer": trailer,
+        "count": count,
+        "racks": racks,
+    }
+    return index, np.frombuffer(geometry, dtype=np.float64).reshape(count, GEOMETRY_COLUMNS)
+
+
+def _index_is_current(index: dict, path: str) -> bool:
+    stat = os.stat(path)
+    return (index.get("version") == INDEX_VERSION
+            and index.get("source") == {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns})
+
+
+# ============================================================================
+# READER
+# ============================================================================
+
+class RackView:
+    """Containers of one rack, parsed on access, with NumPy geometry"""
+
+    def __init__(self, row: str, containers: List[dict], geometry: np.ndarray):
+        self.row = row
+        self.containers = containers
+        self.geometry = geometry
+
+    def __len__(self) -> int:
+        return len(self.containers)
+
+    def __iter__(self):
+        return iter(self.containers)
+
+    @property
+    def ids(self) -> List[str]:
+        return [c['id'] for c in self.containers]
+
+    @property
+    def positions(self) -> np.ndarray:
+        """(n, 3) min corners, feet"""
+        return self.geometry[:, :3]
+
+    @property
+    def dimensions(self) -> np.ndarray:
+        """(n, 3) sizes, feet"""
+        return self.geometry[:, 3:]
+
+    @property
+    def centers(self) -> np.ndarray:
+        return self.positions + self.dimensions / 2
+
+
+class BayFile:
+    """
+    One generated bay file, opened through its sidecar index.
+
+    Header and trailer (building, bay, metadata, racks, errors, diagnostics)
+    come from the index; containers are only read from the bay file on
+    demand, per rack or by streaming iteration.
+    """
+
+    def __init__(self, path: str, index_dir: Optional[str] = None, rebuild: bool = False):
+        self.path = path
+        self.index_path, self.geometry_path = sidecar_paths(path, index_dir)
+
+        index = None
+        if not rebuild and os.path.exists(self.index_path) and os.path.exists(self.geometry_path):
+            with open(self.index_path) as f:
+                index = json.load(f)
+            if not _index_is_current(index, path):
+                index = None
+
+        if index is None:
+            index, geometry = build_index(path)
+            self._write_sidecars(index, geometry)
+        self._index = index
+        self._geometry: Optional[np.ndarray] = None
+
+    def _write_sidecars(self, index: dict, geometry: np.ndarray):
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        np.save(self.geometry_path, geometry)
+        with open(self.index_path, 'w') as f:
+            json.dump(index, f, separators=(',', ':'))
+
+    # ---- header / trailer --------------------------------------------------
+
+    @property
+    def format(self) -> str:
+        return self._index["format"]
+
+    @property
+    def header(self) -> dict:
+        return self._index["header"]
+
+    @property
+    def building(self) -> str:
+        return self.header.get("building")
+
+    @property
+    def bay(self) -> str:
+        return self.header.get("bay")
+
+    @property
+    def metadata(self) -> dict:
+        return self.header.get("metadata", {})
+
+    @property
+    def racks(self) -> List[dict]:
+        """Rack records (bounds, sections, counts) as written by the generator"""
+        return self._index["trailer"].get("racks", [])
+
+    @property
+    def errors(self) -> List[str]:
+        return self._index["trailer"].get("errors", [])
+
+    @property
+    def diagnostics(self) -> Dict[str, int]:
+        return self._index["trailer"].get("diagnostics", {})
+
+    @property
+    def rows(self) -> List[str]:
+        """Rack keys in file order"""
+        return list(self._index["racks"])
+
+    def __len__(self) -> int:
+        return self._index["count"]
+
+    # ---- geometry ------------------------------------------------------------
+
+    @property
+    def geometry(self) -> np.ndarray:
+        """(N, 6) memory-mapped, read-only: position xyz, dimensions xyz in file order"""
+        if self._geometry is None:
+            self._geometry = np.load(self.geometry_path, mmap_mode='r')
+        return self._geometry
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self.geometry[:, :3]
+
+    @property
+    def dimensions(self) -> np.ndarray:
+        return self.geometry[:, 3:]
+
+    def rack_slice(self, row: str) -> np.ndarray:
+        """File-order positions of a rack's containers (rows of .geometry)"""
+        return np.concatenate([np.arange(first, first + n) for _, _, first, n in self._runs(row)])
+
+    # ---- containers ----------------------------------------------------------
+
+    def _runs(self, row: str) -> List[list]:
+        try:
+            return self._index["racks"][str(row)]
+        except KeyError:
+            raise KeyError(f"No rack '{row}' in {self.path}") from None
+
+    def _read_run(self, f, start: int, end: int) -> List[dict]:
+        f.seek(start)
+        data = f.read(end - start)
+        if self.format == 'jsonl':
+            containers = [json.loads(line) for line in data.splitlines() if line.strip()]
+            for c in containers:
+                del c['record']
+            return containers
+        return json.loads(b'[' + data + b']')
+
+    def rack(self, row: str) -> RackView:
+        """Parse only the containers of one rack"""
+        runs = self._runs(row)
+        containers: List[dict] = []
+        with open(self.path, 'rb') as f:
+            for start, end, _, _ in runs:
+                containers.extend(self._read_run(f, start, end))
+        if len(runs) == 1:
+            _, _, first, n = runs[0]
+            geometry = self.geometry[first:first + n]
+        else:
+            geometry = self.geometry[self.rack_slice(row)]
+        return RackView(str(row), containers, geometry)
+
+    def __iter__(self) -> Iterator[dict]:
+        """Every container, in file order, one rack-run at a time"""
+        runs = sorted(run for runs in self._index["racks"].values() for run in runs)
+        with open(self.path, 'rb') as f:
+            for start, end, _, _ in runs:
+                yield from self._read_run(f, start, end)
+
+    def to_dict(self) -> dict:
+        """The full bay dict, same keys and order as the file (loads every container)"""
+        out = {}
+        for key in self._index["keys"]:
+            if key == 'containers':
+                out[key] = list(self)
+            else:
+                out[key] = self.header[key] if key in self.header else self._index["trailer"][key]
+        return out
+
+    def save(self, path: str, fmt: str = 'json'):
+        """Write the bay back out; json matches json.dump(BayData.to_dict(), indent=2)"""
+        if fmt == 'json':
+            with open(path, 'w') as f:
+                json.dump(self.to_dict(), f, indent=2)
+            return
+        trailer = self._index["trailer"]
+        writer = BayFileWriter(path, self.header, fmt=fmt)
+        for container in self:
+            writer.write_container(container)
+        writer.close(racks=self.racks, errors=self.errors,
+                     diagnostics=trailer.get("diagnostics", {}), warnings=trailer.get("warnings"))
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Index generated bay files and read racks lazily')
+    parser.add_argument('files', nargs='+', help='*_containers.json or .jsonl files')
+    parser.add_argument('--rack', default=None, help='Print the containers of this rack row')
+    parser.add_argument('--index-dir', default=None,
+                        help='Directory for the sidecar index files (default: next to each bay file)')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild sidecar indexes')
+    args = parser.parse_args()
+
+    for path in args.files:
+        bay = BayFile(path, index_dir=args.index_dir, rebuild=args.rebuild)
+        print(f"{os.path.basename(path)}: {bay.building} bay {bay.bay}, "
+              f"{len(bay)} containers in {len(bay.rows)} racks -> {bay.index_path}")
+        if args.rack is None:
+            continue
+        rack = bay.rack(args.rack)
+        print(f"  rack {rack.row}: {len(rack)} containers")
+        for cid, center, size in zip(rack.ids, rack.centers, rack.dimensions):
+            print(f"    {cid:<10} center ({center[0]:.3f}, {center[1]:.3f}, {center[2]:.3f})  "
+                  f"size ({size[0]:.3f}, {size[1]:.3f}, {size[2]:.3f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Incremental writer for bay container files
+
+Writes one bay file while containers are still being generated, so the
+pipeline never needs the full containers list or the whole to_dict() tree.
+
+Formats:
+    json   - byte-identical to json.dump(bay_data.to_dict(), f, indent=2)
+    jsonl  - JSON Lines, one record per line, each tagged with "record":
+               {"record": "bay", building, bay, bay_origin, metadata}
+               {"record": "container", ...}   (one per container)
+               {"record": "rack", ...}        (one per rack)
+               {"record": "end", errors, warnings, diagnostics}
+
+Usage:
+    writer = BayFileWriter(path, header, fmt='json')
+    for c in containers:
+        writer.write_container(c.to_dict())
+    writer.close(racks=[r.to_dict() for r in racks], errors=[], diagnostics=counts)
+"""
+
+import json
+from typing import Dict, List, Optional
+
+FORMATS = ('json', 'jsonl')
+
+# File extension per format
+EXTENSIONS = {'json': '.json', 'jsonl': '.jsonl'}
+
+
+class BayFileWriter:
+    """
+    Streams one bay file to disk.
+
+    header holds the keys that precede "containers" in BayData.to_dict()
+    (building, bay, bay_origin, metadata). Container records are buffered
+    and flushed every chunk_size records.
+    """
+
+    def __init__(self, path: str, header: dict, fmt: str = 'json', chunk_size: int = 1000):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format '{fmt}', expected one of {FORMATS}")
+        self.path = path
+        self.fmt = fmt
+        self.chunk_size = chunk_size
+        self.count = 0
+        self._buffer: List[str] = []
+        self._f = open(path, 'w')
+
+        if fmt == 'jsonl':
+            self._f.write(json.dumps({"record": "bay", **header}) + '\n')
+        else:
+            # Everything up to the closing brace, then open the containers array
+            head = json.dumps(header, indent=2)
+            self._f.write(head[:-2] + ',\n  "containers": [')
+
+    def write_container(self, container: dict):
+        if self.fmt == 'jsonl':
+            self._buffer.append(json.dumps({"record": "container", **container}) + '\n')
+        else:
+            sep = ',\n    ' if self.count else '\n    '
+            self._buffer.append(sep + json.dumps(container, indent=2).replace('\n', '\n    '))
+        self.count += 1
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        self._f.write(''.join(self._buffer))
+        self._buffer.clear()
+
+    def close(self, racks: List[dict], errors: List[str], diagnostics: Dict[str, int],
+              warnings: Optional[List[str]] = None):
+        """
+        Write the trailing racks/errors/diagnostic counts and close the file.
+
+        warnings is the deprecated message list (BayData.to_dict); None leaves
+        the key out.
+        """
+        self.flush()
+        end = {"errors": errors}
+        if warnings is not None:
+            end["warnings"] = warnings
+        end["diagnostics"] = diagnostics
+        if self.fmt == 'jsonl':
+            for r in racks:
+                self._f.write(json.dumps({"record": "rack", **r}) + '\n')
+            self._f.write(json.dumps({"record": "end", **end}) + '\n')
+        else:
+            self._f.write('\n  ]' if self.count else ']')
+            tail = json.dumps({"racks": racks, **end}, indent=2)
+            self._f.write(',' + tail[1:])
+        self._f.close()
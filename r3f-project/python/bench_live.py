@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Load generator for live_occupancy.py.
+
+Starts the service in a subprocess (or targets one already running), connects
+SSE viewers and feeds movement events at each requested rate for a fixed
+time, through the local socket or by appending to a tailed JSON Lines file.
+Per rate it reports:
+
+    processed    events the service accepted per second (from /stats)
+    batches      occupancy messages a viewer received, and events coalesced per batch
+    latency      per batch, viewer receive time minus the oldest event in it
+                 (p50 / p99 / max), i.e. coalescing delay + queueing + delivery
+
+A viewer that cannot keep up would be dropped; the report shows it.
+
+Usage:
+    python bench_live.py
+    python bench_live.py --rates 10000 50000 100000 --viewers 20 --source tail
+    python bench_live.py --target 127.0.0.1:8765 --feed 127.0.0.1:9301
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+from live_occupancy import _host_port
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TICK = 0.01
+
+
+def container_ids(count: int) -> List[str]:
+    """Generator-style ids: row, section letter, level, slot letter"""
+    ids = []
+    for i in range(count):
+        row, rest = divmod(i, 26 * 6 * 4)
+        section, rest = divmod(rest, 6 * 4)
+        level, slot = divmod(rest, 4)
+        ids.append(f"9E{row + 1:02d}{chr(65 + section)}{level + 1}{chr(65 + slot)}")
+    return ids
+
+
+def event_lines(ids: List[str], n: int, now: float) -> bytes:
+    # Preformatted rather than json.dumps so the generator is not the bottleneck
+    choice, randint = random.choice, random.randint
+    return ''.join(
+        f'{{"container":"{choice(ids)}","lofull":{randint(0, 100)},"inavlq":{randint(0, 500)},"ts":{now:.4f}}}\n'
+        for _ in range(n)).encode()
+
+
+async def http_get_json(host: str, port: int, path: str) -> dict:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.split(b'\r\n\r\n', 1)[1])
+
+
+class Viewer:
+    """Minimal SSE client: counts batches and records per-batch latency"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.events = 0
+        self.closed = False
+
+    async def run(self, host: str, port: int):
+        reader, writer = await asyncio.open_connection(host, port, limit=1 << 26)
+        writer.write(f"GET /events HTTP/1.1\r\nHost: {host}\r\nAccept: text/event-stream\r\n\r\n".encode())
+        await writer.drain()
+        await reader.readuntil(b'\r\n\r\n')
+        try:
+            while True:
+                block = await reader.readuntil(b'\n\n')
+                received = time.time()
+                fields = dict(line.split(': ', 1) for line in block.decode().splitlines()
+                              if ': ' in line and not line.startswith(':'))
+                if fields.get('event') != 'occupancy':
+                    continue
+                # Header only ("changes" is last); a full parse per viewer would load the bench, not the service
+                data = fields['data']
+                header = json.loads(data[:data.index(',"changes":')] + '}')
+                self.events += header['events']
+                if 'sourceTs' in header:
+                    self.latencies.append(received - header['sourceTs'][0])
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.closed = True
+        finally:
+            writer.close()
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else float('nan')
+
+
+async def produce(write, ids: List[str], rate: int, seconds: float):
+    """Send rate events/s in TICK-sized chunks, catching up if a tick runs late"""
+    start = time.perf_counter()
+    sent = 0
+    while True:
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return sent
+        due = int(rate * elapsed) - sent
+        if due > 0:
+            await write(event_lines(ids, due, time.time()))
+            sent += due
+        await asyncio.sleep(TICK)
+
+
+async def wait_for_port(host: str, port: int, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def bench(args, http: tuple, feed: tuple, tail_path: str):
+    await wait_for_port(*http)
+    viewers = [Viewer() for _ in range(args.viewers)]
+    tasks = [asyncio.create_task(v.run(*http)) for v in viewers]
+    ids = container_ids(args.containers)
+
+    if args.source == 'socket':
+        await wait_for_port(*feed)
+        _, feeder = await asyncio.open_connection(*feed)
+
+        async def write(data: bytes):
+            feeder.write(data)
+            await feeder.drain()
+    else:
+        log = open(tail_path, 'ab', buffering=0)
+
+        async def write(data: bytes):
+            log.write(data)
+
+    print(f"{args.viewers} viewers, {args.containers:,} containers, {args.seconds:.0f} s per rate, "
+          f"source={args.source}")
+    print(f"{'offered/s':>10} {'processed/s':>12} {'batches':>8} {'events/batch':>14} "
+          f"{'p50 ms':>7} {'p99 ms':>7} {'max ms':>7} {'dropped':>8}")
+    print('-' * 82)
+    for rate in args.rates:
+        before = await http_get_json(*http, '/stats')
+        for v in viewers:
+            v.latencies, v.events = [], 0
+        started = time.perf_counter()
+        await produce(write, ids, rate, args.seconds)
+        await asyncio.sleep(1.0)                       # let the last batches arrive
+        after = await http_get_json(*http, '/stats')
+        processed = (after['events'] - before['events']) / (time.perf_counter() - started - 1.0)
+        latencies = [l * 1000 for v in viewers for l in v.latencies]
+        batches = len(viewers[0].latencies) if viewers else 0
+        per_batch = viewers[0].events / batches if batches else 0
+        print(f"{rate:>10,} {processed:>12,.0f} "
+              f"{batches:>8} {per_batch:>14,.0f} {percentile(latencies, 0.5):>7.0f} "
+              f"{percentile(latencies, 0.99):>7.0f} {max(latencies, default=float('nan')):>7.0f} "
+              f"{after['dropped_clients']:>8}")
+
+    for task in tasks:
+        task.cancel()
+    if args.source == 'socket':
+        feeder.close()
+    else:
+        log.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test live_occupancy.py')
+    parser.add_argument('--rates', type=int, nargs='+', default=[10000, 30000, 60000],
+                        help='Events per second to offer, one run each (default: 10000 30000 60000)')
+    parser.add_argument('--seconds', type=float, default=5.0, help='Seconds per rate (default: 5)')
+    parser.add_argument('--viewers', type=int, default=10, help='SSE viewers (default: 10)')
+    parser.add_argument('--containers', type=int, default=50000, help='Distinct container ids (default: 50000)')
+    parser.add_argument('--source', choices=['socket', 'tail'], default='socket')
+    parser.add_argument('--interval', type=float, default=0.1, help='Service batch interval (default: 0.1)')
+    parser.add_argument('--target', default=None,
+                        help='HOST:PORT of a running service instead of starting one')
+    parser.add_argument('--feed', default='127.0.0.1:9301', help='Feeder socket (default: 127.0.0.1:9301)')
+    parser.add_argument('--seed', type=int, default=22)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tail_path = os.path.join(tmp, 'events.jsonl')
+        service = None
+        if args.target:
+            http = _host_port(args.target)
+        else:
+            http = ('127.0.0.1', 8765)
+            command = [sys.executable, os.path.join(HERE, 'live_occupancy.py'),
+                       '--http', f'{http[0]}:{http[1]}', '--interval', str(args.interval),
+                       '--report', '3600']
+            command += ['--socket', args.feed] if args.source == 'socket' else ['--tail', tail_path]
+            service = subprocess.Popen(command, cwd=HERE, stdout=subprocess.DEVNULL)
+        try:
+            asyncio.run(bench(args, http, _host_port(args.feed), tail_path))
+        finally:
+            if service is not None:
+                service.terminate()
+                service.wait()
+
+
+if __name__ == '__main__':
+    main()
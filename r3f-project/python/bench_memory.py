@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Peak memory vs row count: normal run vs --stream.
+
+Generates synthetic bay sheets (CSV, or .xlsx with --input xlsx) of increasing size and runs the
+generator on each in a fresh subprocess, reporting peak RSS and wall time.
+The normal run holds every row, container and the to_dict tree; --stream
+should stay roughly flat as the bay grows. Both runs must write the same
+files: the "same" column compares every *_diagnostics.json byte for byte,
+and the *_containers.json files too when the stream format is json.
+
+Usage:
+    python bench_memory.py
+    python bench_memory.py --rows 10000 50000 200000 --format jsonl
+    python bench_memory.py --rows 10000 --input xlsx
+"""
+
+import argparse
+import csv
+import filecmp
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GENERATOR = os.path.join(HERE, 'warehouse_generator_v2.py')
+
+# Runs the generator CLI in-process and reports its own peak RSS (KB on Linux)
+PROBE = """
+import contextlib, io, resource, runpy, sys
+sys.argv = {argv!r}
+with contextlib.redirect_stdout(io.StringIO()):
+    runpy.run_path({generator!r}, run_name='__main__')
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def write_sample_csv(path: str, rows: int):
+    """Unique 7-char bins, filled bay by bay: 99 rows x 26 sections x 9 levels x 8 slots"""
+    bays = [f"{n}{side}" for n in range(1, 10) for side in 'EW']
+    with open(path, 'w', newline='') as f:
+        w = csv.writer(f)
+        w.writerow(['BLDG', 'AREA (BAY)', 'POS X (ft)', 'POS Y', 'Width (in)',
+                    'Storage Bin', 'Height (in)', 'Depth (in)'])
+        for i in range(rows):
+            bay, i = divmod(i, 99 * 26 * 9 * 8)
+            rack, i = divmod(i, 26 * 9 * 8)
+            section, i = divmod(i, 9 * 8)
+            level, slot = divmod(i, 8)
+            w.writerow(['BLDG 22', bays[bay], 3.5 + rack * 3, -8 - section * 3, 36,
+                        f"{bays[bay]}{rack + 1:02d}{chr(65 + section)}{level + 1}{chr(65 + slot)}",
+                        # Section C level 2 disagrees with its row, so HEIGHT_MISMATCH is exercised
+                        12 if (section, level) == (2, 1) else 11 if level else 56, 18])
+
+
+def write_sample_xlsx(path: str, rows: int):
+    """Same rows as write_sample_csv, as a workbook (the normal run then reads it with pandas)"""
+    from openpyxl import Workbook
+    csv_path = path[:-len('.xlsx')] + '.csv'
+    write_sample_csv(csv_path, rows)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('bldg22(bay1)')
+    with open(csv_path, newline='') as f:
+        for i, record in enumerate(csv.reader(f)):
+            ws.append(record if i == 0 else [v if k in (0, 1, 5) else float(v) if '.' in v else int(v)
+                                             for k, v in enumerate(record)])
+    wb.save(path)
+    os.remove(csv_path)
+
+
+def measure(argv) -> tuple:
+    """(peak RSS in MB, seconds) for one generator run"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE.format(argv=argv, generator=GENERATOR)],
+        capture_output=True, text=True, check=True
+    )
+    elapsed = time.perf_counter() - start
+    return int(result.stdout.strip().splitlines()[-1]) / 1024, elapsed
+
+
+def same_output(normal_dir: str, stream_dir: str, fmt: str) -> bool:
+    """Byte-identical diagnostics (and containers, for json) in both output dirs"""
+    suffixes = ('_diagnostics.json', '_containers.json') if fmt == 'json' else ('_diagnostics.json',)
+    names = sorted(n for n in os.listdir(normal_dir) if n.endswith(suffixes))
+    if not names or names != sorted(n for n in os.listdir(stream_dir) if n.endswith(suffixes)):
+        return False
+    _, mismatch, errors = filecmp.cmpfiles(normal_dir, stream_dir, names, shallow=False)
+    return not mismatch and not errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark peak memory of normal vs streaming runs')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 40000, 160000],
+                        help='Row counts to test (default: 10000 40000 160000)')
+    parser.add_argument('--format', choices=['json', 'jsonl'], default='json',
+                        help='Output format for the streaming run (default: json)')
+    parser.add_argument('--input', choices=['csv', 'xlsx'], default='csv',
+                        help='Sample sheet format (default: csv)')
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}  {'normal MB':>10} {'normal s':>9}  {'stream MB':>10} {'stream s':>9}  {'same':>5}")
+    print('-' * 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            sample = os.path.join(tmp, f'sample_{rows}.{args.input}')
+            (write_sample_xlsx if args.input == 'xlsx' else write_sample_csv)(sample, rows)
+
+            normal_dir, stream_dir = os.path.join(tmp, f'normal_{rows}'), os.path.join(tmp, f'stream_{rows}')
+            normal_mb, normal_s = measure(['g', sample, '-o', normal_dir])
+            stream_mb, stream_s = measure(['g', sample, '-o', stream_dir, '--stream', '--format', args.format])
+            same = same_output(normal_dir, stream_dir, args.format)
+            print(f"{rows:>8}  {normal_mb:>10.1f} {normal_s:>9.2f}  {stream_mb:>10.1f} {stream_s:>9.2f}  "
+                  f"{'yes' if same else 'NO':>5}")
+            os.remove(sample)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+One rack from a large bay file: json.load vs BayFile.
+
+Writes a synthetic bay file with BayFileWriter (same bytes as a generator
+run), then times reading a single rack's containers and geometry in fresh
+subprocesses, reporting wall time and peak RSS:
+
+    json.load        parse the whole file, filter the rack
+    BayFile (cold)   first open: streaming scan + sidecar index build
+    BayFile (warm)   index exists: seek and parse one rack
+
+Every probe imports NumPy, so the RSS numbers share the same baseline.
+
+Usage:
+    python bench_reader.py
+    python bench_reader.py --racks 400 --per-rack 2000 --format jsonl
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from bay_writer import BayFileWriter, EXTENSIONS
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+PROBES = {
+    "json.load": """
+import json, numpy as np
+with open({path!r}) as f:
+    bay = json.load(f)
+rack = [c for c in bay['containers'] if c['row'] == {row!r}]
+positions = np.array([[c['position'][k] for k in 'xyz'] for c in rack])
+n = len(rack)
+""",
+    "BayFile": """
+import numpy as np
+from bay_reader import BayFile
+rack = BayFile({path!r}).rack({row!r})
+positions = rack.positions
+n = len(rack)
+""",
+}
+
+# Appended to every probe: peak RSS (KB on Linux) and rack size
+REPORT = """
+import resource
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, n)
+"""
+
+
+def write_sample_bay(path: str, fmt: str, racks: int, per_rack: int):
+    header = {
+        "building": "BLDG 22", "bay": "9E",
+        "bay_origin": {"x": 0, "y": 0, "z": 0},
+        "metadata": {"total_containers": racks * per_rack, "total_racks": racks, "units": "feet"},
+    }
+    writer = BayFileWriter(path, header, fmt=fmt)
+    rack_records = []
+    for r in range(racks):
+        row = f"{r + 1:03d}"
+        for i in range(per_rack):
+            section, rest = divmod(i, 64)
+            level, slot = divmod(rest, 8)
+            writer.write_container({
+                "id": f"9E{row}{section:03d}{level + 1}{chr(65 + slot)}",
+                "row": row, "section": f"{section:03d}", "level": level + 1, "slot": chr(65 + slot),
+                "position": {"x": round(3.5 + r * 3 + slot * 0.375, 4), "y": round(level * 1.25, 4),
+                             "z": round(-8 - section * 3, 4)},
+                "dimensions": {"x": 0.375, "y": 0.9167, "z": 1.5},
+            })
+        rack_records.append({"id": f"R{row}", "row": row, "container_count": per_rack})
+    writer.close(racks=rack_records, errors=[], diagnostics={})
+
+
+def measure(probe: str, path: str, row: str) -> tuple:
+    """(seconds, peak RSS in MB, containers read)"""
+    code = PROBES[probe].format(path=path, row=row) + REPORT
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code], cwd=HERE,
+                            capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+    rss_kb, n = result.stdout.split()
+    return elapsed, int(rss_kb) / 1024, int(n)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark single-rack reads: json.load vs BayFile')
+    parser.add_argument('--racks', type=int, default=200, help='Racks in the bay (default: 200)')
+    parser.add_argument('--per-rack', type=int, default=2000, help='Containers per rack (default: 2000)')
+    parser.add_argument('--format', choices=sorted(EXTENSIONS), default='json')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bldg22_bay9E_containers' + EXTENSIONS[args.format])
+        write_sample_bay(path, args.format, args.racks, args.per_rack)
+        row = f"{args.racks // 2:03d}"
+        print(f"{args.racks * args.per_rack:,} containers in {args.racks} racks, "
+              f"{os.path.getsize(path) / 1e6:.1f} MB ({args.format}); reading rack {row}")
+        print(f"{'':<16} {'seconds':>8} {'peak MB':>8} {'containers':>11}")
+        print('-' * 46)
+
+        runs = [("json.load", "json.load"), ("BayFile (cold)", "BayFile"), ("BayFile (warm)", "BayFile")]
+        if args.format == 'jsonl':
+            runs = runs[1:]
+        for label, probe in runs:
+            seconds, mb, n = measure(probe, path, row)
+            print(f"{label:<16} {seconds:>8.3f} {mb:>8.1f} {n:>11}")
+
+
+if __name__ == '__main__':
+    main()
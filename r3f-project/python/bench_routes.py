@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Pick-route costing: precomputed section distances vs per-pick A*.
+
+Builds a synthetic bay in generator output shape: back-to-back rack pairs
+with walking aisles between them and a cross aisle at each end. It then
+times:
+
+    build        occupancy grid + aisle graph + one Dijkstra per section
+    cache load   load_or_build() once the table is cached
+    batch        PickDistances.route_lengths() over many random pick lists,
+                 in list order and nearest-first
+    A*           the same routes walked leg by leg with uncached A* on the grid
+
+and checks that both methods give the same lengths.
+
+Usage:
+    python bench_routes.py
+    python bench_routes.py --pairs 20 --sections 30 --lists 20000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from aisle_routing import (
+    AisleGraph, OccupancyGrid, RoutingConfig, access_cells, container_locations,
+    load_layout, load_or_build, location_key,
+)
+
+RACK_DEPTH = 3.0
+SECTION_WIDTH = 3.0
+AISLE = 8.0
+LEVELS = 4
+
+
+def synthetic_bay(pairs: int, sections: int) -> dict:
+    """Rack pairs along z, aisles along x, in generator output shape"""
+    names = [chr(65 + i) if i < 26 else f"{chr(65 + i // 26 - 1)}{chr(65 + i % 26)}" for i in range(sections)]
+    racks, containers = [], []
+    x = 4.0
+    for p in range(pairs):
+        for side in range(2):
+            row = f"{p * 2 + side + 1:02d}"
+            for s, section in enumerate(names):
+                for level in range(1, LEVELS + 1):
+                    containers.append({
+                        "id": f"9E{row}{section}{level}", "row": row, "section": section,
+                        "level": level, "slot": None,
+                        "position": {"x": x, "y": (level - 1) * 2.0, "z": 4.0 + s * SECTION_WIDTH},
+                        "dimensions": {"x": RACK_DEPTH, "y": 2.0, "z": SECTION_WIDTH},
+                    })
+            racks.append({
+                "id": f"R{row}", "row": row, "sections": names, "max_level": LEVELS,
+                "container_count": sections * LEVELS,
+                "bounds": {"min": {"x": x, "y": 0.0, "z": 4.0},
+                           "max": {"x": x + RACK_DEPTH, "y": LEVELS * 2.0, "z": 4.0 + sections * SECTION_WIDTH}},
+            })
+            x += RACK_DEPTH
+        x += AISLE
+    return {"building": "BLDG 22", "bay": "9E", "containers": containers, "racks": racks}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pick-route costing')
+    parser.add_argument('--pairs', type=int, default=12, help='Back-to-back rack pairs (default: 12)')
+    parser.add_argument('--sections', type=int, default=30, help='Sections per rack (default: 30)')
+    parser.add_argument('--lists', type=int, default=10000, help='Pick lists to cost (default: 10000)')
+    parser.add_argument('--picks', type=int, nargs=2, default=[5, 25], metavar=('MIN', 'MAX'),
+                        help='Picks per list (default: 5 25)')
+    parser.add_argument('--astar-lists', type=int, default=50,
+                        help='Lists walked with A* for comparison (default: 50)')
+    parser.add_argument('--seed', type=int, default=22)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    bay = synthetic_bay(args.pairs, args.sections)
+    config = RoutingConfig()
+    ids = [c['id'] for c in bay['containers']]
+    pick_lists = [random.sample(ids, random.randint(*args.picks)) for _ in range(args.lists)]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        start = time.perf_counter()
+        load_or_build(bay, config, cache_dir)
+        build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        table = load_or_build(bay, config, cache_dir)
+        load_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    given = table.route_lengths(pick_lists)
+    given_s = time.perf_counter() - start
+    start = time.perf_counter()
+    nearest = table.route_lengths(pick_lists, order='nearest')
+    nearest_s = time.perf_counter() - start
+
+    # Same routes, leg by leg with A* between access cells (no matrix)
+    layout = load_layout(bay, config)
+    graph = AisleGraph(OccupancyGrid.rasterize(layout, config))
+    cells = {location_key(r.row, s): c for r in layout.racks
+             for s, c in access_cells(r, graph.grid, config).items()}
+    locations = container_locations(bay)
+    sample = pick_lists[:args.astar_lists]
+    start = time.perf_counter()
+    walked = []
+    for picks in sample:
+        stops = [locations[p] for p in picks]
+        walked.append(sum(min(graph._astar(u, v)[0] for u in cells[a] for v in cells[b])
+                          for a, b in zip(stops, stops[1:])))
+    astar_s = time.perf_counter() - start
+    match = np.allclose(walked, given[:len(sample)], rtol=1e-5)
+
+    grid = graph.grid
+    print(f"{len(layout.racks)} racks, {len(cells)} sections, grid {grid.nx} x {grid.nz} "
+          f"({int((~grid.blocked).sum())} free cells)")
+    print(f"  build distance table     {build_s:>8.2f} s")
+    print(f"  load from cache          {load_s * 1000:>8.1f} ms")
+    print(f"  {args.lists} pick lists ({args.picks[0]}-{args.picks[1]} picks):")
+    print(f"    in list order          {given_s * 1000:>8.1f} ms  ({args.lists / given_s:>10,.0f} lists/s)")
+    print(f"    nearest-first          {nearest_s * 1000:>8.1f} ms  ({args.lists / nearest_s:>10,.0f} lists/s)")
+    print(f"    A* per leg (uncached)  {astar_s / len(sample) * args.lists:>8.1f} s   "
+          f"({len(sample) / astar_s:>10,.0f} lists/s, timed on {len(sample)} lists)")
+    print(f"  nearest-first saves {1 - nearest.sum() / given.sum():.0%} of walking; "
+          f"A* lengths match table: {match}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Search index benchmark: lookups at inventory scale vs a linear scan.
+
+Generates synthetic inventory records shaped like generate_inventory.py output,
+builds the SearchIndex and times exact, prefix and substring lookups (median
+per query over many random queries drawn from the data) against the linear
+walk the viewer does today.
+
+Usage:
+    python bench_search.py
+    python bench_search.py --rows 1000000 --queries 20000 --grams
+"""
+
+import argparse
+import json
+import random
+import statistics
+import string
+import time
+
+from search_index import SearchIndex
+
+ALPHANUM = string.ascii_uppercase + string.digits
+
+
+def synthetic_records(n: int) -> list:
+    bins = [f"{b}{r:02d}{s}{l}" for b in ('3E', '3W', '4E', '4W') for r in range(1, 60)
+            for s in 'ABCDEFGHJK' for l in range(1, 8)]
+    return [{
+        "skskun": ''.join(random.choices(ALPHANUM, k=16)),
+        "skpart": f"P{random.randint(0, 9999999):07d}",
+        "innumb": f"I{random.randint(0, 9999999):07d}",
+        "lolocn": random.choice(bins),
+    } for _ in range(n)]
+
+
+def median_us(fn, queries) -> float:
+    samples = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the inventory search index')
+    parser.add_argument('--rows', type=int, default=1000000, help='Synthetic records (default: 1000000)')
+    parser.add_argument('--queries', type=int, default=10000, help='Queries per case (default: 10000)')
+    parser.add_argument('--grams', action='store_true', help='Also build the n-gram index')
+    parser.add_argument('--seed', type=int, default=22)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    records = synthetic_records(args.rows)
+
+    start = time.perf_counter()
+    index = SearchIndex.build(records, with_grams=args.grams)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    size = len(json.dumps(index.to_dict(), separators=(',', ':')))
+    serialize_s = time.perf_counter() - start
+
+    sample = random.sample(records, min(args.queries, len(records)))
+    skus = [r["skskun"] for r in sample]
+    parts = [r["skpart"] for r in sample]
+
+    cases = [
+        ("exact sku", lambda q: index.exact('skskun', q), skus),
+        ("prefix sku (4 chars, limit 20)", lambda q: index.prefix('skskun', q[:4], 20), skus),
+        ("prefix part (5 chars, limit 20)", lambda q: index.prefix('skpart', q[:5], 20), parts),
+        ("prefix bin (4 chars, limit 20)", lambda q: index.prefix('lolocn', q[:4], 20),
+         [r["lolocn"] for r in sample]),
+        # Without n-grams substring falls back to scanning every key - keep that case short
+        ("substring sku (4 chars, limit 20)", lambda q: index.substring('skskun', q[6:10], 20),
+         skus if args.grams else skus[:20]),
+        ("any field prefix (limit 20)", lambda q: index.search(q[:5], 20), parts),
+    ]
+
+    print(f"{args.rows:,} records: build {build_s:.1f} s, serialized {size / 1e6:.1f} MB "
+          f"({serialize_s:.1f} s){', n-grams' if args.grams else ''}")
+    print(f"{'query':<36} {'median us':>10}")
+    print('-' * 47)
+    for label, fn, queries in cases:
+        print(f"{label:<36} {median_us(fn, queries):>10.1f}")
+
+    # What InventoryDropdown/App do today: walk every record
+    scan = [r["skskun"] for r in records]
+    few = skus[:20]
+    print(f"{'linear scan by sku (today)':<36} "
+          f"{median_us(lambda q: next(i for i, s in enumerate(scan) if s == q), few):>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
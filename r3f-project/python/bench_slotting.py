@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Batch slotting: size-bucketed SlotIndex vs testing every item against every slot.
+
+Builds a synthetic bay with a generator-like mix of slot sizes (a few dozen
+distinct dimensions, thousands of slots) and random items in the
+generate_inventory.py size range, then times:
+
+    bucketed     SlotIndex.build() + assign()
+    brute force  same greedy order and score, but each item is tested
+                 against every free slot (vectorized over slots)
+
+and checks that both pick slots of the same total score.
+
+Usage:
+    python bench_slotting.py
+    python bench_slotting.py --slots 200000 --items 50000 --rotations any
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from slotting import INCHES_TO_FEET, ROTATIONS, SlotIndex, assign
+
+
+def synthetic_slots(n: int, sizes: int, rng: np.random.Generator) -> list:
+    """Container dicts: n slots drawn from `sizes` distinct dimensions, spread over a floor"""
+    dims = np.round(rng.uniform([0.5, 0.75, 1.0], [5.0, 6.0, 4.0], size=(sizes, 3)), 4)
+    pick = rng.integers(0, sizes, n)
+    corners = np.round(rng.uniform([0, 0, 0], [300, 20, 200], size=(n, 3)), 4)
+    return [{
+        "id": f"9E{i:07d}",
+        "position": dict(zip('xyz', corner.tolist())),
+        "dimensions": dict(zip('xyz', dims[k].tolist())),
+    } for i, (k, corner) in enumerate(zip(pick, corners))]
+
+
+def brute_force(items: np.ndarray, index: SlotIndex, rotations: str, distance_weight: float) -> np.ndarray:
+    """Slot per item (-1 when none), testing each item against all free slots"""
+    perms = np.array(ROTATIONS[rotations])
+    volume = items.prod(axis=1)
+    slot_volume = index.dims.prod(axis=1)
+    taken = np.zeros(len(index), dtype=bool)
+    out = np.full(len(items), -1)
+    for i in np.argsort(-volume, kind='stable'):
+        fits = (items[i][perms][:, None, :] <= index.dims[None]).all(-1).any(0)
+        score = np.where(fits & ~taken, slot_volume - volume[i] + distance_weight * index.distance, np.inf)
+        s = int(np.argmin(score))
+        if np.isfinite(score[s]):
+            out[i] = s
+            taken[s] = True
+    return out
+
+
+def total_score(slots: np.ndarray, items: np.ndarray, index: SlotIndex, distance_weight: float) -> float:
+    done = slots >= 0
+    return float((index.dims[slots[done]].prod(axis=1) - items[done].prod(axis=1)
+                  + distance_weight * index.distance[slots[done]]).sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batch slotting')
+    parser.add_argument('--slots', type=int, default=100000, help='Slots in the bay (default: 100000)')
+    parser.add_argument('--sizes', type=int, default=40, help='Distinct slot sizes (default: 40)')
+    parser.add_argument('--items', type=int, default=20000, help='Items to place (default: 20000)')
+    parser.add_argument('--rotations', choices=sorted(ROTATIONS), default='upright')
+    parser.add_argument('--distance-weight', type=float, default=0.01)
+    parser.add_argument('--brute-items', type=int, default=2000,
+                        help='Items placed by brute force for comparison (default: 2000)')
+    parser.add_argument('--seed', type=int, default=22)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    containers = synthetic_slots(args.slots, args.sizes, rng)
+    # generate_inventory.py ranges: width 6-60, height 6-72, depth 6-60 inches
+    items = rng.integers([6, 6, 6], [61, 73, 61], size=(args.items, 3)) * INCHES_TO_FEET
+
+    start = time.perf_counter()
+    index = SlotIndex.build(containers)
+    build_s = time.perf_counter() - start
+    start = time.perf_counter()
+    result = assign(items, index, args.rotations, args.distance_weight)
+    assign_s = time.perf_counter() - start
+
+    sample = items[:args.brute_items]
+    start = time.perf_counter()
+    brute = brute_force(sample, index, args.rotations, args.distance_weight)
+    brute_s = time.perf_counter() - start
+    small = assign(sample, index, args.rotations, args.distance_weight)
+    match = (np.array_equal(small.slot >= 0, brute >= 0)
+             and np.isclose(total_score(small.slot, sample, index, args.distance_weight),
+                            total_score(brute, sample, index, args.distance_weight)))
+
+    print(f"{len(index):,} slots in {len(index.bucket_dims)} size buckets, {args.items:,} items, "
+          f"rotations={args.rotations}")
+    print(f"  build index          {build_s * 1000:>9.1f} ms")
+    print(f"  assign (bucketed)    {assign_s * 1000:>9.1f} ms  ({args.items / assign_s:>10,.0f} items/s, "
+          f"{result.assigned:,} placed)")
+    print(f"  brute force          {brute_s / len(sample) * args.items:>9.1f} s   "
+          f"({len(sample) / brute_s:>10,.0f} items/s, timed on {len(sample):,} items)")
+    print(f"  same placements and total score as brute force: {match}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Snapshot log vs full snapshots over a simulated shift.
+
+Starts from an inventory export (default: ../src/data/inventory.json, or a
+synthetic one with --items), then produces one snapshot per interval in which
+a fraction of items change quantity, a bin's fullness changes, items move
+bins, and a few are picked out or put away. Every snapshot is ingested into a
+SnapshotLog; the report compares disk usage against keeping every export and
+times "state at T" / "changes T1..T2" against reloading a full export.
+
+Every replayed state is checked against the snapshot it came from.
+
+Usage:
+    python bench_snapshots.py
+    python bench_snapshots.py --items 20000 --snapshots 96 --churn 0.02
+"""
+
+import argparse
+import copy
+import json
+import os
+import random
+import tempfile
+import time
+
+from snapshot_log import SnapshotLog, snapshot_to_state
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_INVENTORY = os.path.join(HERE, '..', 'src', 'data', 'inventory.json')
+
+
+def synthetic_inventory(n: int) -> list:
+    bins = [f"3E{r:02d}{s}{l}" for r in range(1, 60) for s in 'ABCDEFGH' for l in range(1, 7)]
+    return [{
+        "indocn": f"DOC{i:07d}", "lofull": "50", "inavlq": str(random.randint(0, 200)),
+        "itemdp": "20", "itemht": "20", "itemwd": "20", "lolocn": bins[i % len(bins)],
+        "skskun": f"SKU{i:013d}", "skpart": f"P{i:07d}", "innumb": f"I{i:07d}",
+        "imageUrl": "", "rackImageUrl": "", "status": "success",
+    } for i in range(n)]
+
+
+def next_snapshot(records: list, churn: float, serial: list) -> list:
+    """Mutate a copy: qty changes, fullness changes, moves, picks and put-aways"""
+    records = copy.deepcopy(records)
+    bins = sorted({r["lolocn"] for r in records})
+    k = max(1, int(len(records) * churn))
+
+    for r in random.sample(records, k):
+        r["inavlq"] = str(max(0, int(r["inavlq"]) + random.randint(-20, 20)))
+    for b in random.sample(bins, max(1, k // 4)):
+        full = random.choice(["0", "25", "50", "75", "100"])
+        for r in records:
+            if r["lolocn"] == b:
+                r["lofull"] = full
+    for r in random.sample(records, max(1, k // 10)):
+        r["lolocn"] = random.choice(bins)
+    for r in random.sample(records, max(1, k // 20)):
+        records.remove(r)
+    for _ in range(max(1, k // 20)):
+        serial[0] += 1
+        new = dict(random.choice(records), innumb=f"N{serial[0]:07d}", inavlq=str(random.randint(1, 50)))
+        records.append(new)
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the snapshot log against full exports')
+    parser.add_argument('--inventory', default=DEFAULT_INVENTORY, help='Starting export')
+    parser.add_argument('--items', type=int, default=0,
+                        help='Use a synthetic export of this many items instead')
+    parser.add_argument('--snapshots', type=int, default=48, help='Snapshots in the shift (default: 48)')
+    parser.add_argument('--churn', type=float, default=0.05,
+                        help='Fraction of items touched per snapshot (default: 0.05)')
+    parser.add_argument('--seed', type=int, default=22)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    if args.items:
+        records = synthetic_inventory(args.items)
+    else:
+        with open(args.inventory) as f:
+            records = json.load(f)
+
+    t0 = 1_750_000_000.0   # 15-minute snapshots
+    snapshots = [records]
+    serial = [0]
+    for _ in range(args.snapshots - 1):
+        snapshots.append(next_snapshot(snapshots[-1], args.churn, serial))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        full_bytes = 0
+        for i, snap in enumerate(snapshots):
+            path = os.path.join(tmp, f'snap_{i:04d}.json')
+            with open(path, 'w') as f:
+                json.dump(snap, f, indent=2)
+            full_bytes += os.path.getsize(path)
+
+        log = SnapshotLog(os.path.join(tmp, 'log'))
+        start = time.perf_counter()
+        for i, snap in enumerate(snapshots):
+            log.ingest(snap, t0 + i * 900)
+        ingest_s = time.perf_counter() - start
+
+        log_bytes = sum(os.path.getsize(os.path.join(dirpath, name))
+                        for dirpath, _, names in os.walk(log.path) for name in names)
+
+        # Fresh instance so nothing is cached
+        log = SnapshotLog(log.path)
+        start = time.perf_counter()
+        ok = all(log.state_at(t0 + i * 900) == snapshot_to_state(snap) for i, snap in enumerate(snapshots))
+        state_ms = (time.perf_counter() - start) * 1000 / len(snapshots)
+
+        start = time.perf_counter()
+        for i in range(len(snapshots)):
+            with open(os.path.join(tmp, f'snap_{i:04d}.json')) as f:
+                snapshot_to_state(json.load(f))
+        reload_ms = (time.perf_counter() - start) * 1000 / len(snapshots)
+
+        start = time.perf_counter()
+        changes = log.changes(t0 + 900 * (len(snapshots) // 2), t0 + 900 * (len(snapshots) // 2 + 4))
+        window_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{len(snapshots)} snapshots x ~{len(records)} items, churn {args.churn:.0%}")
+    print(f"  full exports on disk        {full_bytes:>12,} B")
+    print(f"  log + index + checkpoints   {log_bytes:>12,} B  ({full_bytes / log_bytes:.1f}x smaller)")
+    print(f"  ingest                      {ingest_s * 1000 / len(snapshots):>10.1f} ms/snapshot")
+    print(f"  state at T                  {state_ms:>10.1f} ms   (reload full export: {reload_ms:.1f} ms)")
+    print(f"  changes over 1 hour         {window_ms:>10.1f} ms   ({len(changes)} changes)")
+    print(f"  replayed states match snapshots: {ok}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the generator scripts.
+
+Times cold-start subprocess runs of the CLI entry points and compares them with
+the cost of importing pandas/openpyxl, which both scripts used to pay on every
+invocation. Also checks that the CSV path never loads pandas.
+
+Usage:
+    python bench_startup.py
+    python bench_startup.py --runs 20 --rows 500
+"""
+
+import argparse
+import csv
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GENERATOR = os.path.join(HERE, 'warehouse_generator_v2.py')
+INVENTORY = os.path.join(HERE, 'generate_inventory.py')
+
+# Runs main() on a CSV and reports whether pandas got imported along the way
+PANDAS_PROBE = """
+import contextlib, io, sys
+sys.path.insert(0, {here!r})
+import warehouse_generator_v2 as g
+sys.argv = ['warehouse_generator_v2.py', {csv!r}, '-o', {out!r}]
+with contextlib.redirect_stdout(io.StringIO()):
+    g.main()
+print('pandas' in sys.modules)
+"""
+
+
+def write_sample_csv(path: str, rows: int):
+    """Small synthetic bay sheet: 6 sections x 4 levels per rack row"""
+    with open(path, 'w', newline='') as f:
+        w = csv.writer(f)
+        w.writerow(['BLDG', 'AREA (BAY)', 'POS X (ft)', 'POS Y', 'Width (in)',
+                    'Storage Bin', 'Height (in)', 'Depth (in)'])
+        for i in range(rows):
+            rack, rest = divmod(i, 24)
+            section, level = divmod(rest, 4)
+            w.writerow(['BLDG 22', '3E', 3.5 + rack * 3, -8 - section * 3, 36,
+                        f"3E{rack % 100:02d}{'ABCDEF'[section]}{level + 1}", 11, 18])
+
+
+def time_command(cmd, runs: int) -> float:
+    """Median wall time in milliseconds"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def module_available(name: str) -> bool:
+    result = subprocess.run([sys.executable, '-c', f'import {name}'],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return result.returncode == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cold start of the generator scripts')
+    parser.add_argument('--runs', type=int, default=10, help='Runs per command (default: 10)')
+    parser.add_argument('--rows', type=int, default=200, help='Rows in the sample CSV (default: 200)')
+    args = parser.parse_args()
+
+    py = sys.executable
+    with tempfile.TemporaryDirectory() as tmp:
+        sample = os.path.join(tmp, 'sample.csv')
+        out_dir = os.path.join(tmp, 'out')
+        write_sample_csv(sample, args.rows)
+
+        cases = [
+            ('python (empty interpreter)', [py, '-c', 'pass']),
+            ('warehouse_generator_v2 --help', [py, GENERATOR, '--help']),
+            ('generate_inventory --help', [py, INVENTORY, '--help']),
+            (f'warehouse_generator_v2 ({args.rows}-row CSV)', [py, GENERATOR, sample, '-o', out_dir]),
+            (f'generate_inventory ({args.rows}-row CSV)',
+             [py, INVENTORY, '--excel', sample, '--col', 'F', '--out', os.path.join(tmp, 'inv.json')]),
+        ]
+        # Reference: what the old module-level imports cost on every run
+        for name in ('pandas', 'openpyxl'):
+            if module_available(name):
+                cases.append((f'import {name} (old eager cost)', [py, '-c', f'import {name}']))
+
+        print(f"{'command':<45} {'median ms':>10}")
+        print('-' * 56)
+        for label, cmd in cases:
+            print(f"{label:<45} {time_command(cmd, args.runs):>10.1f}")
+
+        probe = subprocess.run(
+            [py, '-c', PANDAS_PROBE.format(csv=sample, out=out_dir, here=HERE)],
+            capture_output=True, text=True, check=True
+        )
+        print()
+        print(f"pandas imported during CSV run: {probe.stdout.strip()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Shared fixtures for the python/ tests: a small bay sheet with every kind of
+row the generator handles, written as CSV or .xlsx.
+
+    3E  two racks x sections A-C x levels 1-3 x slots A-B, plus a duplicate
+        bin, a special bin, an unparseable bin, a bin without X and a shelf
+        height that disagrees with its row (HEIGHT_MISMATCH)
+    3W  rows without positions (BAY_MISSING_POSITIONS)
+
+Run from this directory:  python -m pytest -q
+"""
+
+import csv
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GENERATOR = os.path.join(HERE, 'warehouse_generator_v2.py')
+
+COLUMNS = ['BLDG', 'AREA (BAY)', 'POS X (ft)', 'POS Y', 'Width (in)', 'Storage Bin', 'Height (in)', 'Depth (in)']
+
+
+def sheet_rows() -> list:
+    rows = []
+    for rack in (1, 2):
+        for s, section in enumerate('ABC'):
+            for level in (1, 2, 3):
+                height = 56 if level == 1 else 12 if (rack, section, level) == (1, 'C', 2) else 11
+                for slot in 'AB':
+                    rows.append(['BLDG 22', '3E', 3.5 + rack * 3, -8 - s * 3, 36,
+                                 f"3E{rack:02d}{section}{level}{slot}", height, 18])
+    rows += [
+        ['BLDG 22', '3E', 6.5, -8, 36, '3E01A1A', 56, 18],      # duplicate: first occurrence wins
+        ['BLDG 22', '3E', 1, 1, None, '3E02ENDCAP', None, None],
+        ['BLDG 22', '3E', 1, 1, None, 'XX', None, None],
+        ['BLDG 22', '3E', None, -20, 36, '3E03A1A', 56, 18],   # no X: skipped
+    ]
+    rows += [['BLDG 22', '3W', None, None, 36, f"3W01A{level}A", 11, 18] for level in (1, 2)]
+    return rows
+
+
+def write_csv(path: str, rows: list = None, columns: list = COLUMNS) -> str:
+    with open(path, 'w', newline='') as f:
+        w = csv.writer(f)
+        w.writerow(columns)
+        w.writerows(['' if v is None else v for v in row] for row in (sheet_rows() if rows is None else rows))
+    return path
+
+
+def write_xlsx(path: str, rows: list = None, columns: list = COLUMNS) -> str:
+    from openpyxl import Workbook
+    wb = Workbook()
+    ws = wb.active
+    ws.title = 'bldg22(bay3)'
+    ws.append(columns)
+    for row in sheet_rows() if rows is None else rows:
+        ws.append(row)
+    wb.save(path)
+    return path
+
+
+def run_generator(*args, **kwargs):
+    """The generator CLI in a subprocess (exit codes and module loading are part of the contract)"""
+    import subprocess
+    return subprocess.run([sys.executable, GENERATOR, *args], cwd=HERE, capture_output=True,
+                          text=True, **kwargs)
+
+
+@pytest.fixture
+def sample_csv(tmp_path) -> str:
+    return write_csv(str(tmp_path / 'bay.csv'))
+
+
+@pytest.fixture
+def sample_xlsx(tmp_path) -> str:
+    pytest.importorskip('openpyxl')
+    return write_xlsx(str(tmp_path / 'bay.xlsx'))
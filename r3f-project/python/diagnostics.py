@@ -0,0 +1,162 @@
+"""
+Structured diagnostics for the warehouse generator
+
+Every data problem is recorded as a Diagnostic with a stable code instead of a
+free-text warning string. A DiagnosticLog keeps a count per code plus a
+capped number of example records, so a sheet producing tens of thousands of
+identical problems (e.g. special bins) costs O(1) memory per code and
+summarizing is a single pass over the codes, not the messages.
+
+Logs are written to their own file ({building}_bay{bay}_diagnostics.json)
+so the bay JSON that clients download only carries the per-code counts.
+
+Usage:
+    log = DiagnosticLog(max_examples=20)
+    log.add(Diagnostic(HEIGHT_MISMATCH, "Row 09, Level 1: ...", bay="3E"))
+    log.count(WARNING)      # -> 1
+    log.to_dict()           # counts + examples, JSON-serializable
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+# Severities, most to least serious
+CRITICAL = 'critical'   # input unreadable - nothing can be generated
+ERROR = 'error'         # data is lost: a bay or bin cannot be generated
+WARNING = 'warning'     # generated, but the data looks wrong
+INFO = 'info'           # expected/intentional skips
+
+SEVERITIES = (CRITICAL, ERROR, WARNING, INFO)
+
+
+@dataclass(frozen=True)
+class Code:
+    """A diagnostic type - name is the stable identifier written to files"""
+    name: str
+    severity: str
+    description: str
+
+
+# ============================================================================
+# CODES
+# ============================================================================
+
+INPUT_UNREADABLE = Code('INPUT_UNREADABLE', CRITICAL, "Input file cannot be opened or parsed")
+SHEET_NOT_FOUND = Code('SHEET_NOT_FOUND', CRITICAL, "Requested sheet is not in the workbook")
+MISSING_COLUMNS = Code('MISSING_COLUMNS', CRITICAL, "Required columns are missing from the header")
+MISSING_POSITION_COLUMNS = Code('MISSING_POSITION_COLUMNS', WARNING, "POS X / POS Y columns are missing")
+NO_BAY_DATA = Code('NO_BAY_DATA', ERROR, "No rows found for the bay")
+BAY_MISSING_POSITIONS = Code('BAY_MISSING_POSITIONS', ERROR, "No bin in the bay has X/Y coordinates")
+PARTIAL_MISSING_X = Code('PARTIAL_MISSING_X', WARNING, "Some bins have no X coordinate and are skipped")
+PARTIAL_MISSING_Y = Code('PARTIAL_MISSING_Y', WARNING, "Some bins have no Y coordinate and are skipped")
+NON_NUMERIC_VALUE = Code('NON_NUMERIC_VALUE', ERROR, "Position/dimension cell is not a number")
+UNPARSEABLE_BIN = Code('UNPARSEABLE_BIN', ERROR, "Storage Bin does not match the bin name format")
+SPECIAL_BIN = Code('SPECIAL_BIN', INFO, "Special location (ENDCAP, BACKAREA, ...) skipped")
+HEIGHT_MISMATCH = Code('HEIGHT_MISMATCH', WARNING, "Sections of a row/level disagree on shelf height")
+
+CODES: Dict[str, Code] = {c.name: c for c in (
+    INPUT_UNREADABLE, SHEET_NOT_FOUND, MISSING_COLUMNS, MISSING_POSITION_COLUMNS, NO_BAY_DATA,
+    BAY_MISSING_POSITIONS, PARTIAL_MISSING_X, PARTIAL_MISSING_Y, NON_NUMERIC_VALUE,
+    UNPARSEABLE_BIN, SPECIAL_BIN, HEIGHT_MISMATCH,
+)}
+
+
+# ============================================================================
+# RECORDS
+# ============================================================================
+
+@dataclass
+class Diagnostic:
+    """One occurrence of a problem"""
+    code: Code
+    message: str
+    bay: Optional[str] = None
+    bin: Optional[str] = None
+
+    @property
+    def severity(self) -> str:
+        return self.code.severity
+
+    def to_dict(self) -> dict:
+        d = {"code": self.code.name, "severity": self.severity, "message": self.message}
+        if self.bay is not None:
+            d["bay"] = self.bay
+        if self.bin is not None:
+            d["bin"] = self.bin
+        return d
+
+
+class DiagnosticLog:
+    """
+    Per-code counts plus up to max_examples records per code (0 = keep all).
+
+    add() is O(1); count()/summaries iterate codes, never individual records.
+    """
+
+    def __init__(self, max_examples: int = 20):
+        self.max_examples = max_examples
+        self.counts: Dict[str, int] = {}
+        self.examples: Dict[str, List[Diagnostic]] = {}
+
+    def add(self, diagnostic: Diagnostic):
+        name = diagnostic.code.name
+        n = self.counts.get(name, 0)
+        self.counts[name] = n + 1
+        if n == 0:
+            self.examples[name] = []
+        if not self.max_examples or n < self.max_examples:
+            self.examples[name].append(diagnostic)
+
+    def extend(self, diagnostics: Iterable[Diagnostic]):
+        for d in diagnostics:
+            self.add(d)
+
+    def merge(self, other: 'DiagnosticLog'):
+        """Fold in another log's counts and examples (examples capped as in add)"""
+        for name, n in other.counts.items():
+            kept = self.counts.get(name, 0)
+            self.counts[name] = kept + n
+            examples = self.examples.setdefault(name, [])
+            room = self.max_examples - len(examples) if self.max_examples else len(other.examples[name])
+            examples.extend(other.examples[name][:max(room, 0)])
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+
+    def count(self, severity: str = None, code: Code = None) -> int:
+        """Total records, optionally filtered by severity or a single code"""
+        if code is not None:
+            return self.counts.get(code.name, 0)
+        if severity is None:
+            return len(self)
+        return sum(n for name, n in self.counts.items() if CODES[name].severity == severity)
+
+    def messages(self, code: Code) -> List[str]:
+        """Example messages kept for a code"""
+        return [d.message for d in self.examples.get(code.name, [])]
+
+    def example_messages(self) -> List[str]:
+        """Messages of every kept example, code by code (the pre-diagnostics "warnings" list)"""
+        return [d.message for examples in self.examples.values() for d in examples]
+
+    def by_severity(self) -> Dict[str, int]:
+        totals = {s: 0 for s in SEVERITIES}
+        for name, n in self.counts.items():
+            totals[CODES[name].severity] += n
+        return totals
+
+    def to_dict(self) -> dict:
+        return {
+            "total": len(self),
+            "by_severity": self.by_severity(),
+            "codes": {
+                name: {
+                    "severity": CODES[name].severity,
+                    "description": CODES[name].description,
+                    "count": n,
+                    "examples": [d.to_dict() for d in self.examples[name]],
+                    "truncated": n > len(self.examples[name]),
+                }
+                for name, n in self.counts.items()
+            },
+        }
@@ -10,17 +10,19 @@ Generate mock inventory JSON from an Excel sheet.
     * If ends with two digits and first is '0' (e.g. 3W34A03) -> compress => 3W34A3
 - Dedupes bins (preserving order)
 - Generates N mock inventory items with those bins
+
+openpyxl is only imported when an .xlsx is actually read; a CSV export of
+the same sheet goes through the standard library csv module.
 """
 
 from __future__ import annotations
 import argparse
+import csv
 import json
 import random
 import re
 import string
-from typing import List, Optional
-
-from openpyxl import load_workbook
+from typing import Iterator, List, Optional
 
 
 # -----------------------------
@@ -90,20 +92,42 @@ def rand_dim(minv: int, maxv: int) -> str:
 # -----------------------------
 # Main
 # -----------------------------
-def read_bins_from_excel(
-    excel_path: str,
+def iter_column_values(
+    path: str,
     sheet_name: Optional[str],
     col_letter: str,
     max_row: int,
-) -> List[str]:
-    wb = load_workbook(excel_path, data_only=True)
+) -> Iterator[object]:
+    """Yield raw cell values of one column, rows 1..max_row (xlsx or csv)."""
+    col = ord(col_letter.upper()) - ord("A") + 1  # 'G' -> 7
+
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for r, values in enumerate(csv.reader(f), start=1):
+                if r > max_row:
+                    break
+                if len(values) >= col and values[col - 1].strip():
+                    yield values[col - 1]
+        return
+
+    # Lazy import: openpyxl is slow to load and only needed for workbooks
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
     ws = wb[sheet_name] if sheet_name else wb.active
+    for (v,) in ws.iter_rows(min_row=1, max_row=max_row, min_col=col, max_col=col, values_only=True):
+        yield v
+    wb.close()
 
-    col = ord(col_letter.upper()) - ord("A") + 1  # 'G' -> 7
 
+def read_bins_from_excel(
+    excel_path: str,
+    sheet_name: Optional[str],
+    col_letter: str,
+    max_row: int,
+) -> List[str]:
     bins: List[str] = []
-    for r in range(1, max_row + 1):
-        v = ws.cell(row=r, column=col).value
+    for v in iter_column_values(excel_path, sheet_name, col_letter, max_row):
         if v is None:
             continue
         norm = normalize_bin(str(v))
@@ -153,7 +177,7 @@ def make_inventory_items(bins: List[str], n: int, seed: int) -> List[dict]:
 
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--excel", required=True, help="Path to the Excel file")
+    ap.add_argument("--excel", required=True, help="Path to the Excel file (or a CSV export of it)")
     ap.add_argument("--sheet", default=None, help="Sheet name (default: active)")
     ap.add_argument("--col", default="G", help="Column letter for bins (default: G)")
     ap.add_argument("--max-row", type=int, default=701, help="Max row to read (default: 701)")
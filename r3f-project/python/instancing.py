@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Instancing batches for the viewer
+
+Containers in a bay come in a handful of sizes (section width / slots per
+section x canonical level heights x depth). Instead of one mesh per slot,
+the viewer can draw each size as a single InstancedMesh. This module groups
+a bay's containers by dimensions into batches:
+
+    {
+      "building": "BLDG 22",
+      "bay": "3E",
+      "metadata": {"total_instances": 508, "total_batches": 10, "units": "feet",
+                   "translation": "box center"},
+      "ids": ["3E01A1A", ...],             # container ids, bay JSON order
+      "batches": [
+        {
+          "dimensions": {"x": 3.0, "y": 0.9167, "z": 1.5},
+          "count": 284,
+          "translations": [x0, y0, z0, x1, ...],   # 3 floats per instance
+          "indices": [0, 1, ...]                   # instance -> ids[] index
+        }
+      ]
+    }
+
+Batches are sorted by instance count (largest first). Materials are not part
+of the key: the only per-slot look is the fill color, which depends on live
+inventory and is set per instance in the viewer (instanceColor).
+
+Usage:
+    python instancing.py ../src/data/bldg22_bay3E_containers.json -o ./output
+    python warehouse_generator_v2.py input.xlsx --instances
+"""
+
+import argparse
+import gzip
+import json
+import os
+from typing import Dict, List, Tuple
+
+# Draw calls one slot costs in SlotContainerVisual: hitbox, shell and six
+# cage lines, plus fill + seam when partially filled
+SLOT_DRAW_CALLS = (8, 10)
+
+# Draw calls per batch in InstancedSlots: shell + fill
+BATCH_DRAW_CALLS = 2
+
+DimensionKey = Tuple[float, float, float]
+
+
+class InstanceBatcher:
+    """
+    Groups container dicts (Container.to_dict() shape) by dimensions.
+
+    add() is O(1); only ids, the per-batch translation arrays and indices are
+    kept, not the container dicts.
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self._batches: Dict[DimensionKey, dict] = {}
+
+    def add(self, container: dict):
+        dims, pos = container['dimensions'], container['position']
+        key = (dims['x'], dims['y'], dims['z'])
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = {"translations": [], "indices": []}
+
+        # Positions are the min corner; instances are translated to the center
+        batch["translations"].extend((
+            round(pos['x'] + key[0] / 2, 4),
+            round(pos['y'] + key[1] / 2, 4),
+            round(pos['z'] + key[2] / 2, 4),
+        ))
+        batch["indices"].append(len(self.ids))
+        self.ids.append(container['id'])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def batches(self) -> List[dict]:
+        ordered = sorted(self._batches.items(), key=lambda kv: -len(kv[1]["indices"]))
+        return [
+            {
+                "dimensions": {"x": key[0], "y": key[1], "z": key[2]},
+                "count": len(batch["indices"]),
+                "translations": batch["translations"],
+                "indices": batch["indices"],
+            }
+            for key, batch in ordered
+        ]
+
+    def to_dict(self, building: str, bay: str) -> dict:
+        batches = self.batches()
+        return {
+            "building": building,
+            "bay": bay,
+            "metadata": {
+                "total_instances": len(self.ids),
+                "total_batches": len(batches),
+                "units": "feet",
+                "translation": "box center",
+            },
+            "ids": self.ids,
+            "batches": batches,
+        }
+
+
+def build_instances(bay_dict: dict) -> dict:
+    """Instancing batches for a bay JSON (BayData.to_dict() / *_containers.json)"""
+    batcher = InstanceBatcher()
+    for container in bay_dict.get('containers', []):
+        batcher.add(container)
+    return batcher.to_dict(bay_dict.get('building'), bay_dict.get('bay'))
+
+
+def instances_filename(building_key: str, bay: str) -> str:
+    return f"{building_key}_bay{bay}_instances.json"
+
+
+def save_instances(instances: dict, filepath: str):
+    """Compact JSON - the file is mostly flat number arrays"""
+    with open(filepath, 'w') as f:
+        json.dump(instances, f, separators=(',', ':'))
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def _sizes(data: dict, **dump_args) -> Tuple[int, int]:
+    """(raw bytes, gzip bytes) of data serialized as JSON"""
+    raw = json.dumps(data, **dump_args).encode()
+    return len(raw), len(gzip.compress(raw))
+
+
+def report(bay_dict: dict, instances: dict) -> dict:
+    """Draw-call and payload comparison: per-slot meshes vs instancing batches"""
+    n = instances["metadata"]["total_instances"]
+    per_slot = {"containers": bay_dict.get('containers', [])}
+    return {
+        "instances": n,
+        "batches": instances["metadata"]["total_batches"],
+        "draw_calls_per_slot": (n * SLOT_DRAW_CALLS[0], n * SLOT_DRAW_CALLS[1]),
+        "draw_calls_instanced": instances["metadata"]["total_batches"] * BATCH_DRAW_CALLS,
+        "containers_bytes": _sizes(per_slot, indent=2),
+        "containers_compact_bytes": _sizes(per_slot, separators=(',', ':')),
+        "instances_bytes": _sizes(instances, separators=(',', ':')),
+    }
+
+
+def print_report(name: str, r: dict):
+    lo, hi = r["draw_calls_per_slot"]
+    print(f"{name}: {r['instances']} containers -> {r['batches']} batches")
+    print(f"    draw calls: {lo}-{hi} (mesh per slot) -> {r['draw_calls_instanced']} (instanced)")
+    for label, key in (("containers (indent=2)", "containers_bytes"),
+                       ("containers (compact)", "containers_compact_bytes"),
+                       ("instances", "instances_bytes")):
+        raw, gz = r[key]
+        print(f"    {label:<22} {raw:>10,} B   gzip {gz:>9,} B")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build instancing batches from bay container JSON files')
+    parser.add_argument('files', nargs='+', help='*_containers.json files')
+    parser.add_argument('--output-dir', '-o', default=None,
+                        help='Write *_instances.json here (default: report only)')
+    args = parser.parse_args()
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    for path in args.files:
+        with open(path) as f:
+            bay_dict = json.load(f)
+        instances = build_instances(bay_dict)
+        print_report(os.path.basename(path), report(bay_dict, instances))
+
+        if args.output_dir:
+            building_key = str(bay_dict.get('building', 'UNKNOWN')).replace(' ', '').lower()
+            out = os.path.join(args.output_dir, instances_filename(building_key, bay_dict.get('bay')))
+            save_instances(instances, out)
+            print(f"    -> {out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Live slot occupancy: inventory movement events -> batched deltas for viewers
+
+Fill levels in the viewer otherwise only change when inventory.json is
+regenerated. This service reads movement events from a local source, keeps
+the occupancy of every container in memory and pushes coalesced changes to
+connected viewers as Server-Sent Events.
+
+Sources (stand-ins for the WMS feed), one JSON object per line:
+    --tail events.jsonl        follow a JSON Lines file (rotation/truncation safe)
+    --socket 127.0.0.1:9301    accept feeders on a local TCP socket
+
+Events:
+    {"container": "3E01A1A", "lofull": 75, "inavlq": 12}    set fill % and/or quantity
+    {"container": "3E01A1A", "delta": -3}                   inavlq += delta
+    {"container": "3E01A1A", "clear": true}                 slot emptied
+    optional "ts": sender's epoch seconds, used for latency reporting
+
+Values must be whole numbers (50 or 50.0; 50.7 is rejected, not truncated).
+An event with any bad field is rejected whole and leaves the state as it was.
+
+Batching: changes are keyed by container id, so a burst of events for one
+slot becomes one entry. Every --interval seconds (or as soon as --max-batch
+containers are pending) the pending entries go out as a single message:
+
+    event: occupancy
+    data: {"seq": 42, "sent": 1760000000.2, "events": 5120,
+           "sourceTs": [oldest, newest],
+           "changes": {"3E01A1A": {"lofull": 75, "inavlq": 12}, "3E01A1B": null}}
+
+Entries carry absolute values (null = cleared), so a batch can be applied
+more than once. A viewer connecting gets a "snapshot" event with the whole
+state first. Each viewer has a bounded queue; one that falls --queue
+batches behind is disconnected and resyncs from a fresh snapshot when its
+EventSource reconnects.
+
+HTTP (stdlib asyncio, no extra dependencies):
+    GET /events   text/event-stream (snapshot, then occupancy batches)
+    GET /state    current state as JSON
+    GET /stats    counters
+
+Usage:
+    python live_occupancy.py --tail events.jsonl
+    python live_occupancy.py --socket 127.0.0.1:9301 --bay output/bldg22_bay3E_containers.json
+    python bench_live.py --rates 10000 50000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+READ_CHUNK = 1 << 20
+HEARTBEAT_SECONDS = 15.0
+
+
+# ============================================================================
+# STATE
+# ============================================================================
+
+def whole_number(value) -> int:
+    """int(value), but a float with a fractional part is an error rather than truncated"""
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"Not a whole number: {value!r}")
+    return int(value)
+
+
+class OccupancyState:
+    """
+    Occupancy per container id plus the changes not yet sent.
+
+    pending maps container id -> its live record (or None when cleared); the
+    record is serialized when the batch is drained, so it always carries the
+    latest values.
+    """
+
+    def __init__(self, containers: Optional[Set[str]] = None):
+        self.slots: Dict[str, dict] = {}
+        self.pending: Dict[str, Optional[dict]] = {}
+        self.known = containers
+        self.seq = 0
+        self.events = 0
+        self.rejected = 0
+        self._coalesced = 0
+        self._ts_range: Optional[List[float]] = None
+
+    def apply_lines(self, lines: List[bytes]) -> int:
+        """Apply raw JSON lines; returns how many were accepted"""
+        lines = [line for line in lines if line and not line.isspace()]
+        try:
+            # One C-level parse for the whole chunk; per line only if some line is bad
+            events = json.loads(b'[' + b','.join(lines) + b']')
+        except ValueError:
+            events = []
+            for line in lines:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    self.rejected += 1
+        return self.apply(events)
+
+    def apply(self, events: List[dict]) -> int:
+        """Apply decoded events; returns how many were accepted"""
+        slots, pending, known = self.slots, self.pending, self.known
+        accepted = 0
+        for event in events:
+            try:
+                cid = event['container']
+                if known is not None and cid not in known:
+                    raise KeyError(cid)
+                if event.get('clear'):
+                    slots.pop(cid, None)
+                    pending[cid] = None
+                else:
+                    # Parse every field before touching the state, so a bad one changes nothing
+                    lofull = whole_number(event['lofull']) if 'lofull' in event else None
+                    inavlq = whole_number(event['inavlq']) if 'inavlq' in event else None
+                    delta = whole_number(event['delta']) if 'delta' in event else 0
+                    record = slots.get(cid)
+                    if record is None:
+                        record = slots[cid] = {"lofull": 0, "inavlq": 0}
+                    if lofull is not None:
+                        record['lofull'] = lofull
+                    if inavlq is not None:
+                        record['inavlq'] = inavlq
+                    record['inavlq'] += delta
+                    pending[cid] = record
+            except (ValueError, KeyError, TypeError, AttributeError):
+                self.rejected += 1
+                continue
+            accepted += 1
+            ts = event.get('ts')
+            if isinstance(ts, (int, float)):
+                if self._ts_range is None:
+                    self._ts_range = [ts, ts]
+                elif ts < self._ts_range[0]:
+                    self._ts_range[0] = ts
+                elif ts > self._ts_range[1]:
+                    self._ts_range[1] = ts
+        self.events += accepted
+        self._coalesced += accepted
+        return accepted
+
+    def drain(self) -> Optional[bytes]:
+        """Encode pending changes as one SSE occupancy message, or None if nothing changed"""
+        if not self.pending:
+            return None
+        self.seq += 1
+        message = {"seq": self.seq, "sent": round(time.time(), 4), "events": self._coalesced}
+        if self._ts_range is not None:
+            message["sourceTs"] = self._ts_range
+        message["changes"] = self.pending
+        payload = sse_message('occupancy', message, self.seq)
+        self.pending, self._coalesced, self._ts_range = {}, 0, None
+        return payload
+
+    def snapshot(self) -> dict:
+        return {"seq": self.seq, "slots": self.slots}
+
+
+def sse_message(event: str, data: dict, seq: int) -> bytes:
+    return f"id: {seq}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+def split_lines(rest: bytes, chunk: bytes) -> Tuple[List[bytes], bytes]:
+    """Complete lines of rest + chunk, and the unterminated tail"""
+    *lines, tail = (rest + chunk).split(b'\n')
+    return lines, tail
+
+
+# ============================================================================
+# FAN-OUT
+# ============================================================================
+
+class Broadcaster:
+    """
+    Bounded per-viewer queues; a viewer that overflows is dropped.
+
+    Dropping aborts the viewer's connection as well as queuing the None
+    sentinel: a viewer that stopped reading is parked in writer.drain() and
+    would never get to the sentinel.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self.clients: Dict[asyncio.Queue, asyncio.StreamWriter] = {}
+        self.dropped = 0
+
+    def subscribe(self, writer: asyncio.StreamWriter) -> asyncio.Queue:
+        queue = asyncio.Queue(self.queue_size)
+        self.clients[queue] = writer
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.clients.pop(queue, None)
+
+    def publish(self, payload: bytes):
+        for queue in list(self.clients):
+            try:
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                writer = self.clients.pop(queue)
+                self.dropped += 1
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+                writer.transport.abort()
+
+
+class OccupancyService:
+    """Sources feed the state; a flush task batches it out to viewers"""
+
+    def __init__(self, state: OccupancyState, interval: float = 0.1, max_batch: int = 20000,
+                 queue_size: int = 64):
+        self.state = state
+        self.interval = interval
+        self.max_batch = max_batch
+        self.hub = Broadcaster(queue_size)
+        self.wake = asyncio.Event()
+        self.batches = 0
+        self.bytes_out = 0
+        self.started = time.time()
+
+    def feed(self, lines: List[bytes]):
+        self.state.apply_lines(lines)
+        if len(self.state.pending) >= self.max_batch:
+            self.wake.set()
+
+    async def flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self.wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wake.clear()
+            payload = self.state.drain()
+            if payload is not None:
+                self.batches += 1
+                self.bytes_out += len(payload) * len(self.hub.clients)
+                self.hub.publish(payload)
+
+    def stats(self) -> dict:
+        return {
+            "uptime": round(time.time() - self.started, 1),
+            "events": self.state.events,
+            "rejected": self.state.rejected,
+            "containers": len(self.state.slots),
+            "pending": len(self.state.pending),
+            "batches": self.batches,
+            "seq": self.state.seq,
+            "clients": len(self.hub.clients),
+            "dropped_clients": self.hub.dropped,
+            "bytes_out": self.bytes_out,
+        }
+
+    # ------------------------------------------------------------------
+    # Sources
+    # ------------------------------------------------------------------
+
+    async def tail(self, path: str, from_start: bool = False, poll: float = 0.05):
+        """Follow a JSON Lines file; reopens from the top when it is rotated or truncated"""
+        f, rest = None, b''
+        try:
+            while True:
+                if f is None:
+                    if not os.path.exists(path):
+                        await asyncio.sleep(poll)
+                        continue
+                    f = open(path, 'rb')
+                    if not from_start:
+                        f.seek(0, os.SEEK_END)
+                    from_start, rest = True, b''   # later reopens read the new file whole
+                chunk = f.read(READ_CHUNK)
+                if chunk:
+                    lines, rest = split_lines(rest, chunk)
+                    self.feed(lines)
+                    await asyncio.sleep(0)          # let the flush task run under load
+                    continue
+                try:
+                    st = os.stat(path)
+                    replaced = st.st_ino != os.fstat(f.fileno()).st_ino or st.st_size < f.tell()
+                except FileNotFoundError:
+                    replaced = True
+                if replaced:
+                    f.close()
+                    f = None
+                await asyncio.sleep(poll)
+        finally:
+            if f is not None:
+                f.close()
+
+    async def _feeder(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        rest = b''
+        try:
+            while True:
+                chunk = await reader.read(READ_CHUNK)
+                if not chunk:
+                    break
+                lines, rest = split_lines(rest, chunk)
+                self.feed(lines)
+                await asyncio.sleep(0)
+            if rest:
+                self.feed([rest])
+        finally:
+            writer.close()
+
+    async def serve_socket(self, host: str, port: int) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self._feeder, host, port)
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    async def serve_http(self, host: str, port: int) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self._http, host, port)
+
+    async def _http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+            method, target = head.split(b'\r\n', 1)[0].decode('latin-1').split(' ')[:2]
+            path = target.split('?', 1)[0]
+            if method != 'GET':
+                await _respond(writer, 405, b'{"error":"GET only"}')
+            elif path == '/events':
+                await self._stream(writer)
+            elif path == '/state':
+                await _respond(writer, 200, json.dumps(self.state.snapshot(), separators=(',', ':')).encode())
+            elif path == '/stats':
+                await _respond(writer, 200, json.dumps(self.stats()).encode())
+            else:
+                await _respond(writer, 404, b'{"error":"not found"}')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _stream(self, writer: asyncio.StreamWriter):
+        # Subscribe and snapshot in the same step, so no batch falls between them
+        queue = self.hub.subscribe(writer)
+        snapshot = sse_message('snapshot', self.state.snapshot(), self.state.seq)
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                         b"Cache-Control: no-cache\r\nConnection: keep-alive\r\n"
+                         b"Access-Control-Allow-Origin: *\r\n\r\nretry: 1000\n\n" + snapshot)
+            await writer.drain()
+            while True:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    payload = b": keepalive\n\n"
+                if payload is None:
+                    break
+                writer.write(payload)
+                await writer.drain()
+        finally:
+            self.hub.unsubscribe(queue)
+
+
+async def _respond(writer: asyncio.StreamWriter, status: int, body: bytes):
+    reason = {200: 'OK', 404: 'Not Found', 405: 'Method Not Allowed'}[status]
+    writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\nAccess-Control-Allow-Origin: *\r\n"
+                 f"Connection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def _host_port(value: str) -> Tuple[str, int]:
+    host, _, port = value.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+async def run(args):
+    known = None
+    if args.bay:
+        with open(args.bay) as f:
+            known = {c['id'] for c in json.load(f).get('containers', [])}
+    service = OccupancyService(OccupancyState(known), args.interval, args.max_batch, args.queue)
+
+    tasks = [asyncio.create_task(service.flush_loop())]
+    servers = [await service.serve_http(*_host_port(args.http))]
+    if args.tail:
+        tasks.append(asyncio.create_task(service.tail(args.tail, args.from_start)))
+    if args.socket:
+        servers.append(await service.serve_socket(*_host_port(args.socket)))
+
+    print(f"Viewers: http://{args.http}/events  (stats: /stats, state: /state)")
+    if args.tail:
+        print(f"Tailing {args.tail}")
+    if args.socket:
+        print(f"Feeders: tcp://{args.socket}")
+    if known is not None:
+        print(f"Accepting {len(known)} container ids from {args.bay}")
+
+    last = service.stats()
+    while True:
+        await asyncio.sleep(args.report)
+        now = service.stats()
+        print(f"{(now['events'] - last['events']) / args.report:>10,.0f} events/s  "
+              f"{now['batches'] - last['batches']:>4} batches  {now['clients']} viewers  "
+              f"{now['containers']} containers  {now['rejected']} rejected", flush=True)
+        last = now
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Live slot occupancy from movement events')
+    parser.add_argument('--tail', default=None, help='JSON Lines file to follow')
+    parser.add_argument('--from-start', action='store_true', help='Replay the tailed file from the top')
+    parser.add_argument('--socket', default=None, help='HOST:PORT to accept event feeders on')
+    parser.add_argument('--http', default='127.0.0.1:8765', help='HOST:PORT for viewers (default: 127.0.0.1:8765)')
+    parser.add_argument('--bay', default=None, help='Bay file; events for other container ids are rejected')
+    parser.add_argument('--interval', type=float, default=0.1,
+                        help='Seconds between batches (default: 0.1)')
+    parser.add_argument('--max-batch', type=int, default=20000,
+                        help='Send early once this many containers are pending (default: 20000)')
+    parser.add_argument('--queue', type=int, default=64,
+                        help='Batches a viewer may fall behind before it is dropped (default: 64)')
+    parser.add_argument('--report', type=float, default=5.0, help='Seconds between console stats (default: 5)')
+    args = parser.parse_args()
+    if not args.tail and not args.socket:
+        parser.error('give --tail and/or --socket')
+
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Staged generator pipeline with persisted intermediates
+
+Splits warehouse_generator_v2 into explicit stages, each keyed by a hash of
+its inputs and cached on disk, so changing a Config value only recomputes the
+stages that depend on it:
+
+    load       sheet rows + load diagnostics      <- input file bytes, sheet
+    parse      per-bay rows, unique bins, parsed  <- load
+    validate   completeness, level heights,       <- parse
+               skipped-bin / height diagnostics
+    height     per-section level Y positions      <- validate + HEIGHT_FIELDS
+    geometry   containers + racks                 <- height + GEOMETRY_FIELDS
+    serialize  bay / diagnostics / instances / shard files (always written)
+
+Stages are resolved lazily from the end: if a variant's geometry is cached
+the sheet is never read. Keys also cover the source of the generator and
+this module, so editing either invalidates the cache.
+
+Sweep mode runs several Config variants in one process; variants share the
+load/parse/validate results (and height models where the height fields
+match) and are written to one sub-directory each.
+
+Output for a single variant is identical to a normal generator run.
+
+Usage:
+    python pipeline.py input.xlsx -o ./output
+    python pipeline.py input.xlsx -o ./sweep --vary shelf_thickness_inches=2,3,4 \\
+        --vary max_slots_per_section=6,8
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import pickle
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from diagnostics import DiagnosticLog
+from warehouse_generator_v2 import (
+    BayData, Config, Container, Row, add_level_height, bay_diagnostics, build_container,
+    canonical_level_heights, completeness_diagnostics, distinct_values,
+    generate_racks, height_mismatch_diagnostics, is_fatal, is_missing,
+    load_and_validate, load_error_bay, parse_bin_name, rows_for_bay,
+    save_results, section_y_positions, skipped_bin_diagnostic, unique_bins,
+)
+
+# Config fields each config-dependent stage reads
+HEIGHT_FIELDS = ('inches_to_feet', 'shelf_thickness_inches', 'level_1_floor_offset_inches',
+                 'default_height_inches')
+GEOMETRY_FIELDS = ('feet_to_units', 'inches_to_feet', 'shelf_thickness_inches',
+                   'level_1_floor_offset_inches', 'default_width_inches',
+                   'default_height_inches', 'default_depth_inches', 'max_slots_per_section')
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SOURCES = ('warehouse_generator_v2.py', 'diagnostics.py', 'pipeline.py')
+
+
+# ============================================================================
+# STAGE OUTPUTS
+# ============================================================================
+
+@dataclass
+class ParsedBay:
+    """Config-independent view of one bay's rows"""
+    rows: List[Row]                    # every row of the bay (duplicates included)
+    parsed_rows: List[Optional[Dict]]  # parse_bin_name() per row
+    bins: List[Row]                    # first row per Storage Bin
+
+
+@dataclass
+class SheetLayout:
+    """Which building/bay files a sheet produces, plus why it could not be read"""
+    buildings: List[str]
+    bays: List[str]
+    present: set                       # (building, bay) pairs with rows
+    load_diagnostics: list
+
+
+@dataclass
+class ParsedSheet:
+    layout: SheetLayout
+    by_bay: Dict[str, ParsedBay] = field(default_factory=dict)
+
+
+@dataclass
+class ValidatedBay:
+    is_complete: bool
+    completeness: list                 # completeness Diagnostics
+    height_diagnostics: list           # HEIGHT_MISMATCH Diagnostics
+    skipped: list                      # UNPARSEABLE_BIN / SPECIAL_BIN, unique-bin order
+    level_heights: Dict[str, Dict[int, Dict[float, List[str]]]]
+    section_levels: Dict[Tuple[str, str], set]
+
+
+@dataclass
+class ValidatedSheet:
+    """Everything serialize needs besides geometry - no rows"""
+    layout: SheetLayout
+    by_bay: Dict[str, ValidatedBay] = field(default_factory=dict)
+
+
+# ============================================================================
+# STAGE FUNCTIONS
+# ============================================================================
+
+def stage_load(filepath: str, sheet_name: Optional[str]):
+    return load_and_validate(filepath, sheet_name)
+
+
+def stage_parse(loaded) -> ParsedSheet:
+    rows, load_diagnostics = loaded
+    sheet = ParsedSheet(SheetLayout(
+        buildings=distinct_values(rows, 'BLDG'),
+        bays=distinct_values(rows, 'AREA (BAY)'),
+        present={(r.get('BLDG'), r.get('AREA (BAY)')) for r in rows},
+        load_diagnostics=load_diagnostics,
+    ))
+    for bay in sheet.layout.bays:
+        bay_rows = rows_for_bay(rows, bay)
+        sheet.by_bay[bay] = ParsedBay(
+            rows=bay_rows,
+            parsed_rows=[parse_bin_name(r.get('Storage Bin')) for r in bay_rows],
+            bins=unique_bins(bay_rows),
+        )
+    return sheet
+
+
+def stage_validate(sheet: ParsedSheet) -> ValidatedSheet:
+    """Same checks as process_bay, minus anything that reads Config"""
+    validated = ValidatedSheet(sheet.layout)
+    for bay, parsed_bay in sheet.by_bay.items():
+        bins = parsed_bay.bins
+        missing_x = sum(1 for r in bins if is_missing(r.get('POS X (ft)')))
+        missing_y = sum(1 for r in bins if is_missing(r.get('POS Y')))
+        is_complete, completeness = completeness_diagnostics(bay, len(bins), missing_x, missing_y)
+
+        level_heights = defaultdict(lambda: defaultdict(dict))
+        section_levels = defaultdict(set)
+        for r, p in zip(parsed_bay.rows, parsed_bay.parsed_rows):
+            if p is None or p.get('level') is None:
+                continue
+            section_levels[(p['row'], p['section'])].add(p['level'])
+            if not is_missing(r.get('Height (in)')):
+                add_level_height(level_heights, p, r['Height (in)'])
+
+        skipped = []
+        for r in bins:
+            d = skipped_bin_diagnostic(r, parse_bin_name(r['Storage Bin']))
+            if d:
+                skipped.append(d)
+
+        validated.by_bay[bay] = ValidatedBay(
+            is_complete=is_complete,
+            completeness=completeness,
+            height_diagnostics=height_mismatch_diagnostics(level_heights, bay),
+            skipped=skipped,
+            # Plain dicts so the result pickles
+            level_heights={row: dict(levels) for row, levels in level_heights.items()},
+            section_levels=dict(section_levels),
+        )
+    return validated
+
+
+def stage_height(validated: ValidatedSheet, config: Config) -> Dict[str, dict]:
+    return {
+        bay: section_y_positions(v.section_levels, canonical_level_heights(v.level_heights, config), config)
+        for bay, v in validated.by_bay.items() if v.is_complete
+    }
+
+
+def stage_geometry(sheet: ParsedSheet, height_maps: Dict[str, dict], config: Config) -> Dict[str, tuple]:
+    """bay -> (containers, racks) for complete bays"""
+    geometry = {}
+    for bay, height_map in height_maps.items():
+        containers: List[Container] = []
+        for row in sheet.by_bay[bay].bins:
+            container, _ = build_container(row, height_map, config)  # skips recorded by validate
+            if container:
+                containers.append(container)
+        geometry[bay] = (containers, generate_racks(containers))
+    return geometry
+
+
+def assemble(validated: ValidatedSheet, geometry: Dict[str, tuple],
+             max_examples: int = 20) -> Dict[str, Dict[str, BayData]]:
+    """Stage outputs -> process_excel()-shaped results (same diagnostics order)"""
+    layout = validated.layout
+    load_diagnostics = layout.load_diagnostics
+    if is_fatal(load_diagnostics):
+        return {"UNKNOWN": {"UNKNOWN": load_error_bay(load_diagnostics)}}
+
+    results = defaultdict(dict)
+    for building in layout.buildings:
+        building_key = building.replace(' ', '').lower()
+        for bay in layout.bays:
+            if (building, bay) not in layout.present:
+                continue
+            v = validated.by_bay[bay]
+            bay_data = BayData(building=building, bay=bay, diagnostics=DiagnosticLog(max_examples))
+            bay_data.diagnostics.extend(v.completeness)
+            if v.is_complete:
+                bay_data.diagnostics.extend(v.height_diagnostics)
+                bay_data.diagnostics.extend(v.skipped)
+                bay_data.containers, bay_data.racks = geometry[bay]
+            else:
+                bay_data.errors.extend(d.message for d in v.completeness)
+            bay_data.diagnostics.extend(bay_diagnostics(load_diagnostics, bay))
+            results[building_key][bay] = bay_data
+    return dict(results)
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+def _digest(*parts) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(json.dumps(part, sort_keys=True, default=str).encode())
+    return h.hexdigest()[:20]
+
+
+def file_digest(filepath: str) -> str:
+    h = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_digest() -> str:
+    """Changes whenever the generator code does"""
+    return _digest(*[file_digest(os.path.join(HERE, name)) for name in SOURCES])
+
+
+def config_values(config: Config, names: Tuple[str, ...]) -> Dict[str, Any]:
+    return {name: getattr(config, name) for name in names}
+
+
+class Pipeline:
+    """
+    Lazily resolved stages for one input file.
+
+    get(stage, config) returns the stage output from memory, then the disk
+    cache, then by computing it from its upstream stages. hits/misses record
+    where each (stage, key) came from.
+    """
+
+    def __init__(self, filepath: str, sheet_name: str = None, cache_dir: str = '.pipeline_cache'):
+        self.filepath = filepath
+        self.sheet_name = sheet_name
+        self.cache_dir = cache_dir
+        self._memory: Dict[str, Any] = {}
+        self.log: List[Tuple[str, str, str, float]] = []   # (stage, key, source, own seconds)
+        self._upstream_seconds = 0.0
+        self._root = _digest(file_digest(filepath), sheet_name, source_digest())
+
+    def key(self, stage: str, config: Config = None) -> str:
+        if stage == 'load':
+            return _digest('load', self._root)
+        if stage in ('parse', 'validate'):
+            upstream = 'load' if stage == 'parse' else 'parse'
+            return _digest(stage, self.key(upstream))
+        if stage == 'height':
+            return _digest('height', self.key('validate'), config_values(config, HEIGHT_FIELDS))
+        if stage == 'geometry':
+            return _digest('geometry', self.key('height', config), config_values(config, GEOMETRY_FIELDS))
+        raise ValueError(f"Unknown stage '{stage}'")
+
+    def _path(self, stage: str, key: str) -> str:
+        return os.path.join(self.cache_dir, stage, f'{key}.pkl')
+
+    def get(self, stage: str, config: Config = None):
+        key = self.key(stage, config)
+        if key in self._memory:
+            return self._memory[key]
+
+        start = time.perf_counter()
+        outer, self._upstream_seconds = self._upstream_seconds, 0.0
+        path = self._path(stage, key)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            source = 'disk'
+        else:
+            value = self._compute(stage, config)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = path + '.tmp'
+            with open(tmp, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+            source = 'computed'
+
+        elapsed = time.perf_counter() - start
+        self.log.append((stage, key, source, elapsed - self._upstream_seconds))
+        self._upstream_seconds = outer + elapsed
+        self._memory[key] = value
+        return value
+
+    def _compute(self, stage: str, config: Config):
+        if stage == 'load':
+            return stage_load(self.filepath, self.sheet_name)
+        if stage == 'parse':
+            return stage_parse(self.get('load'))
+        if stage == 'validate':
+            return stage_validate(self.get('parse'))
+        if stage == 'height':
+            return stage_height(self.get('validate'), config)
+        return stage_geometry(self.get('parse'), self.get('height', config), config)
+
+    def results(self, config: Config, max_examples: int = 20) -> Dict[str, Dict[str, BayData]]:
+        """
+        Generator results for config. When geometry and validate are cached
+        the rows (load/parse) are never read.
+        """
+        geometry = self.get('geometry', config)
+        return assemble(self.get('validate'), geometry, max_examples)
+
+
+# ============================================================================
+# SWEEP
+# ============================================================================
+
+def parse_vary(specs: List[str]) -> List[Tuple[str, list]]:
+    """['shelf_thickness_inches=2,3'] -> [('shelf_thickness_inches', [2.0, 3.0])]"""
+    types = {f.name: f.type for f in fields(Config)}
+    axes = []
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        if name not in types or not values:
+            raise ValueError(f"Bad --vary '{spec}': expected FIELD=v1,v2 with FIELD one of {sorted(types)}")
+        cast = int if types[name] in (int, 'int') else float
+        axes.append((name, [cast(v) for v in values.split(',')]))
+    return axes
+
+
+def variants(base: Config, axes: List[Tuple[str, list]]) -> List[Tuple[str, Config]]:
+    """Cartesian product of the axes -> (directory name, config)"""
+    if not axes:
+        return [('', base)]
+    out = []
+    names = [name for name, _ in axes]
+    for combo in itertools.product(*(values for _, values in axes)):
+        label = '_'.join(f"{n}={v:g}" for n, v in zip(names, combo))
+        out.append((label, replace(base, **dict(zip(names, combo)))))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Staged generator run with cached intermediates and Config sweeps'
+    )
+    parser.add_argument('input_file', help='Input Excel (.xlsx) or CSV file path')
+    parser.add_argument('--output-dir', '-o', default='./output', help='Output directory')
+    parser.add_argument('--sheet', '-s', default=None, help='Sheet name (auto-detects if not specified)')
+    parser.add_argument('--cache-dir', default='.pipeline_cache',
+                        help='Where stage results are persisted (default: .pipeline_cache)')
+    parser.add_argument('--shelf-thickness', type=float, default=3.0,
+                        help='Shelf thickness in inches (default: 3.0)')
+    parser.add_argument('--vary', action='append', default=[], metavar='FIELD=V1,V2',
+                        help='Sweep a Config field over values; repeat for a cartesian product. '
+                             'Each variant is written to OUTPUT_DIR/FIELD=V...')
+    parser.add_argument('--instances', action='store_true',
+                        help='Also write instancing batches per bay')
+    parser.add_argument('--shards', action='store_true',
+                        help='Also write per-rack shard files and their index per bay')
+    parser.add_argument('--max-examples', type=int, default=20,
+                        help='Example records kept per diagnostic code (default: 20, 0 = all)')
+    args = parser.parse_args()
+
+    try:
+        axes = parse_vary(args.vary)
+    except ValueError as e:
+        parser.error(str(e))
+
+    base = Config(shelf_thickness_inches=args.shelf_thickness)
+    pipeline = Pipeline(args.input_file, args.sheet, args.cache_dir)
+
+    for label, config in variants(base, axes):
+        output_dir = os.path.join(args.output_dir, label) if label else args.output_dir
+        print(f"Variant: {label or 'base config'} -> {output_dir}/")
+        save_results(pipeline.results(config, args.max_examples), output_dir, args.instances,
+                     args.shards)
+        print()
+
+    print(f"{'stage':<18} {'key':<22} {'source':<9} {'ms':>8}")
+    for stage, key, source, seconds in pipeline.log:
+        print(f"{stage:<18} {key:<22} {source:<9} {seconds * 1000:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
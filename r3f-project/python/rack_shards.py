@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Per-rack shard files for the viewer
+
+The viewer only needs one rack's slots once a rack is selected, but a bay
+file carries every container. This module splits a bay into one small
+compact-JSON file per rack row, each holding that rack's containers already
+in the viewer's SlotRecord shape (see src/types/slotTypes.ts), plus an
+index for the bay view:
+
+    bldg22_bay3E_racks/
+      index.json
+      01.json     [{"id": "3E01A1A", "rackRef": "01", "section": "A", "level": 1,
+                    "slot": "A", "position": [cx, cy, cz], "size": [x, y, z]}, ...]
+      02.json
+      ...
+
+index.json:
+    {
+      "building": "BLDG 22", "bay": "3E",
+      "metadata": {"total_containers": 508, "total_racks": 17, "total_bytes": 51234,
+                   "units": "feet", "position": "box center"},
+      "racks": [
+        {"rackRef": "01", "id": "R01", "file": "01.json", "count": 69, "bytes": 6890,
+         "sections": ["A", ...], "maxLevel": 1,
+         "bounds": {"min": [x, y, z], "max": [x, y, z]},
+         "position": [cx, cy, cz], "size": [x, y, z]},
+        ...
+      ]
+    }
+
+Positions are box centers, matching cornerToCenter in bayDataUtils.ts.
+Rewriting a folder removes shards of racks that are no longer in the bay.
+
+Usage:
+    python rack_shards.py ../src/data/bldg22_bay3E_containers.json -o ./output
+    python warehouse_generator_v2.py input.xlsx --shards
+"""
+
+import argparse
+import json
+import os
+from typing import Dict, List, Optional
+
+INDEX_FILENAME = 'index.json'
+
+
+def rack_ref(container: dict) -> str:
+    """Rack row of a container: "row" in generator output, "rack" in the viewer template"""
+    return container['row'] if 'row' in container else container['rack']
+
+
+def slot_record(container: dict) -> dict:
+    """Container.to_dict() -> SlotRecord (center position, size tuple)"""
+    pos, dims = container['position'], container['dimensions']
+    slot = container.get('slot')
+    return {
+        "id": container['id'],
+        "rackRef": rack_ref(container),
+        "section": container['section'],
+        "level": container['level'],
+        "slot": None if slot is None else str(slot),
+        "position": [round(pos[k] + dims[k] / 2, 4) for k in 'xyz'],
+        "size": [dims['x'], dims['y'], dims['z']],
+    }
+
+
+def _tuple3(v: dict) -> List[float]:
+    return [v['x'], v['y'], v['z']]
+
+
+class RackSharder:
+    """
+    Groups container dicts (Container.to_dict() shape, or the viewer template's
+    containers) into SlotRecords per rack row.
+
+    Keeps one SlotRecord per container until write(); rack rows keep the order
+    they first appear in.
+    """
+
+    def __init__(self):
+        self.slots: Dict[str, List[dict]] = {}
+
+    def add(self, container: dict):
+        record = slot_record(container)
+        self.slots.setdefault(record["rackRef"], []).append(record)
+
+    def __len__(self) -> int:
+        return sum(len(s) for s in self.slots.values())
+
+    def write(self, directory: str, building: str, bay: str, racks: List[dict]) -> dict:
+        """
+        Write one shard per rack row plus index.json into directory.
+
+        racks are Rack.to_dict() records (bounds, sections, max level); a row
+        without one (or racks in the viewer template schema) gets bounds
+        computed from its slots. Other *.json files in
+        directory (shards of racks gone since the last run) are removed.
+        """
+        os.makedirs(directory, exist_ok=True)
+        rack_by_row = {r['row']: r for r in racks if 'row' in r}
+
+        entries = []
+        for row, slots in self.slots.items():
+            filename = shard_filename(row)
+            data = json.dumps(slots, separators=(',', ':'))
+            with open(os.path.join(directory, filename), 'w') as f:
+                f.write(data)
+            entries.append(_index_entry(row, filename, slots, len(data), rack_by_row.get(row)))
+
+        index = {
+            "building": building,
+            "bay": bay,
+            "metadata": {
+                "total_containers": len(self),
+                "total_racks": len(entries),
+                "total_bytes": sum(e["bytes"] for e in entries),
+                "units": "feet",
+                "position": "box center",
+            },
+            "racks": entries,
+        }
+        with open(os.path.join(directory, INDEX_FILENAME), 'w') as f:
+            json.dump(index, f, separators=(',', ':'))
+
+        written = {e["file"] for e in entries} | {INDEX_FILENAME}
+        for name in os.listdir(directory):
+            if name.endswith('.json') and name not in written:
+                os.remove(os.path.join(directory, name))
+        return index
+
+
+def shard_filename(row: str) -> str:
+    return f"{row}.json"
+
+
+def shards_dirname(building_key: str, bay: str) -> str:
+    return f"{building_key}_bay{bay}_racks"
+
+
+def _index_entry(row: str, filename: str, slots: List[dict], size: int,
+                 rack: Optional[dict]) -> dict:
+    if rack is not None:
+        lo, hi = _tuple3(rack['bounds']['min']), _tuple3(rack['bounds']['max'])
+        sections, max_level = rack['sections'], rack['max_level']
+    else:
+        lo = [round(min(s['position'][i] - s['size'][i] / 2 for s in slots), 4) for i in range(3)]
+        hi = [round(max(s['position'][i] + s['size'][i] / 2 for s in slots), 4) for i in range(3)]
+        sections = sorted({s['section'] for s in slots})
+        max_level = max(s['level'] for s in slots)
+    return {
+        "rackRef": row,
+        "id": rack['id'] if rack is not None else f"R{row}",
+        "file": filename,
+        "count": len(slots),
+        "bytes": size,
+        "sections": sections,
+        "maxLevel": max_level,
+        "bounds": {"min": lo, "max": hi},
+        "position": [round((a + b) / 2, 4) for a, b in zip(lo, hi)],
+        "size": [round(b - a, 4) for a, b in zip(lo, hi)],
+    }
+
+
+def write_shards(bay_dict: dict, directory: str) -> dict:
+    """Shard a bay JSON (BayData.to_dict() / *_containers.json) into directory"""
+    sharder = RackSharder()
+    for container in bay_dict.get('containers', []):
+        sharder.add(container)
+    return sharder.write(directory, bay_dict.get('building'), bay_dict.get('bay'),
+                         bay_dict.get('racks', []))
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Split bay files into per-rack shard files')
+    parser.add_argument('files', nargs='+', help='*_containers.json files')
+    parser.add_argument('--output-dir', '-o', default=None,
+                        help='Directory for the {building}_bay{bay}_racks/ folders '
+                             '(default: next to each bay file)')
+    args = parser.parse_args()
+
+    for path in args.files:
+        with open(path) as f:
+            bay_dict = json.load(f)
+        building_key = (bay_dict.get('building') or 'UNKNOWN').replace(' ', '').lower()
+        directory = os.path.join(args.output_dir or os.path.dirname(os.path.abspath(path)),
+                                 shards_dirname(building_key, bay_dict.get('bay')))
+        index = write_shards(bay_dict, directory)
+
+        meta = index["metadata"]
+        sizes = sorted(e["bytes"] for e in index["racks"]) or [0]
+        print(f"{os.path.basename(path)} -> {directory}/")
+        print(f"  {meta['total_racks']} shards, {meta['total_containers']} containers, "
+              f"{os.path.getsize(path):,} B bay file vs {sizes[len(sizes) // 2]:,} B median shard "
+              f"({sizes[-1]:,} B largest)")
+
+
+if __name__ == '__main__':
+    main()
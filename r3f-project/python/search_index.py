@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Prefix and substring search index over inventory records
+
+Builds, per field (skskun, skpart, innumb, lolocn), a sorted array of the
+distinct normalized values with a CSR posting list of record ids:
+
+    keys     ["0001A02", "0001A03", ...]     sorted, unique, upper-cased
+    offsets  [0, 1, 3, ...]                  len(keys) + 1
+    ids      [0, 1, 7, ...]                  record indices, grouped by key
+
+A prefix lookup is two binary searches on keys, and because ids are grouped
+in key order, the matches are the contiguous slice
+ids[offsets[lo]:offsets[hi]]. Substring lookups scan the keys unless the
+index was built with grams (--grams): a trigram index mapping each gram to
+the keys containing it, whose candidates are intersected and then verified.
+Grams are opt-in because they roughly triple the serialized size (264 MB vs
+88 MB at 1M records) and the viewer only runs prefix search.
+
+Record ids are positions in the inventory export the index was built from.
+The serialized form (JSON) is what src/utils/searchIndex.ts loads.
+
+Usage:
+    python search_index.py ../src/data/inventory.json -o ../public/inventory_index.json
+    python search_index.py ../src/data/inventory.json --query P37 --field skpart
+    python search_index.py ../src/data/inventory.json --grams --query 37A --substring
+"""
+
+import argparse
+import bisect
+import json
+import time
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+FIELDS = ('skskun', 'skpart', 'innumb', 'lolocn')
+
+# Field -> short label used by the frontend / CLI output
+FIELD_LABELS = {'skskun': 'sku', 'skpart': 'part', 'innumb': 'inventory', 'lolocn': 'bin'}
+
+GRAM = 3
+FORMAT_VERSION = 1
+
+
+def normalize(value) -> str:
+    return str(value).strip().upper() if value is not None else ''
+
+
+def prefix_end(prefix: str) -> str:
+    """Smallest string greater than every string starting with prefix"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def grams(text: str, n: int = GRAM) -> set:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+# ============================================================================
+# PER-FIELD INDEX
+# ============================================================================
+
+class FieldIndex:
+    """Sorted keys + CSR postings for one field, with an optional n-gram index"""
+
+    def __init__(self, keys: List[str], offsets: array, ids: array,
+                 gram_keys: Optional[Dict[str, array]] = None):
+        self.keys = keys
+        self.offsets = offsets
+        self.ids = ids
+        self.gram_keys = gram_keys   # gram -> sorted key positions
+
+    @classmethod
+    def build(cls, values: Iterable[str], with_grams: bool = False) -> 'FieldIndex':
+        values = list(values)
+        # Record ids sorted by value (stable, so ids stay ascending within a key)
+        ids = array('I', sorted((i for i, v in enumerate(values) if v), key=values.__getitem__))
+
+        keys: List[str] = []
+        offsets = array('I', [0])
+        for n, record_id in enumerate(ids):
+            value = values[record_id]
+            if not keys or value != keys[-1]:
+                if keys:
+                    offsets.append(n)
+                keys.append(value)
+        if keys:
+            offsets.append(len(ids))
+
+        gram_keys = None
+        if with_grams:
+            lists = defaultdict(list)
+            for position, key in enumerate(keys):
+                for g in grams(key):
+                    lists[g].append(position)
+            gram_keys = {g: array('I', positions) for g, positions in lists.items()}
+        return cls(keys, offsets, ids, gram_keys)
+
+    def _slice(self, lo: int, hi: int, limit: Optional[int]) -> List[int]:
+        start, end = self.offsets[lo], self.offsets[hi]
+        if limit is not None:
+            end = min(end, start + limit)
+        return self.ids[start:end].tolist()
+
+    def exact(self, value: str) -> List[int]:
+        i = bisect.bisect_left(self.keys, value)
+        if i < len(self.keys) and self.keys[i] == value:
+            return self._slice(i, i + 1, None)
+        return []
+
+    def prefix(self, prefix: str, limit: Optional[int] = None) -> List[int]:
+        if not prefix:
+            return self._slice(0, len(self.keys), limit)
+        lo = bisect.bisect_left(self.keys, prefix)
+        hi = bisect.bisect_left(self.keys, prefix_end(prefix), lo)
+        return self._slice(lo, hi, limit)
+
+    def substring_keys(self, text: str) -> List[int]:
+        """Positions of keys containing text, in key order"""
+        if len(text) < GRAM or self.gram_keys is None:
+            return [i for i, key in enumerate(self.keys) if text in key]
+
+        postings = []
+        for g in grams(text):
+            keys = self.gram_keys.get(g)
+            if keys is None:
+                return []
+            postings.append(keys)
+        postings.sort(key=len)
+
+        candidates = postings[0]
+        for other in postings[1:]:
+            members = set(other)
+            candidates = [k for k in candidates if k in members]
+            if not candidates:
+                return []
+        return [k for k in candidates if text in self.keys[k]]
+
+    def substring(self, text: str, limit: Optional[int] = None) -> List[int]:
+        out: List[int] = []
+        for k in self.substring_keys(text):
+            out.extend(self.ids[self.offsets[k]:self.offsets[k + 1]])
+            if limit is not None and len(out) >= limit:
+                return out[:limit]
+        return out
+
+    # ---- serialization -----------------------------------------------------
+
+    def to_dict(self) -> dict:
+        d = {"keys": self.keys, "offsets": self.offsets.tolist(), "ids": self.ids.tolist()}
+        if self.gram_keys is not None:
+            # Gram index in the same CSR layout: sorted grams -> key positions
+            ordered = sorted(self.gram_keys)
+            gram_offsets, gram_positions = [0], []
+            for g in ordered:
+                gram_positions.extend(self.gram_keys[g])
+                gram_offsets.append(len(gram_positions))
+            d["grams"] = {"n": GRAM, "keys": ordered, "offsets": gram_offsets, "positions": gram_positions}
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict) -> 'FieldIndex':
+        gram_keys = None
+        if "grams" in d:
+            g = d["grams"]
+            positions, offsets = g["positions"], g["offsets"]
+            gram_keys = {gram: array('I', positions[offsets[i]:offsets[i + 1]])
+                         for i, gram in enumerate(g["keys"])}
+        return cls(d["keys"], array('I', d["offsets"]), array('I', d["ids"]), gram_keys)
+
+
+# ============================================================================
+# INVENTORY INDEX
+# ============================================================================
+
+class SearchIndex:
+    """FieldIndex per searchable field over one inventory export"""
+
+    def __init__(self, fields: Dict[str, FieldIndex], count: int):
+        self.fields = fields
+        self.count = count
+
+    @classmethod
+    def build(cls, records: Sequence[dict], fields: Sequence[str] = FIELDS,
+              with_grams: bool = False) -> 'SearchIndex':
+        return cls({f: FieldIndex.build((normalize(r.get(f)) for r in records), with_grams)
+                    for f in fields}, len(records))
+
+    def exact(self, field_name: str, value: str) -> List[int]:
+        return self.fields[field_name].exact(normalize(value))
+
+    def prefix(self, field_name: str, prefix: str, limit: Optional[int] = None) -> List[int]:
+        return self.fields[field_name].prefix(normalize(prefix), limit)
+
+    def substring(self, field_name: str, text: str, limit: Optional[int] = None) -> List[int]:
+        return self.fields[field_name].substring(normalize(text), limit)
+
+    def search(self, text: str, limit: int = 20, substring: bool = False) -> List[int]:
+        """Record ids matching text in any field (prefix, or substring), de-duplicated"""
+        seen: Dict[int, None] = {}
+        for name in self.fields:
+            lookup = self.substring if substring else self.prefix
+            for record_id in lookup(name, text, limit):
+                seen.setdefault(record_id, None)
+                if len(seen) >= limit:
+                    return list(seen)
+        return list(seen)
+
+    def to_dict(self) -> dict:
+        return {"version": FORMAT_VERSION, "count": self.count,
+                "fields": {name: index.to_dict() for name, index in self.fields.items()}}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> 'SearchIndex':
+        if d.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported index version {d.get('version')}, expected {FORMAT_VERSION}")
+        return cls({name: FieldIndex.from_dict(f) for name, f in d["fields"].items()}, d["count"])
+
+    def save(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path: str) -> 'SearchIndex':
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a search index over an inventory export')
+    parser.add_argument('inventory', help='Inventory JSON (list of API records)')
+    parser.add_argument('--output', '-o', default=None, help='Write the serialized index here')
+    parser.add_argument('--grams', action='store_true',
+                        help='Also build the n-gram index for fast substring lookups '
+                             '(about 3x larger file)')
+    parser.add_argument('--query', '-q', default=None, help='Run a lookup and print matching records')
+    parser.add_argument('--field', choices=FIELDS, default=None,
+                        help='With --query, search one field (default: all)')
+    parser.add_argument('--substring', action='store_true', help='With --query, match anywhere')
+    parser.add_argument('--limit', type=int, default=20, help='With --query, max results (default: 20)')
+    args = parser.parse_args()
+
+    with open(args.inventory) as f:
+        records = json.load(f)
+
+    start = time.perf_counter()
+    index = SearchIndex.build(records, with_grams=args.grams)
+    print(f"Indexed {len(records)} records in {(time.perf_counter() - start) * 1000:.1f} ms")
+    for name, field_index in index.fields.items():
+        print(f"  {name:<7} ({FIELD_LABELS[name]}): {len(field_index.keys)} distinct values")
+
+    if args.output:
+        index.save(args.output)
+        print(f"Saved: {args.output}")
+
+    if args.query is not None:
+        start = time.perf_counter()
+        if args.field:
+            lookup = index.substring if args.substring else index.prefix
+            ids = lookup(args.field, args.query, args.limit)
+        else:
+            ids = index.search(args.query, args.limit, args.substring)
+        elapsed_us = (time.perf_counter() - start) * 1e6
+        print(f"\n{len(ids)} match(es) for '{args.query}' in {elapsed_us:.0f} us")
+        for i in ids:
+            r = records[i]
+            print(f"  #{i}: {r.get('skskun')}  {r.get('skpart')}  {r.get('innumb')}  bin {r.get('lolocn')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Batch slotting: best-fit free slot for inventory item dimensions
+
+Answers "which free slots can take this item" for thousands of items at
+once. Items are inventory records (itemwd / itemht / itemdp, inches); slots
+are generated containers (dimensions in feet).
+
+    SlotIndex   free slots grouped into size buckets (generated bays have a
+                handful of distinct slot sizes). Each bucket's members are
+                sorted by pick distance, nearest first.
+    fit         item x bucket, every allowed rotation, as one NumPy
+                comparison per item block - items are never tested against
+                individual slots.
+    rank        score = leftover volume (ft3) + distance_weight * pick
+                distance (ft). Within a bucket the leftover is the same, so
+                the best slot of a bucket is simply its nearest free one.
+    assign      largest items first, each takes the best-scoring bucket
+                that still has a free slot.
+
+Rotations: 'upright' lets an item turn about the vertical axis (width and
+depth swap), 'any' allows all six orientations.
+
+Pick distance is the straight-line floor distance from an origin point by
+default, or the walking distance from a depot when a route table from
+aisle_routing.py is given.
+
+Usage:
+    python slotting.py output/bldg22_bay3E_containers.json items.json --occupied inventory.json
+    python slotting.py ../src/data/BLDG-template-Bay00.json ../src/data/inventory.json --route-from dock-01
+"""
+
+import argparse
+import itertools
+import json
+import time
+from dataclasses import dataclass
+from typing import List, Sequence, Set, Tuple
+
+import numpy as np
+
+from generate_inventory import normalize_bin
+
+INCHES_TO_FEET = 1 / 12
+
+# Item axis order is (width, height, depth), matching slot (x, y, z)
+ROTATIONS = {
+    'upright': ((0, 1, 2), (2, 1, 0)),
+    'any': tuple(itertools.permutations(range(3))),
+}
+
+# Items tested against the buckets per NumPy block (bounds the M x R x K x 3 temporary)
+BLOCK = 4096
+
+
+def _inches(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def item_dimensions(records: Sequence[dict]) -> np.ndarray:
+    """
+    (M, 3) feet: width, height, depth from itemwd / itemht / itemdp (inches).
+
+    Missing, blank or non-numeric sizes come back as nan. A nan item fits no
+    slot, so assign() leaves it unplaced rather than aborting the batch.
+    """
+    return np.array([[_inches(r.get('itemwd')), _inches(r.get('itemht')), _inches(r.get('itemdp'))]
+                     for r in records], dtype=np.float64).reshape(-1, 3) * INCHES_TO_FEET
+
+
+def occupied_bins(inventory: Sequence[dict]) -> Set[str]:
+    """
+    Normalized bins holding inventory (lolocn).
+
+    Bins drop the slot letter, so one occupied bin blocks all its slots.
+    """
+    return {normalize_bin(r['lolocn']) or r['lolocn'] for r in inventory if r.get('lolocn')}
+
+
+# ============================================================================
+# PICK DISTANCE
+# ============================================================================
+
+def floor_distances(containers: Sequence[dict], origin: Tuple[float, float] = (0.0, 0.0)) -> np.ndarray:
+    """Straight-line XZ distance (ft) from origin to each slot's center"""
+    centers = np.array([[c['position']['x'] + c['dimensions']['x'] / 2,
+                         c['position']['z'] + c['dimensions']['z'] / 2] for c in containers]).reshape(-1, 2)
+    return np.hypot(centers[:, 0] - origin[0], centers[:, 1] - origin[1])
+
+
+def route_distances(containers: Sequence[dict], table, depot: str) -> np.ndarray:
+    """Walking distance (ft) from a depot to each slot's section (aisle_routing.PickDistances)"""
+    row = table.matrix[table.resolve(depot)]
+    return np.array([row[table.index[c['id']]] if c['id'] in table.index else np.inf for c in containers],
+                    dtype=np.float64)
+
+
+# ============================================================================
+# SLOT INDEX
+# ============================================================================
+
+class SlotIndex:
+    """
+    Free slots bucketed by exact dimensions, members nearest-first.
+
+    Slots with an infinite pick distance (unreachable) are left out.
+    """
+
+    def __init__(self, ids: List[str], dims: np.ndarray, distance: np.ndarray):
+        keep = np.isfinite(distance)
+        self.ids = [i for i, k in zip(ids, keep) if k]
+        self.dims = dims[keep]
+        self.distance = distance[keep]
+
+        self.bucket_dims, self.bucket_of = np.unique(self.dims, axis=0, return_inverse=True)
+        self.bucket_of = self.bucket_of.ravel()
+        self.bucket_volume = self.bucket_dims.prod(axis=1)
+        # Members of each bucket, nearest first, as one CSR array
+        order = np.lexsort((self.distance, self.bucket_of))
+        self.members = order
+        self.offsets = np.searchsorted(self.bucket_of[order], np.arange(len(self.bucket_dims) + 1))
+
+    @classmethod
+    def build(cls, containers: Sequence[dict], distance: np.ndarray = None,
+              occupied: Set[str] = frozenset()) -> 'SlotIndex':
+        """Free slots from Container.to_dict() records; occupied holds normalized bins"""
+        if distance is None:
+            distance = floor_distances(containers)
+        free = np.array([(normalize_bin(c['id']) or c['id']) not in occupied for c in containers], dtype=bool)
+        dims = np.array([[c['dimensions']['x'], c['dimensions']['y'], c['dimensions']['z']]
+                         for c in containers], dtype=np.float64).reshape(-1, 3)
+        return cls([c['id'] for c, f in zip(containers, free) if f], dims[free], distance[free])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def fit(self, items: np.ndarray, rotations: str = 'upright') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (fits, rotation): (M, K) whether item m fits bucket k in some allowed
+        orientation, and the first such rotation index (-1 when none).
+        """
+        perms = np.array(ROTATIONS[rotations])
+        fits = np.zeros((len(items), len(self.bucket_dims)), dtype=bool)
+        rotation = np.full(fits.shape, -1, dtype=np.int8)
+        for start in range(0, len(items), BLOCK):
+            rotated = items[start:start + BLOCK][:, perms]                        # (B, R, 3)
+            ok = (rotated[:, :, None, :] <= self.bucket_dims[None, None]).all(-1)  # (B, R, K)
+            fits[start:start + BLOCK] = ok.any(1)
+            rotation[start:start + BLOCK] = np.where(ok.any(1), ok.argmax(1), -1)
+        return fits, rotation
+
+    def candidates(self, item: Sequence[float], rotations: str = 'upright',
+                   distance_weight: float = 0.01, limit: int = 10) -> List[dict]:
+        """Best free slots for one item (feet), ranked by score"""
+        fits, rotation = self.fit(np.asarray(item, dtype=np.float64).reshape(1, 3), rotations)
+        buckets = np.flatnonzero(fits[0])
+        if not buckets.size:
+            return []
+        slots = np.concatenate([self.members[self.offsets[k]:self.offsets[k + 1]] for k in buckets])
+        leftover = self.bucket_volume[self.bucket_of[slots]] - float(np.prod(item))
+        score = leftover + distance_weight * self.distance[slots]
+        best = slots[np.argsort(score, kind='stable')[:limit]]
+        return [{
+            "slot": self.ids[s],
+            "rotation": ROTATIONS[rotations][rotation[0, self.bucket_of[s]]],
+            "leftover_ft3": round(float(self.bucket_volume[self.bucket_of[s]] - np.prod(item)), 4),
+            "distance_ft": round(float(self.distance[s]), 2),
+        } for s in best]
+
+
+# ============================================================================
+# ASSIGNMENT
+# ============================================================================
+
+@dataclass
+class Assignment:
+    slot: np.ndarray        # (M,) index into SlotIndex.ids, -1 when no free slot fits
+    rotation: np.ndarray    # (M,) index into ROTATIONS[rotations], -1 when unassigned
+    leftover: np.ndarray    # (M,) ft3, nan when unassigned
+    distance: np.ndarray    # (M,) ft, nan when unassigned
+
+    @property
+    def assigned(self) -> int:
+        return int((self.slot >= 0).sum())
+
+
+def assign(items: np.ndarray, index: SlotIndex, rotations: str = 'upright',
+           distance_weight: float = 0.01) -> Assignment:
+    """
+    Give each item (feet, (M, 3)) its own free slot, largest items first.
+
+    Each item takes the bucket minimizing leftover volume + distance_weight *
+    distance of that bucket's nearest remaining slot.
+    """
+    m = len(items)
+    volume = items.prod(axis=1)
+    fits, rotation = index.fit(items, rotations)
+    leftover = index.bucket_volume[None, :] - volume[:, None]
+
+    heads = index.offsets[:-1].copy()      # next free member per bucket
+    ends = index.offsets[1:]
+    head_distance = np.full(len(heads), np.inf)
+    filled = heads < ends
+    head_distance[filled] = index.distance[index.members[heads[filled]]]
+
+    out = Assignment(np.full(m, -1), np.full(m, -1, dtype=np.int8), np.full(m, np.nan), np.full(m, np.nan))
+    for i in np.argsort(-volume, kind='stable'):
+        score = np.where(fits[i], leftover[i] + distance_weight * head_distance, np.inf)
+        k = int(np.argmin(score))
+        if not np.isfinite(score[k]):
+            continue
+        slot = index.members[heads[k]]
+        heads[k] += 1
+        head_distance[k] = index.distance[index.members[heads[k]]] if heads[k] < ends[k] else np.inf
+        out.slot[i], out.rotation[i] = slot, rotation[i, k]
+        out.leftover[i], out.distance[i] = leftover[i, k], index.distance[slot]
+    return out
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Assign inventory items to best-fit free slots')
+    parser.add_argument('bay_file', help='*_containers.json or a viewer bay JSON')
+    parser.add_argument('items', help='Inventory JSON to place (itemwd / itemht / itemdp in inches)')
+    parser.add_argument('--occupied', default=None,
+                        help='Inventory JSON whose bins (lolocn) are already taken')
+    parser.add_argument('--rotations', choices=sorted(ROTATIONS), default='upright',
+                        help='upright: turn about the vertical axis only; any: all six (default: upright)')
+    parser.add_argument('--distance-weight', type=float, default=0.01,
+                        help='ft3 of leftover space one foot of pick distance is worth (default: 0.01)')
+    parser.add_argument('--origin', default='0,0', help='X,Z the floor distance is measured from')
+    parser.add_argument('--route-from', default=None,
+                        help='Depot id: rank by walking distance from it (aisle_routing.py)')
+    parser.add_argument('--output', '-o', default=None, help='Write assignments JSON here')
+    args = parser.parse_args()
+
+    with open(args.bay_file) as f:
+        bay = json.load(f)
+    with open(args.items) as f:
+        records = json.load(f)
+    containers = bay.get('containers', [])
+
+    if args.route_from:
+        from aisle_routing import load_or_build
+        distance = route_distances(containers, load_or_build(bay), args.route_from)
+    else:
+        x, z = (float(v) for v in args.origin.split(','))
+        distance = floor_distances(containers, (x, z))
+    occupied: Set[str] = set()
+    if args.occupied:
+        with open(args.occupied) as f:
+            occupied = occupied_bins(json.load(f))
+
+    start = time.perf_counter()
+    index = SlotIndex.build(containers, distance, occupied)
+    items = item_dimensions(records)
+    result = assign(items, index, args.rotations, args.distance_weight)
+    elapsed = time.perf_counter() - start
+
+    unparseable = np.isnan(items).any(axis=1)
+    print(f"{len(index)} free slots in {len(index.bucket_dims)} size buckets, {len(items)} items")
+    print(f"  assigned {result.assigned}, no fitting free slot for "
+          f"{len(items) - result.assigned - int(unparseable.sum())} ({elapsed * 1000:.1f} ms)")
+    if unparseable.any():
+        print(f"  skipped {int(unparseable.sum())} with missing or non-numeric dimensions")
+    if result.assigned:
+        done = result.slot >= 0
+        print(f"  mean leftover {np.mean(result.leftover[done]):.2f} ft3, "
+              f"mean pick distance {np.mean(result.distance[done]):.1f} ft")
+
+    if args.output:
+        perms = ROTATIONS[args.rotations]
+        rows = [{
+            "innumb": r.get('innumb'),
+            "slot": index.ids[s] if s >= 0 else None,
+            "rotation": list(perms[rot]) if s >= 0 else None,
+            "leftover_ft3": round(float(lo), 4) if s >= 0 else None,
+            "distance_ft": round(float(d), 2) if s >= 0 else None,
+            "unparseable": bool(bad),
+        } for r, s, rot, lo, d, bad in zip(records, result.slot, result.rotation, result.leftover,
+                                           result.distance, unparseable)]
+        with open(args.output, 'w') as f:
+            json.dump(rows, f, indent=2)
+        print(f"Saved: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Append-only inventory snapshot log
+
+Inventory exports (inventory.json, generate_inventory.py output) are full
+snapshots with no history. SnapshotLog ingests successive exports and stores
+only what changed per bin, so a shift can be replayed without keeping or
+rereading every snapshot.
+
+State model:
+    bin (lolocn) -> {"lofull": str, "items": {innumb: {inavlq, skskun, ...}}}
+    lofull is per bin (the last record's value if records of a bin disagree).
+
+Store layout (a directory):
+    log.jsonl          one line per ingest, columnar:
+                         {"seq", "t", "bins": [...], "items": [...],
+                          "op": [...], "bin": [...], "item": [...], "value": [...]}
+                       bin/item columns index the block's own string tables;
+                       value holds the new lofull/inavlq, the source bin of a
+                       move, or the full attributes of an added item
+    index.jsonl        one line per ingest: [seq, t, offset, length, changes]
+    checkpoints/       cp_{seq}.json - full state after block seq, written
+                       every checkpoint_every ingests (and by compact())
+
+"state at T" loads the newest checkpoint at or before T and replays at most
+checkpoint_every blocks; "changes T1..T2" seeks straight to the blocks in
+range via the index.
+
+Usage:
+    python snapshot_log.py ingest ./shift_log inventory.json --time 2025-06-02T08:00
+    python snapshot_log.py state ./shift_log --at 2025-06-02T10:30 -o state.json
+    python snapshot_log.py changes ./shift_log --since 2025-06-02T08:00 --until 2025-06-02T09:00
+"""
+
+import argparse
+import bisect
+import json
+import os
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Change ops (the "op" column)
+OP_FULL = 0      # bin lofull changed (None + no items left: bin no longer in the export)
+OP_QTY = 1       # item inavlq changed
+OP_ADD = 2       # item appeared in bin (value: its attributes)
+OP_REMOVE = 3    # item left the export
+OP_MOVE = 4      # item moved to bin (value: index of the source bin)
+OP_SET = 5       # item attributes other than inavlq changed (value: all attributes)
+
+OP_NAMES = {OP_FULL: 'full', OP_QTY: 'qty', OP_ADD: 'add', OP_REMOVE: 'remove',
+            OP_MOVE: 'move', OP_SET: 'set'}
+
+BIN_FIELD = 'lolocn'
+FULL_FIELD = 'lofull'
+QTY_FIELD = 'inavlq'
+ITEM_KEY_FIELDS = ('innumb', 'indocn')   # first non-empty one identifies an item
+
+State = Dict[str, dict]
+
+
+@dataclass
+class Change:
+    """One decoded change record"""
+    seq: int
+    t: float
+    op: int
+    bin: str
+    item: Optional[str] = None
+    value: Any = None
+
+    def to_dict(self) -> dict:
+        d = {"seq": self.seq, "time": format_time(self.t), "op": OP_NAMES[self.op], "bin": self.bin}
+        if self.item is not None:
+            d["item"] = self.item
+        if self.op == OP_MOVE:
+            d["from"] = self.value
+        elif self.value is not None or self.op == OP_FULL:
+            d["value"] = self.value
+        return d
+
+
+# ============================================================================
+# TIME HELPERS
+# ============================================================================
+
+def parse_time(value) -> float:
+    """Epoch seconds from a number or an ISO-8601 string"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def format_time(t: float) -> str:
+    return datetime.fromtimestamp(t).isoformat(timespec='seconds')
+
+
+# ============================================================================
+# SNAPSHOTS <-> STATE
+# ============================================================================
+
+def item_key(record: dict) -> Optional[str]:
+    for field_name in ITEM_KEY_FIELDS:
+        if record.get(field_name):
+            return record[field_name]
+    return None
+
+
+def snapshot_to_state(records: List[dict]) -> State:
+    """Full export (list of API records) -> bin state"""
+    state: State = {}
+    for record in records:
+        bin_id, key = record.get(BIN_FIELD), item_key(record)
+        if not bin_id or key is None:
+            continue
+        entry = state.setdefault(bin_id, {"lofull": None, "items": {}})
+        entry["lofull"] = record.get(FULL_FIELD)
+        entry["items"][key] = {k: v for k, v in record.items() if k not in (BIN_FIELD, FULL_FIELD)}
+    return state
+
+
+def state_to_records(state: State) -> List[dict]:
+    """Bin state -> export records, sorted by bin then item (export order is not kept)"""
+    records = []
+    for bin_id in sorted(state):
+        entry = state[bin_id]
+        for key in sorted(entry["items"]):
+            records.append({**entry["items"][key], BIN_FIELD: bin_id, FULL_FIELD: entry["lofull"]})
+    return records
+
+
+def diff_states(old: State, new: State) -> List[Tuple[int, str, Optional[str], Any]]:
+    """(op, bin, item, value) changes that turn old into new"""
+    changes = []
+
+    for bin_id in new.keys() | old.keys():
+        old_full = old[bin_id]["lofull"] if bin_id in old else None
+        new_full = new[bin_id]["lofull"] if bin_id in new else None
+        if old_full != new_full or bin_id not in new:
+            changes.append((OP_FULL, bin_id, None, new_full))
+
+    old_bins = {key: b for b, entry in old.items() for key in entry["items"]}
+    for bin_id, entry in new.items():
+        for key, attrs in entry["items"].items():
+            src = old_bins.pop(key, None)
+            if src is None:
+                changes.append((OP_ADD, bin_id, key, attrs))
+                continue
+            if src != bin_id:
+                changes.append((OP_MOVE, bin_id, key, src))
+            before = old[src]["items"][key]
+            if before == attrs:
+                continue
+            if {k: v for k, v in before.items() if k != QTY_FIELD} == \
+                    {k: v for k, v in attrs.items() if k != QTY_FIELD}:
+                changes.append((OP_QTY, bin_id, key, attrs.get(QTY_FIELD)))
+            else:
+                changes.append((OP_SET, bin_id, key, attrs))
+
+    for key, bin_id in old_bins.items():
+        changes.append((OP_REMOVE, bin_id, key, None))
+
+    # Removals and moves first so a bin emptied by FULL=None is not recreated
+    order = {OP_REMOVE: 0, OP_MOVE: 1, OP_ADD: 2, OP_SET: 3, OP_QTY: 4, OP_FULL: 5}
+    changes.sort(key=lambda c: order[c[0]])
+    return changes
+
+
+def apply_change(state: State, op: int, bin_id: str, key: Optional[str], value: Any):
+    if op == OP_FULL:
+        # Emitted last in a block, so a bin that left the export is empty by now
+        if value is None and not state.get(bin_id, {}).get("items"):
+            state.pop(bin_id, None)
+        else:
+            state.setdefault(bin_id, {"lofull": None, "items": {}})["lofull"] = value
+        return
+
+    if op == OP_REMOVE:
+        state[bin_id]["items"].pop(key, None)
+        return
+
+    entry = state.setdefault(bin_id, {"lofull": None, "items": {}})
+    if op == OP_MOVE:
+        entry["items"][key] = state[value]["items"].pop(key)
+    elif op in (OP_ADD, OP_SET):
+        entry["items"][key] = dict(value)
+    elif op == OP_QTY:
+        entry["items"][key][QTY_FIELD] = value
+
+
+# ============================================================================
+# BLOCK ENCODING
+# ============================================================================
+
+def encode_block(seq: int, t: float, changes) -> dict:
+    """Changes -> columnar block with per-block string tables for bins/items"""
+    bins: Dict[str, int] = {}
+    items: Dict[str, int] = {}
+    block = {"seq": seq, "t": t, "bins": [], "items": [], "op": [], "bin": [], "item": [], "value": []}
+
+    def intern(table: Dict[str, int], values: list, s: str) -> int:
+        if s not in table:
+            table[s] = len(values)
+            values.append(s)
+        return table[s]
+
+    for op, bin_id, key, value in changes:
+        block["op"].append(op)
+        block["bin"].append(intern(bins, block["bins"], bin_id))
+        block["item"].append(None if key is None else intern(items, block["items"], key))
+        block["value"].append(intern(bins, block["bins"], value) if op == OP_MOVE else value)
+    return block
+
+
+def decode_block(block: dict) -> Iterator[Tuple[int, str, Optional[str], Any]]:
+    bins, items = block["bins"], block["items"]
+    for op, b, i, value in zip(block["op"], block["bin"], block["item"], block["value"]):
+        yield (op, bins[b], None if i is None else items[i],
+               bins[value] if op == OP_MOVE else value)
+
+
+# ============================================================================
+# STORE
+# ============================================================================
+
+class SnapshotLog:
+    """
+    Append-only delta log over a directory.
+
+    ingest() diffs an export against the head state and appends one block;
+    state_at()/changes() answer time queries from checkpoints + the index.
+    """
+
+    def __init__(self, path: str, checkpoint_every: int = 10):
+        self.path = path
+        self.checkpoint_every = checkpoint_every
+        self.log_path = os.path.join(path, 'log.jsonl')
+        self.index_path = os.path.join(path, 'index.jsonl')
+        self.checkpoint_dir = os.path.join(path, 'checkpoints')
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+
+        # [seq, t, offset, length, changes] per block
+        self.index: List[list] = []
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.index = [json.loads(line) for line in f if line.strip()]
+        self._times = [entry[1] for entry in self.index]
+        self._drop_unindexed_tail()
+        self._head: Optional[State] = None
+
+    def _drop_unindexed_tail(self):
+        """A crash between the log and index appends leaves a block with no index entry"""
+        end = self.index[-1][2] + self.index[-1][3] if self.index else 0
+        if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > end:
+            with open(self.log_path, 'r+b') as f:
+                f.truncate(end)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    # ---- writing -----------------------------------------------------------
+
+    def ingest(self, records: List[dict], t) -> int:
+        """Append the changes from the head state to this export; returns the change count"""
+        t = parse_time(t)
+        if self._times and t < self._times[-1]:
+            raise ValueError(f"Snapshot time {format_time(t)} is before the last one "
+                             f"({format_time(self._times[-1])})")
+
+        head = self.head()
+        new = snapshot_to_state(records)
+        changes = diff_states(head, new)
+        seq = len(self.index) + 1
+
+        line = (json.dumps(encode_block(seq, t, changes), separators=(',', ':')) + '\n').encode()
+        offset = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        with open(self.log_path, 'ab') as f:
+            f.write(line)
+        entry = [seq, t, offset, len(line), len(changes)]
+        with open(self.index_path, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+        self.index.append(entry)
+        self._times.append(t)
+        self._head = new
+
+        if seq % self.checkpoint_every == 0:
+            self._write_checkpoint(seq, new)
+        return len(changes)
+
+    def compact(self):
+        """Checkpoint the head state so the next queries replay nothing"""
+        if self.index and self.index[-1][0] not in self._checkpoint_seqs():
+            self._write_checkpoint(self.index[-1][0], self.head())
+
+    def _write_checkpoint(self, seq: int, state: State):
+        path = os.path.join(self.checkpoint_dir, f'cp_{seq:06d}.json')
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({"seq": seq, "t": self.index[seq - 1][1], "state": state}, f, separators=(',', ':'))
+        os.replace(tmp, path)
+
+    # ---- reading -----------------------------------------------------------
+
+    def _checkpoint_seqs(self) -> List[int]:
+        return sorted(int(name[3:9]) for name in os.listdir(self.checkpoint_dir)
+                      if name.startswith('cp_') and name.endswith('.json'))
+
+    def _read_blocks(self, first_seq: int, last_seq: int) -> Iterator[dict]:
+        """Blocks first_seq..last_seq (inclusive), one seek and a sequential read"""
+        if first_seq > last_seq:
+            return
+        start = self.index[first_seq - 1][2]
+        end = self.index[last_seq - 1][2] + self.index[last_seq - 1][3]
+        with open(self.log_path, 'rb') as f:
+            f.seek(start)
+            data = f.read(end - start)
+        for line in data.splitlines():
+            yield json.loads(line)
+
+    def _state_at_seq(self, seq: int) -> State:
+        """State after block seq (0 = empty)"""
+        state: State = {}
+        base = 0
+        cps = [s for s in self._checkpoint_seqs() if s <= seq]
+        if cps:
+            base = cps[-1]
+            with open(os.path.join(self.checkpoint_dir, f'cp_{base:06d}.json')) as f:
+                state = json.load(f)["state"]
+        for block in self._read_blocks(base + 1, seq):
+            for op, bin_id, key, value in decode_block(block):
+                apply_change(state, op, bin_id, key, value)
+        return state
+
+    def head(self) -> State:
+        if self._head is None:
+            self._head = self._state_at_seq(len(self.index))
+        return self._head
+
+    def seq_at(self, t) -> int:
+        """Last block at or before t (0 if t precedes the first snapshot)"""
+        return bisect.bisect_right(self._times, parse_time(t))
+
+    def state_at(self, t) -> State:
+        return self._state_at_seq(self.seq_at(t))
+
+    def changes(self, since, until) -> List[Change]:
+        """Changes from blocks with since < t <= until"""
+        first, last = self.seq_at(since) + 1, self.seq_at(until)
+        return [
+            Change(block["seq"], block["t"], op, bin_id, key, value)
+            for block in self._read_blocks(first, last)
+            for op, bin_id, key, value in decode_block(block)
+        ]
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Append-only inventory snapshot log')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('ingest', help='Append inventory exports (in time order)')
+    p.add_argument('store', help='Log directory')
+    p.add_argument('files', nargs='+', help='Inventory JSON exports')
+    p.add_argument('--time', default=None,
+                   help='Snapshot time (ISO-8601 or epoch) for a single file (default: file mtime)')
+    p.add_argument('--checkpoint-every', type=int, default=10,
+                   help='Write a checkpoint every N ingests (default: 10)')
+
+    p = sub.add_parser('state', help='Inventory as of a time')
+    p.add_argument('store')
+    p.add_argument('--at', required=True, help='Time (ISO-8601 or epoch)')
+    p.add_argument('--output', '-o', default=None, help='Write records here (default: stdout)')
+
+    p = sub.add_parser('changes', help='Changes between two times')
+    p.add_argument('store')
+    p.add_argument('--since', required=True)
+    p.add_argument('--until', required=True)
+
+    p = sub.add_parser('compact', help='Checkpoint the latest state')
+    p.add_argument('store')
+
+    args = parser.parse_args()
+
+    if args.command == 'ingest':
+        if args.time and len(args.files) > 1:
+            parser.error('--time applies to a single file')
+        log = SnapshotLog(args.store, args.checkpoint_every)
+        for path in args.files:
+            with open(path) as f:
+                records = json.load(f)
+            t = args.time if args.time else os.path.getmtime(path)
+            try:
+                n = log.ingest(records, t)
+            except ValueError as e:
+                parser.error(f"{path}: {e}")
+            print(f"{path}: seq {len(log)} @ {format_time(parse_time(t))}, {n} changes")
+        return
+
+    log = SnapshotLog(args.store)
+    if args.command == 'state':
+        records = state_to_records(log.state_at(args.at))
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(records, f, indent=2)
+            print(f"{len(records)} records as of seq {log.seq_at(args.at)} -> {args.output}")
+        else:
+            json.dump(records, sys.stdout, indent=2)
+    elif args.command == 'changes':
+        for change in log.changes(args.since, args.until):
+            print(json.dumps(change.to_dict()))
+    elif args.command == 'compact':
+        log.compact()
+        print(f"Checkpointed seq {len(log)}")
+
+
+if __name__ == '__main__':
+    main()
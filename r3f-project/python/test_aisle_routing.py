@@ -0,0 +1,125 @@
+"""Regression tests for aisle_routing.py (distance table vs A*, pick ordering, cache)"""
+
+import itertools
+import json
+import os
+import random
+
+import numpy as np
+import pytest
+
+from aisle_routing import (
+    AisleGraph, OccupancyGrid, PickDistances, RoutingConfig, access_cells, build_distances,
+    container_locations, load_layout, load_or_build, location_key,
+)
+from bench_routes import synthetic_bay
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE = os.path.join(HERE, '..', 'src', 'data', 'BLDG-template-Bay00.json')
+
+
+@pytest.fixture(scope='module')
+def bay() -> dict:
+    return synthetic_bay(pairs=2, sections=5)
+
+
+@pytest.fixture(scope='module')
+def table(bay) -> PickDistances:
+    table, _ = build_distances(load_layout(bay))
+    return PickDistances(table.keys, table.matrix, container_locations(bay))
+
+
+# ============================================================================
+# user-036: the table holds A* lengths
+# ============================================================================
+
+def test_table_matches_astar(bay, table):
+    config = RoutingConfig()
+    layout = load_layout(bay, config)
+    graph = AisleGraph(OccupancyGrid.rasterize(layout, config))
+    cells = {location_key(r.row, s): c for r in layout.racks
+             for s, c in access_cells(r, graph.grid, config).items()}
+    assert set(cells) <= set(table.keys)
+
+    random.seed(36)
+    pairs = random.sample(list(itertools.combinations(sorted(cells), 2)), 40)
+    for a, b in pairs:
+        walked = min(graph.path(u, v)[0] for u in cells[a] for v in cells[b])
+        assert table.distance(a, b) == pytest.approx(walked, rel=1e-5)
+
+
+def test_table_is_symmetric_with_zero_diagonal(table):
+    assert np.array_equal(table.matrix, table.matrix.T)
+    assert not np.diagonal(table.matrix).any()
+    assert np.isfinite(table.matrix).all()
+
+
+def test_containers_resolve_to_their_section(bay, table):
+    for c in bay['containers'][:20]:
+        assert table.distance(c['id'], location_key(c['row'], c['section'])) == 0.0
+    with pytest.raises(KeyError):
+        table.resolve('NOPE')
+
+
+# ============================================================================
+# user-036: pick ordering
+# ============================================================================
+
+def test_nearest_order_starts_at_the_first_pick_and_dedupes(table):
+    picks = [5, 12, 3, 12, 5, 7]
+    order = table.nearest_order(picks)
+    assert order[0] == 5
+    assert sorted(order) == [3, 5, 7, 12]
+    assert table.nearest_order([]) == []
+    assert table.nearest_order([4, 4]) == [4]
+
+
+def test_nearest_order_from_a_start_visits_every_pick(table):
+    order = table.nearest_order([9, 2, 6], start=0)
+    assert sorted(order) == [2, 6, 9]
+    assert order[0] == min((2, 6, 9), key=lambda k: (table.matrix[0, k], [9, 2, 6].index(k)))
+
+
+def test_route_lengths_sum_the_legs(bay, table):
+    ids = [c['id'] for c in bay['containers']]
+    random.seed(7)
+    lists = [random.sample(ids, random.randint(1, 6)) for _ in range(30)] + [[]]
+    given = table.route_lengths(lists)
+    for picks, length in zip(lists, given):
+        assert length == pytest.approx(sum(table.distance(a, b) for a, b in zip(picks, picks[1:])))
+
+    start = table.keys[0]
+    round_trips = table.route_lengths(lists, start=start)
+    for picks, length in zip(lists, round_trips):
+        stops = [start, *picks, start] if picks else []
+        assert length == pytest.approx(sum(table.distance(a, b) for a, b in zip(stops, stops[1:])))
+
+    nearest = table.route_lengths(lists, order='nearest')
+    for picks, length in zip(lists, nearest):
+        stops = table.nearest_order([table.resolve(p) for p in picks])
+        assert length == pytest.approx(sum(table.matrix[a, b] for a, b in zip(stops, stops[1:])))
+    with pytest.raises(ValueError):
+        table.route_lengths(lists, order='random')
+
+
+# ============================================================================
+# user-036: cache and the viewer template
+# ============================================================================
+
+def test_cached_table_is_the_same(bay, table, tmp_path):
+    first = load_or_build(bay, cache_dir=str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 1
+    second = load_or_build(bay, cache_dir=str(tmp_path))
+    assert first.keys == second.keys == table.keys
+    assert np.array_equal(first.matrix, second.matrix)
+    assert second.index == table.index
+
+
+def test_template_depots_reach_every_section():
+    with open(TEMPLATE) as f:
+        bay = json.load(f)
+    table, stats = build_distances(load_layout(bay))
+    assert stats["locations"] == len({(c['rack'], c['section']) for c in bay['containers']})
+    assert table.keys[-stats["depots"]:] == [d['id'] for d in bay['doors'] + bay['loading_docks']]
+    assert stats["no_access"] == []
+    assert np.isfinite(table.matrix).all()
@@ -0,0 +1,126 @@
+"""Regression tests for bay_reader.py (rack grouping, sidecars, json/jsonl parity)"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from bay_reader import BayFile, sidecar_paths
+from conftest import run_generator
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE = os.path.join(HERE, '..', 'src', 'data', 'BLDG-template-Bay00.json')
+
+
+@pytest.fixture
+def bay_files(sample_csv, tmp_path) -> dict:
+    """The 3E bay as .json and .jsonl in one folder"""
+    out = str(tmp_path / 'out')
+    run_generator(sample_csv, '-o', out)
+    run_generator(sample_csv, '-o', out, '--stream', '--format', 'jsonl')
+    stem = os.path.join(out, 'bldg22_bay3E_containers')
+    return {fmt: f'{stem}.{fmt}' for fmt in ('json', 'jsonl')}
+
+
+def by_rack(containers: list, key: str) -> dict:
+    racks = {}
+    for c in containers:
+        racks.setdefault(str(c[key]), []).append(c)
+    return racks
+
+
+# ============================================================================
+# user-034: containers grouped by "row", or "rack" in the viewer template
+# ============================================================================
+
+def test_generator_output_is_grouped_by_row(bay_files):
+    with open(bay_files['json']) as f:
+        expected = by_rack(json.load(f)['containers'], 'row')
+    bay = BayFile(bay_files['json'])
+    assert bay.rows == ['01', '02']
+    for row, containers in expected.items():
+        rack = bay.rack(row)
+        assert rack.containers == containers
+        assert rack.positions.tolist() == [[c['position'][a] for a in 'xyz'] for c in containers]
+
+
+def test_template_bay_is_grouped_by_rack(tmp_path):
+    path = str(tmp_path / 'BLDG-template-Bay00.json')
+    shutil.copy(TEMPLATE, path)
+    with open(path) as f:
+        expected = by_rack(json.load(f)['containers'], 'rack')
+
+    bay = BayFile(path)
+    assert '' not in bay.rows
+    assert sorted(bay.rows) == sorted(expected)
+    for row, containers in expected.items():
+        assert bay.rack(row).containers == containers
+    assert sum(len(bay.rack(row)) for row in bay.rows) == len(bay)
+
+
+def test_unknown_rack_is_a_key_error(bay_files):
+    with pytest.raises(KeyError):
+        BayFile(bay_files['json']).rack('99')
+
+
+# ============================================================================
+# user-034: sidecars
+# ============================================================================
+
+def test_sidecars_are_per_file_and_reused(bay_files):
+    paths = {fmt: sidecar_paths(path) for fmt, path in bay_files.items()}
+    assert paths['json'] != paths['jsonl']
+    BayFile(bay_files['json'])
+    index_path, geometry_path = paths['json']
+    assert os.path.exists(index_path) and os.path.exists(geometry_path)
+    assert not os.path.exists(paths['jsonl'][0])
+
+    mtime = os.stat(index_path).st_mtime_ns
+    BayFile(bay_files['json'])
+    assert os.stat(index_path).st_mtime_ns == mtime
+
+
+def test_stale_or_old_index_is_rebuilt(bay_files):
+    path = bay_files['json']
+    index_path, _ = sidecar_paths(path)
+    BayFile(path)
+    with open(index_path) as f:
+        index = json.load(f)
+    index['version'] = 1
+    index['racks'] = {'': index['racks']['01']}
+    with open(index_path, 'w') as f:
+        json.dump(index, f)
+    assert BayFile(path).rows == ['01', '02']
+
+
+def test_index_dir(bay_files, tmp_path):
+    folder = str(tmp_path / 'idx')
+    bay = BayFile(bay_files['json'], index_dir=folder)
+    assert bay.index_path.startswith(folder)
+    assert len(os.listdir(folder)) == 2
+
+
+# ============================================================================
+# user-034: json and jsonl read the same
+# ============================================================================
+
+def test_json_and_jsonl_read_the_same(bay_files):
+    json_bay, jsonl_bay = BayFile(bay_files['json']), BayFile(bay_files['jsonl'])
+    assert (json_bay.format, jsonl_bay.format) == ('json', 'jsonl')
+    assert json_bay.header == jsonl_bay.header
+    assert json_bay.racks == jsonl_bay.racks
+    assert json_bay.diagnostics == jsonl_bay.diagnostics
+    assert json_bay.rows == jsonl_bay.rows
+    assert np.array_equal(json_bay.geometry, jsonl_bay.geometry)
+    for row in json_bay.rows:
+        assert json_bay.rack(row).containers == jsonl_bay.rack(row).containers
+
+
+def test_save_round_trips_byte_for_byte(bay_files, tmp_path):
+    for fmt, path in bay_files.items():
+        copy = str(tmp_path / f'copy.{fmt}')
+        BayFile(path).save(copy, fmt)
+        with open(path, 'rb') as a, open(copy, 'rb') as b:
+            assert a.read() == b.read()
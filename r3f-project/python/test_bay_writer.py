@@ -0,0 +1,41 @@
+"""Regression tests for bay_writer.py: streamed files match a one-shot json.dump"""
+
+import json
+
+import pytest
+
+from bay_writer import BayFileWriter
+
+HEADER = {"building": "BLDG 22", "bay": "3E", "bay_origin": {"x": 0, "y": 0, "z": 0},
+          "metadata": {"total_containers": 3, "units": "feet"}}
+CONTAINERS = [{"id": f"3E01A1{s}", "position": {"x": 1.5, "y": 0.0, "z": -2.0}, "level": 1} for s in 'ABC']
+RACKS = [{"row": "01", "bounds": {"min": {"x": 0}, "max": {"x": 3}}}]
+
+
+def write(path, containers, fmt, chunk_size=2):
+    writer = BayFileWriter(str(path), HEADER, fmt, chunk_size)
+    for c in containers:
+        writer.write_container(c)
+    writer.close(racks=RACKS, errors=[], diagnostics={"SPECIAL_BIN": 2})
+    return path.read_text()
+
+
+@pytest.mark.parametrize('containers', [CONTAINERS, []])
+def test_json_is_byte_identical_to_json_dump(tmp_path, containers):
+    expected = json.dumps({**HEADER, "containers": containers, "racks": RACKS, "errors": [],
+                           "diagnostics": {"SPECIAL_BIN": 2}}, indent=2)
+    assert write(tmp_path / 'bay.json', containers, 'json') == expected
+
+
+def test_jsonl_records(tmp_path):
+    records = [json.loads(line) for line in write(tmp_path / 'bay.jsonl', CONTAINERS, 'jsonl').splitlines()]
+    assert [r.pop("record") for r in records] == ['bay', 'container', 'container', 'container', 'rack', 'end']
+    assert records[0] == HEADER
+    assert records[1:4] == CONTAINERS
+    assert records[4] == RACKS[0]
+    assert records[5] == {"errors": [], "diagnostics": {"SPECIAL_BIN": 2}}
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        BayFileWriter(str(tmp_path / 'bay.txt'), HEADER, 'xml')
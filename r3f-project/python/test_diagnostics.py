@@ -0,0 +1,58 @@
+"""Regression tests for diagnostics.py and the bay files' diagnostics/warnings keys"""
+
+import json
+import os
+
+from conftest import run_generator
+from diagnostics import (CODES, CRITICAL, ERROR, HEIGHT_MISMATCH, INFO, SPECIAL_BIN, WARNING, Diagnostic,
+                         DiagnosticLog)
+
+
+def special(n: int) -> Diagnostic:
+    return Diagnostic(SPECIAL_BIN, f"Skipping special bin: 3E{n:02d}ENDCAP (ENDCAP)", bay='3E')
+
+
+def test_counts_everything_keeps_capped_examples():
+    log = DiagnosticLog(max_examples=2)
+    log.extend(special(n) for n in range(5))
+    log.add(Diagnostic(HEIGHT_MISMATCH, "Row 01, Level 2: ...", bay='3E'))
+    assert len(log) == 6
+    assert log.count(code=SPECIAL_BIN) == 5
+    assert log.count(INFO) == 5 and log.count(WARNING) == 1
+    assert log.by_severity() == {CRITICAL: 0, ERROR: 0, WARNING: 1, INFO: 5}
+    assert log.messages(SPECIAL_BIN) == [special(0).message, special(1).message]
+    codes = log.to_dict()["codes"]
+    assert codes["SPECIAL_BIN"]["truncated"] and not codes["HEIGHT_MISMATCH"]["truncated"]
+
+
+def test_zero_keeps_every_example():
+    log = DiagnosticLog(max_examples=0)
+    log.extend(special(n) for n in range(30))
+    assert len(log.messages(SPECIAL_BIN)) == 30
+
+
+def test_merge_matches_adding_in_order():
+    first, second, together = DiagnosticLog(3), DiagnosticLog(3), DiagnosticLog(3)
+    records = [special(n) for n in range(4)] + [Diagnostic(HEIGHT_MISMATCH, "Row 02, Level 1: ...")]
+    first.extend(records[:2])
+    second.extend(records[2:])
+    together.extend(records)
+    first.merge(second)
+    assert first.to_dict() == together.to_dict()
+    assert first.example_messages() == together.example_messages()
+
+
+def test_every_code_is_registered():
+    assert all(CODES[name].name == name for name in CODES)
+
+
+def test_bay_file_keeps_deprecated_warnings_next_to_diagnostics(sample_csv, tmp_path):
+    out = str(tmp_path / 'out')
+    run_generator(sample_csv, '-o', out, '--max-examples', '1')
+    with open(os.path.join(out, 'bldg22_bay3E_containers.json')) as f:
+        bay = json.load(f)
+    with open(os.path.join(out, 'bldg22_bay3E_diagnostics.json')) as f:
+        log = json.load(f)
+    assert list(bay)[-3:] == ['errors', 'warnings', 'diagnostics']
+    assert bay["diagnostics"] == {name: c["count"] for name, c in log["codes"].items()}
+    assert bay["warnings"] == [e["message"] for c in log["codes"].values() for e in c["examples"]]
@@ -0,0 +1,52 @@
+"""Regression tests for instancing.py: every container lands in exactly one batch"""
+
+import json
+import os
+
+from conftest import HERE
+from instancing import build_instances
+
+
+def container(cid, corner, dims):
+    return {"id": cid, "position": dict(zip('xyz', corner)), "dimensions": dict(zip('xyz', dims))}
+
+
+def test_batches_group_by_dimensions_largest_first():
+    bay = {"building": "BLDG 22", "bay": "3E", "containers": [
+        container("A", (0, 0, 0), (3, 1, 1.5)),
+        container("B", (3, 0, 0), (1.5, 1, 1.5)),
+        container("C", (0, 1, 0), (3, 1, 1.5)),
+    ]}
+    inst = build_instances(bay)
+    assert inst["ids"] == ["A", "B", "C"]
+    assert inst["metadata"]["total_instances"] == 3 and inst["metadata"]["total_batches"] == 2
+    big, small = inst["batches"]
+    assert big["count"] == 2 and big["indices"] == [0, 2]
+    # Translations are box centers, not the min corner
+    assert big["translations"] == [1.5, 0.5, 0.75, 1.5, 1.5, 0.75]
+    assert small["dimensions"] == {"x": 1.5, "y": 1, "z": 1.5} and small["indices"] == [1]
+
+
+def test_template_bay_round_trip():
+    with open(os.path.join(HERE, '..', 'src', 'data', 'BLDG-template-Bay00.json')) as f:
+        bay = json.load(f)
+    inst = build_instances(bay)
+    by_id = {c["id"]: c for c in bay["containers"]}
+    seen = []
+    for batch in inst["batches"]:
+        t = batch["translations"]
+        assert len(t) == 3 * batch["count"] == 3 * len(batch["indices"])
+        for i, index in enumerate(batch["indices"]):
+            c = by_id[inst["ids"][index]]
+            assert {k: c["dimensions"][k] for k in 'xyz'} == batch["dimensions"]
+            assert abs(t[3 * i] - (c["position"]["x"] + c["dimensions"]["x"] / 2)) < 1e-3
+            seen.append(index)
+    assert sorted(seen) == list(range(len(bay["containers"])))
+
+
+def test_checked_in_template_instances_are_current():
+    data = os.path.join(HERE, '..', 'src', 'data')
+    with open(os.path.join(data, 'BLDG-template-Bay00.json')) as f:
+        expected = build_instances(json.load(f))
+    with open(os.path.join(data, 'bldg-template_bay00_instances.json')) as f:
+        assert json.load(f) == expected
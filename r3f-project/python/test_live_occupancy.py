@@ -0,0 +1,174 @@
+"""Regression tests for live_occupancy.py (event contract, batching, viewer fan-out, SSE)"""
+
+import asyncio
+import json
+
+import pytest
+
+from live_occupancy import Broadcaster, OccupancyService, OccupancyState, split_lines
+
+
+def decode(payload: bytes) -> tuple:
+    """(event name, data) of one SSE message"""
+    fields = dict(line.split(': ', 1) for line in payload.decode().strip().split('\n'))
+    return fields['event'], json.loads(fields['data'])
+
+
+# ============================================================================
+# user-038: apply() contract
+# ============================================================================
+
+def test_events_set_values_and_coalesce():
+    state = OccupancyState()
+    assert state.apply([
+        {"container": "A", "lofull": 75, "inavlq": 12, "ts": 10.0},
+        {"container": "A", "delta": -3, "ts": 12.0},
+        {"container": "B", "delta": 4, "ts": 11.0},
+        {"container": "C", "lofull": 50.0, "inavlq": "7"},
+        {"container": "C", "clear": True},
+    ]) == 5
+    assert state.slots == {"A": {"lofull": 75, "inavlq": 9}, "B": {"lofull": 0, "inavlq": 4}}
+
+    event, message = decode(state.drain())
+    assert event == 'occupancy'
+    assert message["seq"] == 1 and message["events"] == 5
+    assert message["sourceTs"] == [10.0, 12.0]
+    assert message["changes"] == {"A": {"lofull": 75, "inavlq": 9}, "B": {"lofull": 0, "inavlq": 4},
+                                  "C": None}
+    assert state.drain() is None
+
+
+@pytest.mark.parametrize('event', [
+    {"container": "A", "lofull": 50.7},
+    {"container": "A", "inavlq": 3, "delta": 1.5},
+    {"container": "A", "lofull": 80, "inavlq": "many"},
+    {"container": "A", "lofull": None},
+    {"container": "A", "delta": float('inf')},
+    {"container": "A", "inavlq": [1]},
+    {"lofull": 50},
+    ["A", 50],
+])
+def test_bad_event_changes_nothing(event):
+    for existing in ({}, {"A": {"lofull": 10, "inavlq": 5}}):
+        state = OccupancyState()
+        state.slots = {k: dict(v) for k, v in existing.items()}
+        assert state.apply([event]) == 0
+        assert state.rejected == 1
+        assert state.slots == existing
+        assert state.pending == {}
+        assert state.drain() is None
+
+
+def test_bad_event_does_not_stop_the_batch():
+    state = OccupancyState()
+    assert state.apply([{"container": "A", "inavlq": 2}, {"container": "A", "delta": 0.5},
+                        {"container": "A", "delta": 3}]) == 2
+    assert state.slots == {"A": {"lofull": 0, "inavlq": 5}}
+    assert (state.events, state.rejected) == (2, 1)
+
+
+def test_unknown_containers_are_rejected():
+    state = OccupancyState({"A"})
+    assert state.apply([{"container": "A", "lofull": 5}, {"container": "Z", "lofull": 5}]) == 1
+    assert list(state.slots) == ["A"] and state.rejected == 1
+
+
+def test_apply_lines_skips_bad_json():
+    state = OccupancyState()
+    lines, tail = split_lines(b'{"container": "A", "lofull": 1}\n',
+                              b'not json\n\n{"container": "B", "delta": 2}\n{"cont')
+    assert tail == b'{"cont'
+    assert state.apply_lines(lines) == 2
+    assert set(state.slots) == {"A", "B"} and state.rejected == 1
+
+
+def test_batches_can_be_applied_twice():
+    state = OccupancyState()
+    state.apply([{"container": "A", "lofull": 40, "inavlq": 3}, {"container": "B", "clear": True}])
+    _, message = decode(state.drain())
+    viewer = {"B": {"lofull": 1, "inavlq": 1}}
+    for _ in range(2):
+        for cid, record in message["changes"].items():
+            if record is None:
+                viewer.pop(cid, None)
+            else:
+                viewer[cid] = record
+    assert viewer == state.slots
+
+
+# ============================================================================
+# user-038: viewer fan-out
+# ============================================================================
+
+class FakeTransport:
+    aborted = False
+
+    def abort(self):
+        self.aborted = True
+
+
+class FakeWriter:
+    def __init__(self):
+        self.transport = FakeTransport()
+
+
+def test_slow_viewer_is_dropped_and_aborted():
+    hub = Broadcaster(queue_size=2)
+    fast_writer, slow_writer = FakeWriter(), FakeWriter()
+    fast, slow = hub.subscribe(fast_writer), hub.subscribe(slow_writer)
+    for n in range(3):
+        hub.publish(b'batch %d' % n)
+        fast.get_nowait()
+    assert hub.dropped == 1
+    assert list(hub.clients) == [fast]
+    assert slow_writer.transport.aborted and not fast_writer.transport.aborted
+    assert slow.get_nowait() is None and slow.empty()
+
+
+# ============================================================================
+# user-038: SSE end to end
+# ============================================================================
+
+async def read_message(reader: asyncio.StreamReader) -> tuple:
+    while True:
+        block = await asyncio.wait_for(reader.readuntil(b'\n\n'), 5)
+        if b'event: ' in block:
+            return decode(block)
+
+
+async def sse_session():
+    service = OccupancyService(OccupancyState(), interval=0.02)
+    service.state.apply([{"container": "A", "lofull": 20, "inavlq": 1}])
+    service.state.drain()
+    flush = asyncio.create_task(service.flush_loop())
+    server = await service.serve_http('127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b'GET /events HTTP/1.1\r\nHost: test\r\n\r\n')
+        head = await reader.readuntil(b'\r\n\r\n')
+        snapshot = await read_message(reader)
+
+        service.feed([b'{"container": "A", "delta": 4}', b'{"container": "B", "clear": true}'])
+        batch = await read_message(reader)
+        writer.close()
+
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b'GET /stats HTTP/1.1\r\nHost: test\r\n\r\n')
+        stats = json.loads((await reader.read()).split(b'\r\n\r\n', 1)[1])
+        writer.close()
+        return head, snapshot, batch, stats
+    finally:
+        flush.cancel()
+        server.close()
+        await server.wait_closed()
+
+
+def test_viewer_gets_snapshot_then_batches():
+    head, snapshot, batch, stats = asyncio.run(sse_session())
+    assert head.startswith(b'HTTP/1.1 200 OK') and b'text/event-stream' in head
+    assert snapshot == ('snapshot', {"seq": 1, "slots": {"A": {"lofull": 20, "inavlq": 1}}})
+    event, message = batch
+    assert event == 'occupancy' and message["seq"] == 2
+    assert message["changes"] == {"A": {"lofull": 20, "inavlq": 5}, "B": None}
+    assert stats["events"] == 3 and stats["batches"] == 1
@@ -0,0 +1,127 @@
+"""Regression tests for pipeline.py (output parity, stage cache, --vary sweeps)"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import HERE, run_generator, sheet_rows, write_csv
+from pipeline import Pipeline, parse_vary, variants
+from test_warehouse_generator import output_files, same_tree
+from warehouse_generator_v2 import Config
+
+PIPELINE = os.path.join(HERE, 'pipeline.py')
+
+
+def run_pipeline(*args):
+    return subprocess.run([sys.executable, PIPELINE, *args], cwd=HERE, capture_output=True, text=True)
+
+
+# ============================================================================
+# user-032: same files as the generator
+# ============================================================================
+
+def test_pipeline_output_matches_the_generator(sample_csv, sample_xlsx, tmp_path):
+    for n, path in enumerate((sample_csv, sample_xlsx)):
+        expected, actual = str(tmp_path / f'gen{n}'), str(tmp_path / f'pipe{n}')
+        cache = str(tmp_path / f'cache{n}')
+        assert run_generator(path, '-o', expected, '--instances', '--shards').returncode == 0
+        assert run_pipeline(path, '-o', actual, '--cache-dir', cache, '--instances', '--shards').returncode == 0
+        assert same_tree(expected, actual)
+
+
+def test_cached_run_writes_the_same_files(sample_csv, tmp_path):
+    cache = str(tmp_path / 'cache')
+    first, second = str(tmp_path / 'first'), str(tmp_path / 'second')
+    run_pipeline(sample_csv, '-o', first, '--cache-dir', cache)
+    result = run_pipeline(sample_csv, '-o', second, '--cache-dir', cache)
+    assert result.returncode == 0
+    assert same_tree(first, second)
+
+
+# ============================================================================
+# user-032: stage cache
+# ============================================================================
+
+def sources(pipeline: Pipeline) -> dict:
+    return {stage: source for stage, _, source, _ in pipeline.log}
+
+
+def as_dicts(results: dict) -> dict:
+    return {building: {bay: data.to_dict() for bay, data in bays.items()} for building, bays in results.items()}
+
+
+def test_second_run_reads_geometry_and_validate_from_disk(sample_csv, tmp_path):
+    cache = str(tmp_path / 'cache')
+    first = Pipeline(sample_csv, cache_dir=cache)
+    expected = first.results(Config())
+    assert set(sources(first).values()) == {'computed'}
+
+    second = Pipeline(sample_csv, cache_dir=cache)
+    results = second.results(Config())
+    # Rows are never loaded when geometry and validate are cached
+    assert sources(second) == {'geometry': 'disk', 'validate': 'disk'}
+    assert as_dicts(results) == as_dicts(expected)
+
+
+def test_config_change_recomputes_only_what_depends_on_it(sample_csv, tmp_path):
+    cache = str(tmp_path / 'cache')
+    Pipeline(sample_csv, cache_dir=cache).results(Config())
+
+    pipeline = Pipeline(sample_csv, cache_dir=cache)
+    pipeline.results(Config(max_slots_per_section=6))
+    assert sources(pipeline) == {'geometry': 'computed', 'height': 'disk', 'parse': 'disk',
+                                 'validate': 'disk'}
+
+    pipeline = Pipeline(sample_csv, cache_dir=cache)
+    pipeline.results(Config(shelf_thickness_inches=2.0))
+    assert sources(pipeline)['height'] == 'computed'
+
+
+def test_input_change_misses_the_cache(tmp_path):
+    cache = str(tmp_path / 'cache')
+    path = write_csv(str(tmp_path / 'bay.csv'))
+    Pipeline(path, cache_dir=cache).results(Config())
+
+    rows = sheet_rows()
+    rows[0][6] = 60
+    write_csv(path, rows)
+    pipeline = Pipeline(path, cache_dir=cache)
+    pipeline.results(Config())
+    assert set(sources(pipeline).values()) == {'computed'}
+
+
+# ============================================================================
+# user-032: --vary
+# ============================================================================
+
+def test_parse_vary_and_variants():
+    axes = parse_vary(['shelf_thickness_inches=2,3', 'max_slots_per_section=6'])
+    assert axes == [('shelf_thickness_inches', [2.0, 3.0]), ('max_slots_per_section', [6])]
+    labels = [label for label, _ in variants(Config(), axes)]
+    assert labels == ['shelf_thickness_inches=2_max_slots_per_section=6',
+                      'shelf_thickness_inches=3_max_slots_per_section=6']
+    assert variants(Config(), []) == [('', Config())]
+    with pytest.raises(ValueError):
+        parse_vary(['no_such_field=1'])
+
+
+def test_each_variant_matches_a_generator_run(sample_csv, tmp_path):
+    sweep = str(tmp_path / 'sweep')
+    result = run_pipeline(sample_csv, '-o', sweep, '--cache-dir', str(tmp_path / 'cache'),
+                          '--vary', 'shelf_thickness_inches=2,4')
+    assert result.returncode == 0
+    assert output_files(sweep) == ['shelf_thickness_inches=2', 'shelf_thickness_inches=4']
+    for thickness in (2, 4):
+        expected = str(tmp_path / f'gen{thickness}')
+        run_generator(sample_csv, '-o', expected, '--shelf-thickness', str(thickness))
+        assert same_tree(expected, os.path.join(sweep, f'shelf_thickness_inches={thickness}'))
+    assert not same_tree(os.path.join(sweep, 'shelf_thickness_inches=2'),
+                         os.path.join(sweep, 'shelf_thickness_inches=4'))
+
+
+def test_bad_vary_is_a_usage_error(sample_csv, tmp_path):
+    result = run_pipeline(sample_csv, '-o', str(tmp_path / 'out'), '--vary', 'bogus=1')
+    assert result.returncode == 2
+    assert "Bad --vary 'bogus=1'" in result.stderr
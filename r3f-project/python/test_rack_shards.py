@@ -0,0 +1,91 @@
+"""Regression tests for rack_shards.py (shard contents, index, stale shards, template schema)"""
+
+import json
+import os
+
+from conftest import run_generator
+from rack_shards import write_shards
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA = os.path.join(HERE, '..', 'src', 'data')
+TEMPLATE = os.path.join(DATA, 'BLDG-template-Bay00.json')
+TEMPLATE_SHARDS = os.path.join(HERE, '..', 'public', 'data', 'bldg-template_bay00_racks')
+
+
+def load_json(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def read_shards(directory: str) -> dict:
+    return {name: load_json(os.path.join(directory, name))
+            for name in sorted(os.listdir(directory)) if name.endswith('.json')}
+
+
+def check_shards(bay: dict, directory: str, key: str):
+    """Every container is in its rack's shard, centered, and the index adds up"""
+    shards = read_shards(directory)
+    index = shards.pop('index.json')
+    files = [f"{c[key]}.json" for c in bay['containers']]
+    assert [e["file"] for e in index["racks"]] == list(dict.fromkeys(files))
+    assert sorted(shards) == sorted(e["file"] for e in index["racks"])
+
+    by_id = {c['id']: c for c in bay['containers']}
+    for entry in index["racks"]:
+        slots = shards[entry["file"]]
+        assert entry["count"] == len(slots)
+        assert entry["bytes"] == os.path.getsize(os.path.join(directory, entry["file"]))
+        for slot in slots:
+            c = by_id[slot["id"]]
+            assert slot["rackRef"] == c[key] == entry["rackRef"]
+            assert slot["size"] == [c['dimensions'][k] for k in 'xyz']
+            assert slot["position"] == [round(c['position'][k] + c['dimensions'][k] / 2, 4) for k in 'xyz']
+            lo, hi = entry["bounds"]["min"], entry["bounds"]["max"]
+            assert all(lo[i] - 1e-6 <= slot["position"][i] <= hi[i] + 1e-6 for i in range(3))
+    assert index["metadata"]["total_containers"] == len(bay['containers'])
+    assert index["metadata"]["total_bytes"] == sum(e["bytes"] for e in index["racks"])
+
+
+# ============================================================================
+# user-035: generator output and the viewer template
+# ============================================================================
+
+def test_generator_shards(sample_csv, tmp_path):
+    out = str(tmp_path / 'out')
+    run_generator(sample_csv, '-o', out, '--shards')
+    bay = load_json(os.path.join(out, 'bldg22_bay3E_containers.json'))
+    directory = os.path.join(out, 'bldg22_bay3E_racks')
+    check_shards(bay, directory, 'row')
+
+    index = load_json(os.path.join(directory, 'index.json'))
+    racks = {r['row']: r for r in bay['racks']}
+    for entry in index["racks"]:
+        rack = racks[entry["rackRef"]]
+        assert entry["sections"] == rack['sections'] and entry["maxLevel"] == rack['max_level']
+
+
+def test_template_shards_use_the_rack_key(tmp_path):
+    bay = load_json(TEMPLATE)
+    directory = str(tmp_path / 'racks')
+    write_shards(bay, directory)
+    check_shards(bay, directory, 'rack')
+
+
+def test_checked_in_template_shards_are_current(tmp_path):
+    directory = str(tmp_path / 'racks')
+    write_shards(load_json(TEMPLATE), directory)
+    assert read_shards(directory) == read_shards(TEMPLATE_SHARDS)
+
+
+def test_rewrite_removes_shards_of_racks_that_are_gone(tmp_path):
+    bay = load_json(TEMPLATE)
+    directory = str(tmp_path / 'racks')
+    write_shards(bay, directory)
+    assert '01.json' in os.listdir(directory)
+
+    bay['containers'] = [c for c in bay['containers'] if c['rack'] != '01']
+    open(os.path.join(directory, 'notes.txt'), 'w').close()
+    write_shards(bay, directory)
+    assert '01.json' not in os.listdir(directory)
+    assert 'notes.txt' in os.listdir(directory)
+    check_shards(bay, directory, 'rack')
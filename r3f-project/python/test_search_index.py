@@ -0,0 +1,100 @@
+"""Regression tests for search_index.py (lookups vs a linear scan, serialization)"""
+
+import json
+import os
+import random
+
+import pytest
+
+from bench_search import synthetic_records
+from search_index import FIELDS, SearchIndex, normalize
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture(scope='module')
+def records() -> list:
+    random.seed(33)
+    records = synthetic_records(2000)
+    records[5]["skpart"] = None       # missing values are not indexed
+    records[6]["skpart"] = ' p00x '   # normalized before indexing
+    return records
+
+
+def scan(records: list, field_name: str, match) -> list:
+    values = [normalize(r.get(field_name)) for r in records]
+    return [i for i, v in enumerate(values) if v and match(v)]
+
+
+def queries(records: list, field_name: str) -> list:
+    values = [normalize(r.get(field_name)) for r in random.Random(0).sample(records, 30)]
+    return [v for v in values if v] + ['', 'ZZZZ', 'P00X']
+
+
+# ============================================================================
+# user-033: lookups agree with a scan
+# ============================================================================
+
+@pytest.mark.parametrize('with_grams', [False, True])
+def test_lookups_match_a_linear_scan(records, with_grams):
+    index = SearchIndex.build(records, with_grams=with_grams)
+    for name in FIELDS:
+        for value in queries(records, name):
+            if value:
+                assert index.exact(name, value.lower()) == scan(records, name, lambda v: v == value)
+            for n in (1, 3, 5):
+                p = value[:n]
+                assert sorted(index.prefix(name, p)) == scan(records, name, lambda v: v.startswith(p))
+            for sub in (value[2:4], value[1:6]):
+                if sub:
+                    assert sorted(index.substring(name, sub)) == scan(records, name, lambda v: sub in v)
+
+
+def test_limits_and_search_dedupe(records):
+    index = SearchIndex.build(records)
+    assert len(index.prefix('skskun', '', 7)) == 7
+    ids = index.search('P', 50)
+    assert len(ids) == len(set(ids)) == 50
+    assert index.substring('skpart', '00', 3) == index.substring('skpart', '00')[:3]
+
+
+# ============================================================================
+# user-033: grams are opt-in, and serialization round-trips
+# ============================================================================
+
+def test_grams_are_opt_in(records):
+    assert all(f.gram_keys is None for f in SearchIndex.build(records).fields.values())
+    assert "grams" not in SearchIndex.build(records).to_dict()["fields"]["skpart"]
+    assert "grams" in SearchIndex.build(records, with_grams=True).to_dict()["fields"]["skpart"]
+
+
+@pytest.mark.parametrize('with_grams', [False, True])
+def test_save_load_round_trip(records, tmp_path, with_grams):
+    index = SearchIndex.build(records, with_grams=with_grams)
+    path = str(tmp_path / 'index.json')
+    index.save(path)
+    loaded = SearchIndex.load(path)
+    assert loaded.count == len(records)
+    assert loaded.to_dict() == index.to_dict()
+    for name in FIELDS:
+        value = normalize(records[10][name])
+        assert loaded.prefix(name, value[:3]) == index.prefix(name, value[:3])
+        assert loaded.substring(name, value[1:4]) == index.substring(name, value[1:4])
+
+
+def test_load_rejects_other_versions(records, tmp_path):
+    d = SearchIndex.build(records[:10]).to_dict()
+    d["version"] = 99
+    path = tmp_path / 'index.json'
+    path.write_text(json.dumps(d))
+    with pytest.raises(ValueError):
+        SearchIndex.load(str(path))
+
+
+def test_shipped_index_has_no_grams():
+    path = os.path.join(HERE, '..', 'public', 'inventory_index.json')
+    if not os.path.exists(path):
+        pytest.skip('public/inventory_index.json not generated')
+    with open(path) as f:
+        index = json.load(f)
+    assert not any("grams" in field for field in index["fields"].values())
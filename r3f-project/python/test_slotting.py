@@ -0,0 +1,88 @@
+"""Regression tests for slotting.py (bucketed assign vs brute force, bad dimensions, occupancy)"""
+
+import numpy as np
+import pytest
+
+from bench_slotting import brute_force, synthetic_slots, total_score
+from slotting import INCHES_TO_FEET, SlotIndex, assign, item_dimensions, occupied_bins
+
+
+@pytest.fixture(scope='module')
+def containers() -> list:
+    return synthetic_slots(3000, 12, np.random.default_rng(37))
+
+
+def random_items(n: int, seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).integers([6, 6, 6], [61, 73, 61], size=(n, 3)) * INCHES_TO_FEET
+
+
+# ============================================================================
+# user-037: bucketed assign matches brute force
+# ============================================================================
+
+@pytest.mark.parametrize('rotations', ['upright', 'any'])
+def test_assign_matches_brute_force(containers, rotations):
+    index = SlotIndex.build(containers)
+    items = random_items(400, 1)
+    result = assign(items, index, rotations, 0.01)
+    brute = brute_force(items, index, rotations, 0.01)
+    assert np.array_equal(result.slot >= 0, brute >= 0)
+    expected = total_score(brute, items, index, 0.01)
+    assert total_score(result.slot, items, index, 0.01) == pytest.approx(expected)
+
+
+def test_assignments_are_valid(containers):
+    index = SlotIndex.build(containers)
+    items = random_items(2000, 2)
+    result = assign(items, index, 'upright')
+    done = result.slot >= 0
+    assert 0 < result.assigned < len(items)
+    assert len(set(result.slot[done].tolist())) == result.assigned
+    perms = np.array([(0, 1, 2), (2, 1, 0)])
+    for i in np.flatnonzero(done):
+        rotated = items[i][perms[result.rotation[i]]]
+        assert (rotated <= index.dims[result.slot[i]]).all()
+    assert np.allclose(result.leftover[done], index.dims[result.slot[done]].prod(1) - items[done].prod(1))
+    assert np.isnan(result.leftover[~done]).all() and (result.rotation[~done] == -1).all()
+
+
+def test_candidates_are_ranked(containers):
+    index = SlotIndex.build(containers)
+    found = index.candidates([1.0, 1.0, 1.0], limit=5)
+    scores = [c["leftover_ft3"] + 0.01 * c["distance_ft"] for c in found]
+    assert len(found) == 5 and scores == sorted(scores)
+    assert index.candidates([100.0, 100.0, 100.0]) == []
+
+
+# ============================================================================
+# user-037: bad dimensions, unreachable and occupied slots
+# ============================================================================
+
+def test_missing_or_non_numeric_dimensions_are_skipped(containers):
+    records = [{"itemwd": "12", "itemht": "12", "itemdp": "12"},
+               {"itemwd": "", "itemht": "12", "itemdp": "12"},
+               {"itemwd": "wide", "itemht": None, "itemdp": "12"},
+               {"itemht": "12", "itemdp": "12"}]
+    items = item_dimensions(records)
+    assert items.shape == (4, 3)
+    assert np.isnan(items[1:]).any(axis=1).all()
+    result = assign(items, SlotIndex.build(containers))
+    assert result.slot.tolist()[1:] == [-1, -1, -1]
+    assert result.slot[0] >= 0
+    assert item_dimensions([]).shape == (0, 3)
+
+
+def test_unreachable_slots_are_left_out(containers):
+    distance = np.arange(len(containers), dtype=np.float64)
+    distance[::2] = np.inf
+    index = SlotIndex.build(containers, distance)
+    assert index.ids == [c['id'] for c in containers[1::2]]
+
+
+def test_occupied_bins_block_their_slots():
+    containers = [{"id": f"3E01A1{s}", "position": {"x": 0, "y": 0, "z": 0},
+                   "dimensions": {"x": 2, "y": 2, "z": 2}} for s in 'AB']
+    containers.append({"id": "3E01A2A", "position": {"x": 0, "y": 0, "z": 0},
+                       "dimensions": {"x": 2, "y": 2, "z": 2}})
+    occupied = occupied_bins([{"lolocn": "3E01A1"}, {"lolocn": ""}, {}])
+    assert SlotIndex.build(containers, occupied=occupied).ids == ["3E01A2A"]
@@ -0,0 +1,123 @@
+"""Regression tests for snapshot_log.py (replay, time queries, checkpoints, reopen)"""
+
+import os
+import random
+
+import pytest
+
+from bench_snapshots import next_snapshot, synthetic_inventory
+from snapshot_log import (OP_NAMES, SnapshotLog, apply_change, diff_states, snapshot_to_state,
+                          state_to_records)
+
+T0 = 1_700_000_000.0
+HOUR = 3600.0
+
+
+@pytest.fixture
+def snapshots() -> list:
+    random.seed(31)
+    snaps, serial = [synthetic_inventory(400)], [0]
+    for _ in range(6):
+        snaps.append(next_snapshot(snaps[-1], 0.1, serial))
+    return snaps
+
+
+def ingest_all(path: str, snapshots: list, checkpoint_every: int = 3) -> SnapshotLog:
+    log = SnapshotLog(path, checkpoint_every=checkpoint_every)
+    for n, records in enumerate(snapshots):
+        log.ingest(records, T0 + n * HOUR)
+    return log
+
+
+# ============================================================================
+# user-031: diff/apply and replay reproduce the snapshots
+# ============================================================================
+
+def test_diff_then_apply_gives_the_new_state(snapshots):
+    for old_records, new_records in zip(snapshots, snapshots[1:]):
+        state, new = snapshot_to_state(old_records), snapshot_to_state(new_records)
+        for change in diff_states(state, new):
+            apply_change(state, *change)
+        assert state == new
+
+
+def test_state_records_round_trip(snapshots):
+    state = snapshot_to_state(snapshots[-1])
+    assert snapshot_to_state(state_to_records(state)) == state
+
+
+def test_state_at_replays_every_snapshot(snapshots, tmp_path):
+    log = ingest_all(str(tmp_path), snapshots)
+    assert len(log) == len(snapshots)
+    for n, records in enumerate(snapshots):
+        expected = snapshot_to_state(records)
+        assert log.state_at(T0 + n * HOUR) == expected
+        assert log.state_at(T0 + n * HOUR + HOUR / 2) == expected
+    assert log.state_at(T0 - 1) == {}
+    assert log.head() == snapshot_to_state(snapshots[-1])
+
+
+def test_time_queries(snapshots, tmp_path):
+    log = ingest_all(str(tmp_path), snapshots)
+    assert log.seq_at(T0 - 1) == 0
+    assert log.seq_at(T0) == 1
+    assert log.seq_at(T0 + 2 * HOUR + 1) == 3
+
+    changes = log.changes(T0, T0 + 2 * HOUR)
+    assert changes and {c.seq for c in changes} == {2, 3}
+    assert all(T0 < c.t <= T0 + 2 * HOUR for c in changes)
+    assert {c.to_dict()["op"] for c in changes} <= set(OP_NAMES.values())
+    assert log.changes(T0 + HOUR, T0 + HOUR) == []
+
+    state = log.state_at(T0)
+    for c in changes:
+        apply_change(state, c.op, c.bin, c.item, c.value)
+    assert state == log.state_at(T0 + 2 * HOUR)
+
+
+def test_ingest_rejects_an_earlier_snapshot(snapshots, tmp_path):
+    log = ingest_all(str(tmp_path), snapshots[:2])
+    with pytest.raises(ValueError):
+        log.ingest(snapshots[2], T0)
+    assert len(log) == 2
+
+
+# ============================================================================
+# user-031: checkpoints and reopening
+# ============================================================================
+
+def test_checkpoints_do_not_change_answers(snapshots, tmp_path):
+    every = ingest_all(str(tmp_path / 'cp1'), snapshots, checkpoint_every=1)
+    never = ingest_all(str(tmp_path / 'cp0'), snapshots, checkpoint_every=len(snapshots) + 1)
+    assert len(os.listdir(every.checkpoint_dir)) == len(snapshots)
+    assert os.listdir(never.checkpoint_dir) == []
+    for n in range(len(snapshots)):
+        assert every.state_at(T0 + n * HOUR) == never.state_at(T0 + n * HOUR)
+
+    never.compact()
+    assert never._checkpoint_seqs() == [len(snapshots)]
+    assert SnapshotLog(never.path).head() == snapshot_to_state(snapshots[-1])
+
+
+def test_reopen_continues_the_log(snapshots, tmp_path):
+    path = str(tmp_path)
+    ingest_all(path, snapshots[:4])
+    log = SnapshotLog(path, checkpoint_every=3)
+    assert log.head() == snapshot_to_state(snapshots[3])
+    for n in range(4, len(snapshots)):
+        log.ingest(snapshots[n], T0 + n * HOUR)
+
+    reopened = SnapshotLog(path)
+    for n, records in enumerate(snapshots):
+        assert reopened.state_at(T0 + n * HOUR) == snapshot_to_state(records)
+
+
+def test_reopen_drops_a_block_without_an_index_entry(snapshots, tmp_path):
+    path = str(tmp_path)
+    log = ingest_all(path, snapshots[:3])
+    size = os.path.getsize(log.log_path)
+    with open(log.log_path, 'ab') as f:
+        f.write(b'{"seq":4,"t":0,"bins":[],"items":[]')    # crash mid-append
+    reopened = SnapshotLog(path)
+    assert os.path.getsize(reopened.log_path) == size
+    assert reopened.head() == snapshot_to_state(snapshots[2])
@@ -0,0 +1,168 @@
+"""Regression tests for warehouse_generator_v2.py (CSV/xlsx loading, output files)"""
+
+import filecmp
+import json
+import os
+import subprocess
+import sys
+
+from conftest import HERE, run_generator, sheet_rows, write_csv
+
+
+def output_files(directory: str) -> list:
+    return sorted(os.listdir(directory))
+
+
+def same_tree(a: str, b: str) -> bool:
+    """Same file names and bytes, recursing into shard directories"""
+    names = output_files(a)
+    if names != output_files(b):
+        return False
+    dirs = [n for n in names if os.path.isdir(os.path.join(a, n))]
+    files = [n for n in names if n not in dirs]
+    _, mismatch, errors = filecmp.cmpfiles(a, b, files, shallow=False)
+    return not mismatch and not errors and all(same_tree(os.path.join(a, d), os.path.join(b, d)) for d in dirs)
+
+
+# ============================================================================
+# user-026: pandas-free CSV path
+# ============================================================================
+
+def test_csv_run_does_not_import_pandas(sample_csv, tmp_path):
+    probe = (
+        "import sys, warehouse_generator_v2 as g\n"
+        f"g.process_excel({sample_csv!r}, g.Config())\n"
+        "print('pandas' in sys.modules, 'openpyxl' in sys.modules)\n"
+    )
+    result = subprocess.run([sys.executable, '-c', probe], cwd=HERE, capture_output=True, text=True, check=True)
+    assert result.stdout.splitlines()[-1] == 'False False'
+
+
+def test_csv_and_xlsx_give_the_same_files(sample_csv, sample_xlsx, tmp_path):
+    csv_out, xlsx_out = str(tmp_path / 'csv'), str(tmp_path / 'xlsx')
+    assert run_generator(sample_csv, '-o', csv_out).returncode == 0
+    assert run_generator(sample_xlsx, '-o', xlsx_out).returncode == 0
+    assert output_files(csv_out) == ['bldg22_bay3E_containers.json', 'bldg22_bay3E_diagnostics.json',
+                                     'bldg22_bay3W_containers.json', 'bldg22_bay3W_diagnostics.json']
+    assert same_tree(csv_out, xlsx_out)
+
+
+def test_csv_output_content(sample_csv, tmp_path):
+    out = str(tmp_path / 'out')
+    run_generator(sample_csv, '-o', out)
+    with open(os.path.join(out, 'bldg22_bay3E_containers.json')) as f:
+        bay = json.load(f)
+    ids = [c['id'] for c in bay['containers']]
+    # 2 racks x 3 sections x 3 levels x 2 slots; the duplicate, special, unparseable and no-X bins add none
+    assert len(ids) == len(set(ids)) == 36
+    assert {r['row'] for r in bay['racks']} == {'01', '02'}
+
+
+# ============================================================================
+# user-027: --check exit codes and diagnostics
+# ============================================================================
+
+def check(path: str, tmp_path, *args) -> tuple:
+    report_path = str(tmp_path / 'check.json')
+    result = run_generator(path, '--check', '--report', report_path, *args)
+    with open(report_path) as f:
+        return result.returncode, json.load(f)
+
+
+def test_check_exit_0_when_only_warnings(tmp_path):
+    rows = [r for r in sheet_rows() if r[1] == '3E' and r[5] != 'XX']
+    code, report = check(write_csv(str(tmp_path / 'clean.csv'), rows), tmp_path)
+    assert code == 0
+    assert report["errors"] == 0 and report["warnings"] > 0
+
+
+def test_check_exit_1_on_data_errors(sample_csv, tmp_path):
+    code, report = check(sample_csv, tmp_path)
+    assert code == 1
+    codes = report["diagnostics"]["codes"]
+    assert codes["UNPARSEABLE_BIN"]["count"] == 1
+    assert codes["BAY_MISSING_POSITIONS"]["count"] == 1
+    assert not report["truncated"]
+
+
+def test_check_stops_at_max_errors(sample_csv, tmp_path):
+    code, report = check(sample_csv, tmp_path, '--max-errors', '1')
+    assert code == 1
+    assert report["truncated"]
+    assert report["errors"] == 1
+
+
+def test_check_exit_2_on_unreadable_input(tmp_path):
+    not_a_workbook = tmp_path / 'bay.xlsx'
+    not_a_workbook.write_text('not a zip')
+    for path in (str(tmp_path / 'missing.xlsx'), str(not_a_workbook)):
+        code, report = check(path, tmp_path)
+        assert code == 2
+        assert report["exit_code"] == 2
+        assert list(report["diagnostics"]["codes"]) == ["INPUT_UNREADABLE"]
+
+
+def test_check_exit_2_on_missing_columns(tmp_path):
+    path = write_csv(str(tmp_path / 'bay.csv'), [['BLDG 22', '3E']], columns=['BLDG', 'AREA (BAY)'])
+    code, report = check(path, tmp_path)
+    assert code == 2
+    assert "MISSING_COLUMNS" in report["diagnostics"]["codes"]
+
+
+def non_numeric_messages(diagnostics: dict) -> list:
+    return [e["message"] for e in diagnostics["codes"]["NON_NUMERIC_VALUE"]["examples"]]
+
+
+def test_non_numeric_cells_reported_on_every_path(tmp_path):
+    rows = sheet_rows()
+    rows[0][6] = 'tall'      # Height (in)
+    rows[1][2] = 'n/a'       # pandas reads this as blank, so every path does
+    rows[2][7] = ' '
+    path = write_csv(str(tmp_path / 'bay.csv'), rows)
+    expected = ["Bin 3E01A1A: non-numeric Height (in) value 'tall'"]
+
+    _, report = check(path, tmp_path)
+    assert non_numeric_messages(report["diagnostics"]) == expected
+    for mode in ([], ['--stream']):
+        out = str(tmp_path / ('stream' if mode else 'normal'))
+        run_generator(path, '-o', out, *mode)
+        with open(os.path.join(out, 'bldg22_bay3E_diagnostics.json')) as f:
+            assert non_numeric_messages(json.load(f)) == expected
+
+
+# ============================================================================
+# user-028: --stream writes what a normal run writes
+# ============================================================================
+
+def test_stream_output_is_byte_identical(sample_csv, sample_xlsx, tmp_path):
+    for n, path in enumerate((sample_csv, sample_xlsx)):
+        normal, stream = str(tmp_path / f'normal{n}'), str(tmp_path / f'stream{n}')
+        run_generator(path, '-o', normal, '--instances', '--shards')
+        run_generator(path, '-o', stream, '--stream', '--chunk-size', '5', '--instances', '--shards')
+        assert 'bldg22_bay3E_racks' in output_files(normal)
+        assert same_tree(normal, stream)
+
+
+def test_stream_jsonl_has_the_same_records(sample_csv, tmp_path):
+    normal, stream = str(tmp_path / 'normal'), str(tmp_path / 'stream')
+    run_generator(sample_csv, '-o', normal)
+    run_generator(sample_csv, '-o', stream, '--stream', '--format', 'jsonl')
+    with open(os.path.join(normal, 'bldg22_bay3E_containers.json')) as f:
+        expected = json.load(f)
+    with open(os.path.join(stream, 'bldg22_bay3E_containers.jsonl')) as f:
+        records = [json.loads(line) for line in f]
+    assert [{k: v for k, v in r.items() if k != 'record'} for r in records if r['record'] == 'container'] \
+        == expected['containers']
+    assert [{k: v for k, v in r.items() if k != 'record'} for r in records if r['record'] == 'rack'] \
+        == expected['racks']
+    assert filecmp.cmp(os.path.join(normal, 'bldg22_bay3E_diagnostics.json'),
+                       os.path.join(stream, 'bldg22_bay3E_diagnostics.json'), shallow=False)
+
+
+def test_height_mismatch_text_does_not_depend_on_input_type(sample_csv, sample_xlsx, tmp_path):
+    for n, path in enumerate((sample_csv, sample_xlsx)):
+        run_generator(path, '-o', str(tmp_path / str(n)))
+        with open(tmp_path / str(n) / 'bldg22_bay3E_diagnostics.json') as f:
+            messages = [e["message"] for e in json.load(f)["codes"]["HEIGHT_MISMATCH"]["examples"]]
+        assert messages == ['Row 01, Level 2: Height mismatch - expected 11" (4 sections) but found: '
+                            '12" in section(s) C,C']
@@ -0,0 +1,55 @@
+"""Regression tests for xlsx_reader.py against workbooks written by openpyxl"""
+
+import datetime
+import zipfile
+
+import pytest
+
+import xlsx_reader
+
+openpyxl = pytest.importorskip('openpyxl')
+
+
+def workbook(path, rows, iso_dates=False, title='Sheet1'):
+    wb = openpyxl.Workbook()
+    wb.iso_dates = iso_dates
+    ws = wb.active
+    ws.title = title
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+    return str(path)
+
+
+def test_values_match_openpyxl(tmp_path):
+    rows = [['Storage Bin', 'POS X (ft)', 'Height (in)', 'ok'],
+            ['3E01A1A', 3.5, 56, True],
+            ['3E01A1B', None, 11, False]]
+    path = workbook(tmp_path / 'bay.xlsx', rows, title='bldg22(bay3)')
+    assert xlsx_reader.sheet_names(path) == ['bldg22(bay3)']
+    values = list(xlsx_reader.iter_sheet_rows(path))
+    assert values == rows
+    assert isinstance(values[1][2], int)
+
+
+def test_blank_rows_keep_their_place(tmp_path):
+    wb = openpyxl.Workbook()
+    wb.active['A1'], wb.active['A3'] = 'head', 'tail'
+    wb.save(tmp_path / 'gap.xlsx')
+    assert list(xlsx_reader.iter_sheet_rows(str(tmp_path / 'gap.xlsx'))) == [['head'], [], ['tail']]
+
+
+def test_iso_date_cells_become_datetimes(tmp_path):
+    when = datetime.datetime(2024, 3, 1)
+    path = workbook(tmp_path / 'dates.xlsx', [['Depth (in)'], [when]], iso_dates=True)
+    with zipfile.ZipFile(path) as zf:
+        assert b't="d"' in zf.read('xl/worksheets/sheet1.xml')
+    assert list(xlsx_reader.iter_sheet_rows(path))[1] == [when]
+
+
+def test_not_a_workbook_raises_a_read_error(tmp_path):
+    (tmp_path / 'plain.zip').write_bytes(b'')
+    with zipfile.ZipFile(tmp_path / 'plain.zip', 'w') as zf:
+        zf.writestr('hello.txt', 'hi')
+    with pytest.raises(xlsx_reader.READ_ERRORS):
+        xlsx_reader.sheet_names(str(tmp_path / 'plain.zip'))
@@ -14,21 +14,47 @@ Location Label Format: 3W-26-D-02-01
 
 Usage:
     python warehouse_generator_v2.py input.xlsx --output-dir ./output
-    
+    python warehouse_generator_v2.py input.csv --output-dir ./output
+
+The core path (bin parsing, height model, geometry) works on plain row dicts
+and only needs the standard library. pandas is imported lazily, and only when
+an Excel workbook is read, so `--help` and CSV runs start fast.
+
 Output:
     bldg22_bay3E_containers.json
     bldg22_bay3W_containers.json (or error if missing data)
 """
 
-import pandas as pd
 import json
 import argparse
+import csv
 import os
 import re
+import sys
 from dataclasses import dataclass, field
-from typing import Optional, Dict, List, Tuple
+from typing import Any, Optional, Dict, List, Tuple
 from collections import defaultdict
 
+import xlsx_reader
+from bay_writer import BayFileWriter, EXTENSIONS, FORMATS
+from instancing import InstanceBatcher, instances_filename, save_instances
+from rack_shards import RackSharder, shards_dirname
+from diagnostics import (
+    Diagnostic, DiagnosticLog, CRITICAL, ERROR, WARNING, INFO,
+    INPUT_UNREADABLE, SHEET_NOT_FOUND, MISSING_COLUMNS, MISSING_POSITION_COLUMNS, NO_BAY_DATA,
+    BAY_MISSING_POSITIONS, PARTIAL_MISSING_X, PARTIAL_MISSING_Y, NON_NUMERIC_VALUE,
+    UNPARSEABLE_BIN, SPECIAL_BIN, HEIGHT_MISMATCH,
+)
+
+
+# A sheet row keyed by column name ("Storage Bin", "POS X (ft)", ...)
+Row = Dict[str, Any]
+
+# Column groups shared by the Excel and CSV loaders
+REQUIRED_COLUMNS = ['Storage Bin', 'AREA (BAY)', 'BLDG']
+POSITION_COLUMNS = ['POS X (ft)', 'POS Y']
+DIMENSION_COLUMNS = ['Width (in)', 'Height (in)', 'Depth (in)']
+
 
 # ============================================================================
 # CONFIGURATION
@@ -158,10 +184,13 @@ class BayData:
     bay: str
     containers: List[Container] = field(default_factory=list)
     racks: List[Rack] = field(default_factory=list)
+    # Fatal problems that left the bay empty
     errors: List[str] = field(default_factory=list)
-    warnings: List[str] = field(default_factory=list)
+    # Everything else - written to a separate diagnostics file, counts only in to_dict()
+    diagnostics: DiagnosticLog = field(default_factory=DiagnosticLog)
     
-    def to_dict(self) -> dict:
+    def header_dict(self, total_containers: int = None, total_racks: int = None) -> dict:
+        """Keys that precede "containers" in to_dict() - counts default to the lists held"""
         return {
             "building": self.building,
             "bay": self.bay,
@@ -172,8 +201,8 @@ class BayData:
                 "note": "Origin is at top-left of bay (westernmost & southernmost point)"
             },
             "metadata": {
-                "total_containers": len(self.containers),
-                "total_racks": len(self.racks),
+                "total_containers": len(self.containers) if total_containers is None else total_containers,
+                "total_racks": len(self.racks) if total_racks is None else total_racks,
                 "units": "feet",
                 "coordinate_system": {
                     "x": "horizontal (left-right, positive = east)",
@@ -181,11 +210,77 @@ class BayData:
                     "z": "depth (positive = north, into warehouse)"
                 }
             },
+        }
+    
+    def to_dict(self) -> dict:
+        return {
+            **self.header_dict(),
             "containers": [c.to_dict() for c in self.containers],
             "racks": [r.to_dict() for r in self.racks],
             "errors": self.errors,
-            "warnings": self.warnings
+            # Deprecated: the old free-text list, now capped at max_examples per code.
+            # Kept for one release so existing readers keep working; read "diagnostics".
+            "warnings": self.diagnostics.example_messages(),
+            "diagnostics": dict(self.diagnostics.counts)
         }
+    
+    def diagnostics_dict(self) -> dict:
+        """Contents of the bay's diagnostics file"""
+        return {"building": self.building, "bay": self.bay, **self.diagnostics.to_dict()}
+
+
+# ============================================================================
+# VALUE HELPERS
+# ============================================================================
+
+def is_missing(value: Any) -> bool:
+    """True for None, NaN and pandas' NA - stands in for pd.isna on scalars"""
+    if value is None:
+        return True
+    try:
+        return bool(value != value)
+    except TypeError:
+        # pandas.NA refuses to be coerced to bool
+        return True
+
+
+def to_float(value: Any) -> Optional[float]:
+    """Coerce a cell to float, None if blank/unparseable (like pd.to_numeric(errors='coerce'))"""
+    if is_missing(value):
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+    try:
+        result = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if result != result else result
+
+
+def rows_for_bay(rows: List[Row], bay: str) -> List[Row]:
+    """All rows belonging to a bay"""
+    return [r for r in rows if r.get('AREA (BAY)') == bay]
+
+
+def distinct_values(rows: List[Row], column: str) -> List[Any]:
+    """Non-missing values of a column in first-seen order (like Series.dropna().unique())"""
+    return list(dict.fromkeys(r.get(column) for r in rows if not is_missing(r.get(column))))
+
+
+def unique_bins(rows: List[Row]) -> List[Row]:
+    """First row per Storage Bin (like DataFrame.drop_duplicates('Storage Bin'))"""
+    seen = set()
+    unique = []
+    for r in rows:
+        bin_name = r.get('Storage Bin')
+        key = None if is_missing(bin_name) else bin_name
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(r)
+    return unique
 
 
 # ============================================================================
@@ -203,7 +298,7 @@ def parse_bin_name(bin_name: str) -> Optional[Dict]:
     
     Returns dict with: bay, row, section, level, slot, special
     """
-    if pd.isna(bin_name) or len(str(bin_name).strip()) < 6:
+    if is_missing(bin_name) or len(str(bin_name).strip()) < 6:
         return None
     
     bin_name = str(bin_name).strip().upper()
@@ -254,14 +349,56 @@ def parse_bin_name(bin_name: str) -> Optional[Dict]:
 # DATA LOADING & VALIDATION
 # ============================================================================
 
-def load_and_validate_excel(filepath: str, sheet_name: str = None) -> Tuple[pd.DataFrame, List[str]]:
-    """Load Excel and return dataframe with validation errors
+def select_sheet(available_sheets: List[str]) -> str:
+    """Auto-detect the data sheet of a workbook"""
+    # Look for sheets with 'bay' or 'bldg' in the name, or use first sheet with data
+    candidates = [s for s in available_sheets if 'bay' in s.lower() or 'bldg' in s.lower()]
+    if candidates:
+        # Prefer sheets with 'bay' in name
+        bay_sheets = [s for s in candidates if 'bay' in s.lower()]
+        return bay_sheets[0] if bay_sheets else candidates[0]
+    
+    # Skip obvious non-data sheets
+    skip_sheets = ['legend', 'stats', 'notes', 'info']
+    data_sheets = [s for s in available_sheets if s.lower().strip() not in skip_sheets]
+    return data_sheets[0] if data_sheets else available_sheets[0]
+
+
+def validate_columns(columns: List[str]) -> List[Diagnostic]:
+    """Check the header row; CRITICAL diagnostics stop processing"""
+    missing = [col for col in REQUIRED_COLUMNS if col not in columns]
+    if missing:
+        return [Diagnostic(MISSING_COLUMNS,
+                           f"Missing required columns: {missing}. Available columns: {list(columns)}")]
+    
+    # Check for position columns (warnings, not errors)
+    missing_pos = [col for col in POSITION_COLUMNS if col not in columns]
+    if missing_pos:
+        return [Diagnostic(MISSING_POSITION_COLUMNS, f"Missing position columns: {missing_pos}")]
+    
+    return []
+
+
+def sheet_not_found(sheet_name: str, available_sheets: List[str]) -> Diagnostic:
+    return Diagnostic(SHEET_NOT_FOUND, f"Sheet '{sheet_name}' not found. Available: {available_sheets}")
+
+
+def is_fatal(diagnostics: List[Diagnostic]) -> bool:
+    """True if any diagnostic means the input cannot be processed"""
+    return any(d.severity == CRITICAL for d in diagnostics)
+
+
+def load_and_validate_excel(filepath: str, sheet_name: str = None) -> Tuple[List[Row], List[Diagnostic]]:
+    """Load Excel and return rows with header diagnostics
+    
+    pandas is imported here rather than at module level so that CSV runs
+    and `--help` never pay for it.
     
     Args:
         filepath: Path to Excel file
         sheet_name: Specific sheet to load. If None, tries to auto-detect.
     """
-    errors = []
+    import pandas as pd
     
     # Get available sheets
     xl = pd.ExcelFile(filepath)
@@ -270,188 +407,270 @@ def load_and_validate_excel(filepath: str, sheet_name: str = None) -> Tuple[pd.D
     # Determine which sheet to use
     if sheet_name:
         if sheet_name not in available_sheets:
-            errors.append(f"CRITICAL: Sheet '{sheet_name}' not found. Available: {available_sheets}")
-            return pd.DataFrame(), errors
+            return [], [sheet_not_found(sheet_name, available_sheets)]
         target_sheet = sheet_name
     else:
-        # Auto-detect: look for sheets with 'bay' or 'bldg' in the name, or use first sheet with data
-        candidates = [s for s in available_sheets if 'bay' in s.lower() or 'bldg' in s.lower()]
-        if candidates:
-            # Prefer sheets with 'bay' in name
-            bay_sheets = [s for s in candidates if 'bay' in s.lower()]
-            target_sheet = bay_sheets[0] if bay_sheets else candidates[0]
-        else:
-            # Skip obvious non-data sheets
-            skip_sheets = ['legend', 'stats', 'notes', 'info']
-            data_sheets = [s for s in available_sheets if s.lower().strip() not in skip_sheets]
-            target_sheet = data_sheets[0] if data_sheets else available_sheets[0]
+        target_sheet = select_sheet(available_sheets)
     
     print(f"  Reading sheet: '{target_sheet}'")
     
-    df = pd.read_excel(filepath, sheet_name=target_sheet, header=0)
+    df = pd.read_excel(xl, sheet_name=target_sheet, header=0)
     df.columns = df.columns.str.strip()
     
-    # Required columns
-    required = ['Storage Bin', 'AREA (BAY)', 'BLDG']
-    position_cols = ['POS X (ft)', 'POS Y']
-    dimension_cols = ['Width (in)', 'Height (in)', 'Depth (in)']
+    diagnostics = validate_columns(list(df.columns))
+    if is_fatal(diagnostics):
+        return [], diagnostics
     
-    missing = [col for col in required if col not in df.columns]
-    if missing:
-        errors.append(f"CRITICAL: Missing required columns: {missing}")
-        errors.append(f"Available columns: {list(df.columns)}")
-        return df, errors
-    
-    # Check for position columns (warnings, not errors)
-    missing_pos = [col for col in position_cols if col not in df.columns]
-    if missing_pos:
-        errors.append(f"WARNING: Missing position columns: {missing_pos}")
+    # Report cells coercion is about to blank out, in row order
+    numeric = [col for col in POSITION_COLUMNS + DIMENSION_COLUMNS if col in df.columns]
+    for row in df[['AREA (BAY)', 'Storage Bin'] + numeric].to_dict('records'):
+        diagnostics.extend(non_numeric_diagnostics(row))
     
     # Convert numeric columns
-    for col in position_cols + dimension_cols:
+    for col in POSITION_COLUMNS + DIMENSION_COLUMNS:
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors='coerce')
     
-    return df, errors
+    return df.to_dict('records'), diagnostics
+
+
+class RowStream:
+    """
+    Row-at-a-time reader over a CSV or a workbook sheet.
+    
+    The header is read and validated on construction (see `diagnostics`); iterating
+    yields raw row dicts without holding the sheet in memory. Workbooks are
+    streamed with the stdlib-only xlsx_reader, so neither pandas nor openpyxl
+    is loaded.
+    
+    Usage:
+        with RowStream(path) as stream:
+            if not is_fatal(stream.diagnostics):
+                for row in stream: ...
+    """
+    
+    def __init__(self, filepath: str, sheet_name: str = None):
+        self.filepath = filepath
+        self.sheet = None
+        self._close = None
+        
+        if filepath.lower().endswith('.csv'):
+            f = open(filepath, newline='', encoding='utf-8-sig')
+            self._close = f.close
+            self._values = csv.reader(f)
+        else:
+            available_sheets = xlsx_reader.sheet_names(filepath)
+            if sheet_name and sheet_name not in available_sheets:
+                self.columns = []
+                self.diagnostics = [sheet_not_found(sheet_name, available_sheets)]
+                self._values = iter(())
+                return
+            self.sheet = sheet_name or select_sheet(available_sheets)
+            rows = xlsx_reader.iter_sheet_rows(filepath, self.sheet)
+            self._close = rows.close
+            self._values = rows
+        
+        header = next(self._values, None) or []
+        self.columns = [str(col).strip() if col is not None else '' for col in header]
+        self.diagnostics = validate_columns(self.columns)
+    
+    def __iter__(self):
+        for values in self._values:
+            row = {}
+            for col, value in zip(self.columns, values):
+                if isinstance(value, str):
+                    value = value.strip() or None
+                row[col] = value
+            yield row
+    
+    def close(self):
+        if self._close:
+            self._close()
+            self._close = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
 
+def coerce_numeric(row: Row) -> Row:
+    """Convert position/dimension cells in place (like pd.to_numeric(errors='coerce'))"""
+    for col in POSITION_COLUMNS + DIMENSION_COLUMNS:
+        if col in row:
+            row[col] = to_float(row[col])
+    return row
 
-def check_bay_data_completeness(df: pd.DataFrame, bay: str) -> Tuple[bool, List[str]]:
+
+# Strings pandas.read_excel reads as blank; treated the same on the stdlib paths
+NA_STRINGS = frozenset({
+    '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+})
+
+
+def non_numeric_diagnostics(row: Row) -> List[Diagnostic]:
+    """
+    Position/dimension cells that hold something other than a number.
+    
+    Coercion turns them into blanks, so without this they would silently
+    drop the bin (no position) or its height. Call on the raw row, before
+    coerce_numeric; rows without a bay are ignored like everywhere else.
+    """
+    bay = row.get('AREA (BAY)')
+    if is_missing(bay):
+        return []
+    bin_name = row.get('Storage Bin')
+    diagnostics = []
+    for col in POSITION_COLUMNS + DIMENSION_COLUMNS:
+        raw = row.get(col)
+        if isinstance(raw, str) and (not raw.strip() or raw.strip() in NA_STRINGS):
+            continue
+        if not is_missing(raw) and to_float(raw) is None:
+            diagnostics.append(Diagnostic(NON_NUMERIC_VALUE, f"Bin {bin_name}: non-numeric {col} value {raw!r}",
+                                          bay=bay, bin=bin_name))
+    return diagnostics
+
+
+def bay_diagnostics(load_diagnostics: List[Diagnostic], bay: str) -> List[Diagnostic]:
+    """Load diagnostics that concern a bay: file-level ones plus its own rows'"""
+    return [d for d in load_diagnostics if d.bay is None or d.bay == bay]
+
+
+def load_and_validate_csv(filepath: str) -> Tuple[List[Row], List[Diagnostic]]:
+    """Load a CSV export of the bay sheet using only the standard library"""
+    print(f"  Reading CSV: '{filepath}'")
+    
+    with RowStream(filepath) as stream:
+        if is_fatal(stream.diagnostics):
+            return [], stream.diagnostics
+        diagnostics = list(stream.diagnostics)
+        rows = []
+        for row in stream:
+            diagnostics.extend(non_numeric_diagnostics(row))
+            rows.append(coerce_numeric(row))
+    
+    return rows, diagnostics
+
+
+def load_and_validate(filepath: str, sheet_name: str = None) -> Tuple[List[Row], List[Diagnostic]]:
+    """Dispatch on file extension - CSV stays on the lightweight path"""
+    if filepath.lower().endswith('.csv'):
+        return load_and_validate_csv(filepath)
+    return load_and_validate_excel(filepath, sheet_name)
+
+
+def check_bay_data_completeness(rows: List[Row], bay: str) -> Tuple[bool, List[Diagnostic]]:
     """Check if a bay has complete position data"""
-    errors = []
-    bay_df = df[df['AREA (BAY)'] == bay]
+    bay_rows = rows_for_bay(rows, bay)
     
-    if len(bay_df) == 0:
-        errors.append(f"No data found for bay {bay}")
-        return False, errors
+    if len(bay_rows) == 0:
+        return False, [Diagnostic(NO_BAY_DATA, f"No data found for bay {bay}", bay=bay)]
     
     # Check position data
-    unique_bins = bay_df.drop_duplicates('Storage Bin')
-    missing_x = unique_bins['POS X (ft)'].isna().sum()
-    missing_y = unique_bins['POS Y'].isna().sum()
-    total = len(unique_bins)
+    bins = unique_bins(bay_rows)
+    missing_x = sum(1 for r in bins if is_missing(r.get('POS X (ft)')))
+    missing_y = sum(1 for r in bins if is_missing(r.get('POS Y')))
     
+    return completeness_diagnostics(bay, len(bins), missing_x, missing_y)
+
+
+def completeness_diagnostics(bay: str, total: int, missing_x: int, missing_y: int) -> Tuple[bool, List[Diagnostic]]:
+    """Turn per-bay position counts into (is_complete, diagnostics)"""
     if missing_x == total or missing_y == total:
-        errors.append(f"Bay {bay}: MISSING POSITION DATA - {total} containers have no X/Y coordinates")
-        return False, errors
+        return False, [Diagnostic(
+            BAY_MISSING_POSITIONS,
+            f"Bay {bay}: MISSING POSITION DATA - {total} containers have no X/Y coordinates", bay=bay)]
     
+    diagnostics = []
     if missing_x > 0:
-        errors.append(f"Bay {bay}: {missing_x}/{total} containers missing X coordinate")
+        diagnostics.append(Diagnostic(
+            PARTIAL_MISSING_X, f"Bay {bay}: {missing_x}/{total} containers missing X coordinate", bay=bay))
     if missing_y > 0:
-        errors.append(f"Bay {bay}: {missing_y}/{total} containers missing Y coordinate")
+        diagnostics.append(Diagnostic(
+            PARTIAL_MISSING_Y, f"Bay {bay}: {missing_y}/{total} containers missing Y coordinate", bay=bay))
     
-    return True, errors
+    return True, diagnostics
 
 
 # ============================================================================
 # HEIGHT/LEVEL CALCULATION & VALIDATION
 # ============================================================================
 
-def validate_shelf_heights(df: pd.DataFrame, bay: str, config: Config) -> Tuple[Dict[str, Dict[int, float]], List[str], List[str]]:
-    """
-    Validate shelf heights within sections and calculate Y positions.
-    
-    Rules:
-    - All containers at the SAME LEVEL within a ROW should have the same height
-    - Flag non-conforming heights as warnings (likely data entry errors)
-    
-    Returns: 
-    - Dict[f"{row}_{section}", Dict[level, y_position_feet]]
-    - List of warning messages (non-conforming heights - potential errors)
-    - List of info messages (structural notes like missing levels)
-    """
-    warnings = []  # Potential data errors
-    info = []      # Structural notes (not necessarily errors)
-    height_map = defaultdict(dict)
-    
-    bay_df = df[df['AREA (BAY)'] == bay].copy()
-    
-    # Parse bin names
-    bay_df['parsed'] = bay_df['Storage Bin'].apply(parse_bin_name)
-    valid = bay_df[bay_df['parsed'].apply(lambda x: x is not None and x.get('level') is not None)]
-    
-    if len(valid) == 0:
-        return dict(height_map), warnings, info
-    
-    # =========================================================================
-    # VALIDATION: Check height consistency within each ROW at each LEVEL
-    # =========================================================================
-    row_level_heights = defaultdict(lambda: defaultdict(list))
-    
-    for _, r in valid.iterrows():
-        p = r['parsed']
-        row = p['row']
-        level = p['level']
-        height = r['Height (in)'] if pd.notna(r.get('Height (in)')) else None
-        
-        if height is not None:
-            row_level_heights[row][level].append({
-                'height': height,
-                'section': p['section'],
-                'bin': r['Storage Bin']
-            })
-    
-    # Track height statistics for summary
-    height_issues_count = 0
+LevelHeights = Dict[str, Dict[int, Dict[float, List[str]]]]
+
+
+def new_level_heights() -> LevelHeights:
+    """Empty row -> level -> {height_in: [sections]} accumulator (insertion ordered)"""
+    return defaultdict(lambda: defaultdict(dict))
+
+
+def add_level_height(level_heights: LevelHeights, parsed: Dict, height: float):
+    """Record one bin's shelf height under its row/level"""
+    level_heights[parsed['row']][parsed['level']].setdefault(height, []).append(parsed['section'])
+
+
+def format_inches(value: float) -> str:
+    """56 and 56.0 both print as 56\" whichever way the cell was coerced; 56.5 stays 56.5\"."""
+    return f"{float(value):g}\""
+
+
+def height_mismatch_diagnostics(level_heights: LevelHeights, bay: str = None) -> List[Diagnostic]:
+    """One HEIGHT_MISMATCH per row/level whose sections disagree on shelf height"""
+    diagnostics = []
     
     # Check for non-conforming heights within each row/level
-    for row, levels in row_level_heights.items():
-        for level, height_data in levels.items():
-            heights = [h['height'] for h in height_data]
-            unique_heights = set(heights)
+    for row, levels in level_heights.items():
+        for level, height_counts in levels.items():
+            if len(height_counts) <= 1:
+                continue
             
-            if len(unique_heights) > 1:
-                height_issues_count += 1
-                
-                # Non-conforming heights detected
-                height_counts = defaultdict(list)
-                for h in height_data:
-                    height_counts[h['height']].append(h['section'])
-                
-                # Find the most common height (assumed correct)
-                most_common_height = max(height_counts.keys(), key=lambda x: len(height_counts[x]))
-                most_common_count = len(height_counts[most_common_height])
-                
-                # Report outliers (sections that differ from most common)
-                outliers = []
-                for height, sections in height_counts.items():
-                    if height != most_common_height:
-                        outliers.append(f"{height}\" in section(s) {','.join(sorted(sections))}")
-                
-                warnings.append(
-                    f"Row {row}, Level {level}: Height mismatch - "
-                    f"expected {most_common_height}\" ({most_common_count} sections) "
-                    f"but found: {'; '.join(outliers)}"
-                )
-    
-    # Add summary if there are height issues
-    if height_issues_count > 0:
-        info.insert(0, f"SUMMARY: {height_issues_count} row/level combinations have inconsistent shelf heights")
-    
-    # =========================================================================
-    # Calculate cumulative heights using most common height per row/level
-    # =========================================================================
-    
-    # Determine the "canonical" height for each row/level (most common)
-    canonical_heights = {}  # (row, level) -> height in feet
+            # Find the most common height (assumed correct)
+            most_common_height = max(height_counts.keys(), key=lambda x: len(height_counts[x]))
+            most_common_count = len(height_counts[most_common_height])
+            
+            # Report outliers (sections that differ from most common)
+            outliers = []
+            for height, sections in height_counts.items():
+                if height != most_common_height:
+                    outliers.append(f"{format_inches(height)} in section(s) {','.join(sorted(sections))}")
+            
+            diagnostics.append(Diagnostic(
+                HEIGHT_MISMATCH,
+                f"Row {row}, Level {level}: Height mismatch - "
+                f"expected {format_inches(most_common_height)} ({most_common_count} sections) "
+                f"but found: {'; '.join(outliers)}",
+                bay=bay
+            ))
+    
+    return diagnostics
+
+
+def canonical_level_heights(level_heights: LevelHeights, config: Config) -> Dict[Tuple[str, int], float]:
+    """The "canonical" height for each row/level (most common), in feet"""
+    canonical_heights = {}
     
-    for row, levels in row_level_heights.items():
-        for level, height_data in levels.items():
-            heights = [h['height'] for h in height_data]
+    for row, levels in level_heights.items():
+        for level, height_counts in levels.items():
             # Use most common height (mode)
-            most_common = max(set(heights), key=heights.count)
+            most_common = max(set(height_counts), key=lambda h: len(height_counts[h]))
             canonical_heights[(row, level)] = most_common * config.inches_to_feet
     
-    # Now calculate Y positions per section
-    groups = valid.groupby([
-        valid['parsed'].apply(lambda x: x['row']),
-        valid['parsed'].apply(lambda x: x['section'])
-    ])
+    return canonical_heights
+
+
+def section_y_positions(section_levels: Dict[Tuple[str, str], set],
+                        canonical_heights: Dict[Tuple[str, int], float],
+                        config: Config) -> Dict[str, Dict[int, float]]:
+    """Cumulative Y of each level present in each row/section"""
+    height_map = defaultdict(dict)
     
-    for (row, section), group in groups:
+    for (row, section), levels in sorted(section_levels.items()):
         key = f"{row}_{section}"
         
         # Get levels present in this section
-        levels_present = sorted(set(group['parsed'].apply(lambda x: x['level'])))
+        levels_present = sorted(levels)
         
         # Calculate cumulative Y positions
         cumulative_y = config.level_1_floor_offset_ft
@@ -467,10 +686,41 @@ def validate_shelf_heights(df: pd.DataFrame, bay: str, config: Config) -> Tuple[
             )
             cumulative_y += level_height + config.shelf_thickness_ft
     
-    return dict(height_map), warnings, info
+    return dict(height_map)
 
 
-def calculate_level_y_positions(df: pd.DataFrame, bay: str, config: Config) -> Dict[str, Dict[int, float]]:
+def validate_shelf_heights(rows: List[Row], bay: str, config: Config) -> Tuple[Dict[str, Dict[int, float]], List[Diagnostic]]:
+    """
+    Validate shelf heights within sections and calculate Y positions.
+    
+    Rules:
+    - All containers at the SAME LEVEL within a ROW should have the same height
+    - Flag non-conforming heights as warnings (likely data entry errors)
+    
+    Returns: 
+    - Dict[f"{row}_{section}", Dict[level, y_position_feet]]
+    - HEIGHT_MISMATCH diagnostics (non-conforming heights - potential errors)
+    """
+    level_heights = new_level_heights()
+    section_levels = defaultdict(set)
+    
+    for r in rows_for_bay(rows, bay):
+        p = parse_bin_name(r.get('Storage Bin'))
+        if p is None or p.get('level') is None:
+            continue
+        
+        section_levels[(p['row'], p['section'])].add(p['level'])
+        if not is_missing(r.get('Height (in)')):
+            add_level_height(level_heights, p, r['Height (in)'])
+    
+    # Calculate cumulative heights using most common height per row/level
+    canonical_heights = canonical_level_heights(level_heights, config)
+    height_map = section_y_positions(section_levels, canonical_heights, config)
+    
+    return height_map, height_mismatch_diagnostics(level_heights, bay)
+
+
+def calculate_level_y_positions(rows: List[Row], bay: str, config: Config) -> Dict[str, Dict[int, float]]:
     """
     Calculate Y position for each level within each rack section.
     
@@ -478,7 +728,7 @@ def calculate_level_y_positions(df: pd.DataFrame, bay: str, config: Config) -> D
     
     Returns: Dict[f"{row}_{section}", Dict[level, y_position_meters]]
     """
-    height_map, _, _ = validate_shelf_heights(df, bay, config)
+    height_map, _ = validate_shelf_heights(rows, bay, config)
     return height_map
 
 
@@ -486,164 +736,201 @@ def calculate_level_y_positions(df: pd.DataFrame, bay: str, config: Config) -> D
 # CONTAINER GENERATION
 # ============================================================================
 
-def generate_containers(df: pd.DataFrame, bay: str, config: Config) -> Tuple[List[Container], List[str]]:
-    """Generate Container objects for a bay"""
-    warnings = []
-    containers = []
+# Slot position map (A=0, B=1, etc.) - slots go LEFT TO RIGHT along X axis
+SLOT_MAP = {chr(65+i): i for i in range(8)}  # A=0, B=1, ... H=7
+SLOT_MAP['-'] = 0
+SLOT_MAP[None] = 0
+
+
+def skipped_bin_diagnostic(row: Row, parsed: Optional[Dict]) -> Optional[Diagnostic]:
+    """Why a bin produces no container (unparseable or special), or None"""
+    bin_name = row.get('Storage Bin')
+    if parsed is None:
+        return Diagnostic(UNPARSEABLE_BIN, f"Could not parse bin name: {bin_name}",
+                          bay=row.get('AREA (BAY)'), bin=bin_name)
+    if parsed.get('special'):
+        return Diagnostic(SPECIAL_BIN, f"Skipping special bin: {bin_name} ({parsed['special']})",
+                          bay=row.get('AREA (BAY)'), bin=bin_name)
+    return None
+
+
+def build_container(row: Row, height_map: Dict[str, Dict[int, float]],
+                    config: Config) -> Tuple[Optional[Container], Optional[Diagnostic]]:
+    """
+    Geometry for one (first-occurrence) bin row.
     
-    # Calculate level heights (validation warnings captured separately in process_bay)
-    height_map, _, _ = validate_shelf_heights(df, bay, config)
+    Returns (container, None), (None, diagnostic) for unparseable/special bins,
+    or (None, None) when the row has no position data.
+    """
+    parsed = parse_bin_name(row['Storage Bin'])
+    
+    skipped = skipped_bin_diagnostic(row, parsed)
+    if skipped:
+        return None, skipped
+    
+    # Skip if missing position data
+    if is_missing(row.get('POS X (ft)')) or is_missing(row.get('POS Y')):
+        return None, None
+    
+    rack_row = parsed['row']
+    section = parsed['section']
+    level = parsed['level']
+    slot = parsed['slot']
+    
+    # Get dimensions (with defaults) - convert inches to feet
+    width_in = row['Width (in)'] if not is_missing(row.get('Width (in)')) else config.default_width_inches
+    height_in = row['Height (in)'] if not is_missing(row.get('Height (in)')) else config.default_height_inches
+    depth_in = row['Depth (in)'] if not is_missing(row.get('Depth (in)')) else config.default_depth_inches
+    
+    width_ft = width_in * config.inches_to_feet
+    height_ft = height_in * config.inches_to_feet
+    depth_ft = depth_in * config.inches_to_feet
+    
+    # Calculate X position (already in feet from Excel)
+    base_x = row['POS X (ft)'] * config.feet_to_units  # 1.0, no conversion
+    
+    # If there's a slot subdivision, offset along X (left to right)
+    if slot and slot in SLOT_MAP:
+        # Calculate slot width as fraction of total width
+        slot_width = width_ft / config.max_slots_per_section
+        slot_offset = SLOT_MAP[slot] * slot_width
+        x = base_x + slot_offset
+        # Adjust width to be per-slot
+        width_ft = slot_width
+    else:
+        x = base_x
     
-    # Get unique bins for this bay
-    bay_df = df[df['AREA (BAY)'] == bay].drop_duplicates('Storage Bin')
+    # Calculate Y position (height) from level
+    height_key = f"{rack_row}_{section}"
+    if height_key in height_map and level in height_map[height_key]:
+        y = height_map[height_key][level]
+    else:
+        # Fallback: assume standard spacing
+        y = config.level_1_floor_offset_ft + (level - 1) * (config.default_height_inches * config.inches_to_feet + config.shelf_thickness_ft)
+    
+    # Calculate Z position (depth - from POS Y, already in feet)
+    z = row['POS Y'] * config.feet_to_units  # 1.0, no conversion
+    
+    container = Container(
+        id=row['Storage Bin'],
+        row=rack_row,
+        section=section,
+        level=level,
+        slot=slot,
+        position={'x': x, 'y': y, 'z': z},
+        dimensions={'x': width_ft, 'y': height_ft, 'z': depth_ft},
+        raw_x_ft=row['POS X (ft)'],
+        raw_y_ft=row['POS Y']
+    )
+    return container, None
+
+
+def generate_containers(rows: List[Row], bay: str, config: Config,
+                        log: DiagnosticLog = None) -> List[Container]:
+    """Generate Container objects for a bay, recording skipped bins in log"""
+    containers = []
     
-    # Slot position map (A=0, B=1, etc.) - slots go LEFT TO RIGHT along X axis
-    slot_map = {chr(65+i): i for i in range(8)}  # A=0, B=1, ... H=7
-    slot_map['-'] = 0
-    slot_map[None] = 0
+    # Calculate level heights (validation diagnostics captured separately in process_bay)
+    height_map, _ = validate_shelf_heights(rows, bay, config)
     
-    for _, row in bay_df.iterrows():
-        parsed = parse_bin_name(row['Storage Bin'])
-        
-        if parsed is None:
-            warnings.append(f"Could not parse bin name: {row['Storage Bin']}")
-            continue
-        
-        if parsed.get('special'):
-            warnings.append(f"Skipping special bin: {row['Storage Bin']} ({parsed['special']})")
-            continue
-        
-        # Skip if missing position data
-        if pd.isna(row.get('POS X (ft)')) or pd.isna(row.get('POS Y')):
-            continue
-        
-        rack_row = parsed['row']
-        section = parsed['section']
-        level = parsed['level']
-        slot = parsed['slot']
-        
-        # Get dimensions (with defaults) - convert inches to feet
-        width_in = row['Width (in)'] if pd.notna(row.get('Width (in)')) else config.default_width_inches
-        height_in = row['Height (in)'] if pd.notna(row.get('Height (in)')) else config.default_height_inches
-        depth_in = row['Depth (in)'] if pd.notna(row.get('Depth (in)')) else config.default_depth_inches
-        
-        width_ft = width_in * config.inches_to_feet
-        height_ft = height_in * config.inches_to_feet
-        depth_ft = depth_in * config.inches_to_feet
-        
-        # Calculate X position (already in feet from Excel)
-        base_x = row['POS X (ft)'] * config.feet_to_units  # 1.0, no conversion
-        
-        # If there's a slot subdivision, offset along X (left to right)
-        if slot and slot in slot_map:
-            # Calculate slot width as fraction of total width
-            slot_width = width_ft / config.max_slots_per_section
-            slot_offset = slot_map[slot] * slot_width
-            x = base_x + slot_offset
-            # Adjust width to be per-slot
-            width_ft = slot_width
-        else:
-            x = base_x
-        
-        # Calculate Y position (height) from level
-        height_key = f"{rack_row}_{section}"
-        if height_key in height_map and level in height_map[height_key]:
-            y = height_map[height_key][level]
-        else:
-            # Fallback: assume standard spacing
-            y = config.level_1_floor_offset_ft + (level - 1) * (config.default_height_inches * config.inches_to_feet + config.shelf_thickness_ft)
-        
-        # Calculate Z position (depth - from POS Y, already in feet)
-        z = row['POS Y'] * config.feet_to_units  # 1.0, no conversion
-        
-        container = Container(
-            id=row['Storage Bin'],
-            row=rack_row,
-            section=section,
-            level=level,
-            slot=slot,
-            position={'x': x, 'y': y, 'z': z},
-            dimensions={'x': width_ft, 'y': height_ft, 'z': depth_ft},
-            raw_x_ft=row['POS X (ft)'],
-            raw_y_ft=row['POS Y']
-        )
-        containers.append(container)
-    
-    return containers, warnings
+    # Get unique bins for this bay
+    for row in unique_bins(rows_for_bay(rows, bay)):
+        container, diagnostic = build_container(row, height_map, config)
+        if diagnostic and log is not None:
+            log.add(diagnostic)
+        if container:
+            containers.append(container)
+    
+    return containers
 
 
 # ============================================================================
 # RACK GENERATION
 # ============================================================================
 
-def generate_racks(containers: List[Container]) -> List[Rack]:
-    """Generate Rack bounding boxes from containers"""
+@dataclass
+class RackBounds:
+    """Running bounding box of one rack row"""
+    min_x: float
+    max_x: float
+    min_y: float
+    max_y: float
+    min_z: float
+    max_z: float
+    sections: set = field(default_factory=set)
+    max_level: int = 0
+    count: int = 0
+
+
+class RackAccumulator:
+    """Builds racks incrementally, so callers don't have to keep every container"""
     
-    # Group by row
-    rack_groups = defaultdict(list)
-    for c in containers:
-        rack_groups[c.row].append(c)
+    def __init__(self):
+        self._bounds: Dict[str, RackBounds] = {}
     
-    racks = []
-    for row, row_containers in rack_groups.items():
-        if not row_containers:
-            continue
+    def add(self, c: Container):
+        x, y, z = c.position['x'], c.position['y'], c.position['z']
+        x_end, y_end, z_end = x + c.dimensions['x'], y + c.dimensions['y'], z + c.dimensions['z']
         
-        # Calculate bounding box
-        min_x = min(c.position['x'] for c in row_containers)
-        max_x = max(c.position['x'] + c.dimensions['x'] for c in row_containers)
-        min_y = min(c.position['y'] for c in row_containers)
-        max_y = max(c.position['y'] + c.dimensions['y'] for c in row_containers)
-        min_z = min(c.position['z'] for c in row_containers)
-        max_z = max(c.position['z'] + c.dimensions['z'] for c in row_containers)
-        
-        sections = sorted(set(c.section for c in row_containers))
-        max_level = max(c.level for c in row_containers)
-        
-        rack = Rack(
-            id=f"R{row}",
-            row=row,
-            sections=sections,
-            max_level=max_level,
-            container_count=len(row_containers),
-            bounds_min={'x': min_x, 'y': min_y, 'z': min_z},
-            bounds_max={'x': max_x, 'y': max_y, 'z': max_z}
-        )
-        racks.append(rack)
-    
-    return racks
+        b = self._bounds.get(c.row)
+        if b is None:
+            b = self._bounds[c.row] = RackBounds(x, x_end, y, y_end, z, z_end)
+        else:
+            b.min_x, b.max_x = min(b.min_x, x), max(b.max_x, x_end)
+            b.min_y, b.max_y = min(b.min_y, y), max(b.max_y, y_end)
+            b.min_z, b.max_z = min(b.min_z, z), max(b.max_z, z_end)
+        b.sections.add(c.section)
+        b.max_level = max(b.max_level, c.level)
+        b.count += 1
+    
+    def racks(self) -> List[Rack]:
+        return [
+            Rack(
+                id=f"R{row}",
+                row=row,
+                sections=sorted(b.sections),
+                max_level=b.max_level,
+                container_count=b.count,
+                bounds_min={'x': b.min_x, 'y': b.min_y, 'z': b.min_z},
+                bounds_max={'x': b.max_x, 'y': b.max_y, 'z': b.max_z}
+            )
+            for row, b in self._bounds.items()
+        ]
+
+
+def generate_racks(containers: List[Container]) -> List[Rack]:
+    """Generate Rack bounding boxes from containers"""
+    accumulator = RackAccumulator()
+    for c in containers:
+        accumulator.add(c)
+    return accumulator.racks()
 
 
 # ============================================================================
 # MAIN PROCESSING
 # ============================================================================
 
-def process_bay(df: pd.DataFrame, building: str, bay: str, config: Config) -> BayData:
+def process_bay(rows: List[Row], building: str, bay: str, config: Config,
+                max_examples: int = 20) -> BayData:
     """Process all data for a single bay"""
     
-    bay_data = BayData(building=building, bay=bay)
+    bay_data = BayData(building=building, bay=bay, diagnostics=DiagnosticLog(max_examples))
     
     # Check data completeness
-    is_complete, completeness_errors = check_bay_data_completeness(df, bay)
+    is_complete, completeness = check_bay_data_completeness(rows, bay)
+    bay_data.diagnostics.extend(completeness)  # Partial data warnings
     
     if not is_complete:
-        bay_data.errors.extend(completeness_errors)
+        bay_data.errors.extend(d.message for d in completeness)
         return bay_data
     
-    bay_data.warnings.extend(completeness_errors)  # Partial data warnings
-    
-    # Validate shelf heights and get warnings/info
-    _, height_warnings, height_info = validate_shelf_heights(df, bay, config)
-    
-    # Add info messages first (like summary)
-    bay_data.warnings.extend(height_info)
-    # Add specific warnings
-    bay_data.warnings.extend(height_warnings)
+    # Validate shelf heights
+    _, height_diagnostics = validate_shelf_heights(rows, bay, config)
+    bay_data.diagnostics.extend(height_diagnostics)
     
     # Generate containers
-    containers, gen_warnings = generate_containers(df, bay, config)
+    containers = generate_containers(rows, bay, config, bay_data.diagnostics)
     bay_data.containers = containers
-    bay_data.warnings.extend(gen_warnings)
     
     # Generate racks
     bay_data.racks = generate_racks(containers)
@@ -651,43 +938,63 @@ def process_bay(df: pd.DataFrame, building: str, bay: str, config: Config) -> Ba
     return bay_data
 
 
-def process_excel(filepath: str, config: Config, sheet_name: str = None) -> Dict[str, Dict[str, BayData]]:
+def process_excel(filepath: str, config: Config, sheet_name: str = None,
+                  max_examples: int = 20) -> Dict[str, Dict[str, BayData]]:
     """
-    Process Excel file and return data organized by building -> bay
+    Process an Excel (or CSV) file and return data organized by building -> bay
     
     Returns: Dict[building_key, Dict[bay, BayData]]
     """
     results = defaultdict(dict)
     
     # Load and validate
-    df, load_errors = load_and_validate_excel(filepath, sheet_name)
+    rows, load_diagnostics = load_and_validate(filepath, sheet_name)
     
-    if any("CRITICAL" in e for e in load_errors):
+    if is_fatal(load_diagnostics):
         # Return error structure
-        error_data = BayData(building="UNKNOWN", bay="UNKNOWN")
-        error_data.errors = load_errors
-        results["UNKNOWN"]["UNKNOWN"] = error_data
+        results["UNKNOWN"]["UNKNOWN"] = load_error_bay(load_diagnostics)
         return dict(results)
     
     # Get unique buildings and bays
-    buildings = df['BLDG'].dropna().unique()
-    bays = df['AREA (BAY)'].dropna().unique()
+    buildings = distinct_values(rows, 'BLDG')
+    bays = distinct_values(rows, 'AREA (BAY)')
+    present = {(r.get('BLDG'), r.get('AREA (BAY)')) for r in rows}
     
     for building in buildings:
         building_key = building.replace(' ', '').lower()  # "BLDG 22" -> "bldg22"
         
         for bay in bays:
-            bay_df = df[(df['BLDG'] == building) & (df['AREA (BAY)'] == bay)]
-            
-            if len(bay_df) > 0:
-                bay_data = process_bay(df, building, bay, config)
+            if (building, bay) in present:
+                bay_data = process_bay(rows, building, bay, config, max_examples)
+                bay_data.diagnostics.extend(bay_diagnostics(load_diagnostics, bay))
                 results[building_key][bay] = bay_data
     
     return dict(results)
 
 
-def save_results(results: Dict[str, Dict[str, BayData]], output_dir: str):
-    """Save results as one JSON file per bay"""
+def load_error_bay(diagnostics: List[Diagnostic]) -> BayData:
+    """Placeholder bay reporting why the input could not be read"""
+    error_data = BayData(building="UNKNOWN", bay="UNKNOWN")
+    error_data.errors = [f"{d.severity.upper()}: {d.message}" for d in diagnostics]
+    error_data.diagnostics.extend(diagnostics)
+    return error_data
+
+
+def diagnostics_filename(building_key: str, bay: str) -> str:
+    return f"{building_key}_bay{bay}_diagnostics.json"
+
+
+def save_diagnostics(bay_data: BayData, output_dir: str, building_key: str) -> str:
+    """Write the bay's diagnostics file; returns its filename"""
+    filename = diagnostics_filename(building_key, bay_data.bay)
+    with open(os.path.join(output_dir, filename), 'w') as f:
+        json.dump(bay_data.diagnostics_dict(), f, indent=2)
+    return filename
+
+
+def save_results(results: Dict[str, Dict[str, BayData]], output_dir: str,
+                 instances: bool = False, shards: bool = False):
+    """Save results as one JSON file per bay, plus its diagnostics file (and instancing batches / rack shards)"""
     
     os.makedirs(output_dir, exist_ok=True)
     
@@ -696,35 +1003,395 @@ def save_results(results: Dict[str, Dict[str, BayData]], output_dir: str):
             filename = f"{building_key}_bay{bay}_containers.json"
             filepath = os.path.join(output_dir, filename)
             
+            bay_dict = bay_data.to_dict()
             with open(filepath, 'w') as f:
-                json.dump(bay_data.to_dict(), f, indent=2)
+                json.dump(bay_dict, f, indent=2)
+            
+            if instances:
+                batcher = InstanceBatcher()
+                for container in bay_dict['containers']:
+                    batcher.add(container)
+                save_instances(batcher.to_dict(bay_data.building, bay),
+                               os.path.join(output_dir, instances_filename(building_key, bay)))
             
-            # Print summary
-            status = "✓" if not bay_data.errors else "✗"
-            print(f"{status} {filename}: {len(bay_data.containers)} containers, {len(bay_data.racks)} racks")
+            if shards:
+                sharder = RackSharder()
+                for container in bay_dict['containers']:
+                    sharder.add(container)
+                sharder.write(os.path.join(output_dir, shards_dirname(building_key, bay)),
+                              bay_data.building, bay, bay_dict['racks'])
             
-            if bay_data.errors:
-                for err in bay_data.errors:
-                    print(f"    ERROR: {err}")
+            diag_file = save_diagnostics(bay_data, output_dir, building_key)
+            print_bay_summary(filename, len(bay_data.containers), len(bay_data.racks),
+                              bay_data.errors, bay_data.diagnostics, diag_file)
+
+
+def print_bay_summary(filename: str, container_count: int, rack_count: int,
+                      errors: List[str], log: DiagnosticLog, diag_file: str):
+    """Console summary for one written bay file - O(codes), not O(diagnostics)"""
+    status = "✓" if not errors else "✗"
+    print(f"{status} {filename}: {container_count} containers, {rack_count} racks")
+    
+    if errors:
+        for err in errors:
+            print(f"    ERROR: {err}")
+        return
+    
+    height_count = log.count(code=HEIGHT_MISMATCH)
+    if height_count:
+        print(f"    SUMMARY: {height_count} row/level combinations have inconsistent shelf heights")
+        if height_count <= 3:
+            for m in log.messages(HEIGHT_MISMATCH):
+                print(f"      - {m}")
+    
+    other = {name: n for name, n in log.counts.items() if name != HEIGHT_MISMATCH.name}
+    other_total = sum(other.values())
+    if not other_total:
+        return
+    
+    if other_total <= 5:
+        for name in other:
+            for d in log.examples[name]:
+                print(f"    {d.severity.upper()}: {d.message}")
+    else:
+        by_code = ', '.join(f"{name} x{n}" for name, n in other.items())
+        print(f"    ({other_total} other diagnostics: {by_code} - see {diag_file})")
+
+
+# ============================================================================
+# VALIDATE-ONLY (CHECK) MODE
+# ============================================================================
+
+# Exit codes for --check
+EXIT_OK = 0         # no errors (warnings allowed)
+EXIT_ERRORS = 1     # data errors found (or stopped early at --max-errors)
+EXIT_CRITICAL = 2   # input unreadable: missing/corrupt file, missing sheet/columns
+
+# Opening or reading the input (CSV or workbook) can fail with these
+INPUT_ERRORS = xlsx_reader.READ_ERRORS + (UnicodeDecodeError, csv.Error)
+
+
+@dataclass
+class BayScanState:
+    """
+    Running per-bay state from one pass over the rows - no geometry is kept.
+    
+    Holds what the height model and completeness check need (shelf heights
+    per row/level, levels per section, position counts over unique bins) plus
+    the set of bins seen, used for first-occurrence de-duplication.
+    """
+    rows: int = 0
+    bins: set = field(default_factory=set)
+    missing_x: int = 0
+    missing_y: int = 0
+    level_heights: LevelHeights = field(default_factory=new_level_heights)
+    section_levels: Dict[Tuple[str, str], set] = field(default_factory=lambda: defaultdict(set))
+    
+    def add(self, row: Row, parsed: Optional[Dict]) -> bool:
+        """Fold in one numeric-coerced row; True if it is its bin's first occurrence"""
+        self.rows += 1
+        
+        if parsed is not None and parsed.get('level') is not None:
+            self.section_levels[(parsed['row'], parsed['section'])].add(parsed['level'])
+            if not is_missing(row.get('Height (in)')):
+                add_level_height(self.level_heights, parsed, row['Height (in)'])
+        
+        bin_name = row.get('Storage Bin')
+        key = None if is_missing(bin_name) else bin_name
+        if key in self.bins:
+            return False
+        
+        self.bins.add(key)
+        if is_missing(row.get('POS X (ft)')):
+            self.missing_x += 1
+        if is_missing(row.get('POS Y')):
+            self.missing_y += 1
+        return True
+    
+    def completeness(self, bay: str) -> Tuple[bool, List[Diagnostic]]:
+        """Same result as check_bay_data_completeness on the full rows"""
+        return completeness_diagnostics(bay, len(self.bins), self.missing_x, self.missing_y)
+    
+    def height_model(self, bay: str, config: Config) -> Tuple[Dict[str, Dict[int, float]], List[Diagnostic]]:
+        """Same result as validate_shelf_heights on the full rows"""
+        canonical_heights = canonical_level_heights(self.level_heights, config)
+        height_map = section_y_positions(self.section_levels, canonical_heights, config)
+        return height_map, height_mismatch_diagnostics(self.level_heights, bay)
+
+
+def check_file(filepath: str, sheet_name: str = None, max_errors: int = 0,
+               max_examples: int = 20) -> dict:
+    """
+    Stream rows through bin parsing, completeness and height checks.
+    
+    Nothing is generated or written. Per-row problems are recorded as they are
+    read, so with max_errors > 0 the scan stops as soon as that many errors
+    have been found (bay-level checks are then skipped and the report is
+    marked truncated). Bay-level checks run once the stream is exhausted.
+    
+    Returns a JSON-serializable report; "diagnostics" is a DiagnosticLog dict
+    (counts per code plus up to max_examples records each).
+    """
+    report = {
+        "input": filepath,
+        "sheet": None,
+        "rows": 0,
+        "bays": {},
+        "errors": 0,
+        "warnings": 0,
+        "truncated": False,
+    }
+    log = DiagnosticLog(max_examples)
+    error_count = 0
+    
+    def emit(diagnostic: Diagnostic):
+        nonlocal error_count
+        log.add(diagnostic)
+        if diagnostic.severity == ERROR:
+            error_count += 1
+    
+    states = defaultdict(BayScanState)
+    
+    try:
+        with RowStream(filepath, sheet_name) as stream:
+            report["sheet"] = stream.sheet
+            log.extend(stream.diagnostics)
+            if is_fatal(stream.diagnostics):
+                return finish_check_report(report, log)
             
-            if bay_data.warnings:
-                # Check for summary message
-                summary = [w for w in bay_data.warnings if w.startswith("SUMMARY:")]
-                height_warnings = [w for w in bay_data.warnings if "Height mismatch" in w]
-                other_warnings = [w for w in bay_data.warnings if w not in summary and w not in height_warnings]
+            for row in stream:
+                report["rows"] += 1
+                bay = row.get('AREA (BAY)')
+                if is_missing(bay):
+                    continue
+                
+                # Values that are present but not numbers would be silently dropped
+                for diagnostic in non_numeric_diagnostics(row):
+                    emit(diagnostic)
                 
-                if summary:
-                    print(f"    {summary[0]}")
-                    if len(height_warnings) <= 3:
-                        for w in height_warnings:
-                            print(f"      - {w}")
+                parsed = parse_bin_name(row.get('Storage Bin'))
                 
-                if other_warnings:
-                    if len(other_warnings) <= 5:
-                        for w in other_warnings:
-                            print(f"    WARNING: {w}")
-                    else:
-                        print(f"    ({len(other_warnings)} other warnings - see JSON for details)")
+                # Per-bin checks only on the first occurrence (like drop_duplicates)
+                if states[bay].add(coerce_numeric(row), parsed):
+                    skipped = skipped_bin_diagnostic(row, parsed)
+                    if skipped:
+                        emit(skipped)
+                
+                if max_errors and error_count >= max_errors:
+                    report["truncated"] = True
+                    break
+
+    except INPUT_ERRORS as e:
+        # Reported as CRITICAL (exit 2), not a traceback that reads as data errors (exit 1)
+        log.add(Diagnostic(INPUT_UNREADABLE, f"Cannot read {filepath}: {type(e).__name__}: {e}"))
+        return finish_check_report(report, log)
+    
+    for bay, state in states.items():
+        report["bays"][bay] = {"rows": state.rows, "bins": len(state.bins)}
+        if report["truncated"]:
+            continue
+        
+        _, completeness = state.completeness(bay)
+        log.extend(completeness)
+        log.extend(height_mismatch_diagnostics(state.level_heights, bay))
+    
+    return finish_check_report(report, log)
+
+
+def finish_check_report(report: dict, log: DiagnosticLog) -> dict:
+    by_severity = log.by_severity()
+    report["errors"] = by_severity[ERROR]
+    report["warnings"] = by_severity[WARNING]
+    report["diagnostics"] = log.to_dict()
+    return report
+
+
+def check_exit_code(report: dict) -> int:
+    """Map a check report to the --check exit code"""
+    if report["diagnostics"]["by_severity"][CRITICAL]:
+        return EXIT_CRITICAL
+    if report["errors"] or report["truncated"]:
+        return EXIT_ERRORS
+    return EXIT_OK
+
+
+def run_check(filepath: str, sheet_name: str = None, max_errors: int = 0, report_path: str = None,
+              max_examples: int = 20) -> int:
+    """--check entry point: JSON report to report_path (or stdout), summary to stderr"""
+    report = check_file(filepath, sheet_name, max_errors, max_examples)
+    exit_code = check_exit_code(report)
+    report["exit_code"] = exit_code
+    
+    if report_path:
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    
+    status = "✓" if exit_code == EXIT_OK else "✗"
+    stopped = " (stopped at --max-errors)" if report["truncated"] else ""
+    print(f"{status} {filepath}: {report['rows']} rows, {len(report['bays'])} bays, "
+          f"{report['errors']} errors, {report['warnings']} warnings{stopped}", file=sys.stderr)
+    
+    return exit_code
+
+
+# ============================================================================
+# STREAMING (CONSTANT-MEMORY) MODE
+# ============================================================================
+
+def stream_process(filepath: str, config: Config, output_dir: str, sheet_name: str = None,
+                   fmt: str = 'json', chunk_size: int = 1000, max_examples: int = 20,
+                   instances: bool = False, shards: bool = False):
+    """
+    Generate bay files in two streaming passes without holding the sheet.
+    
+    Pass 1 folds every row into a BayScanState (height model inputs,
+    completeness counts, seen bins) and counts the containers/racks each bay
+    will produce so the metadata header can be written up front. Pass 2
+    re-reads the rows, builds each container as soon as its bay's height
+    model is known and hands it to a BayFileWriter, which flushes every
+    chunk_size records. Only per-bay aggregates, capped diagnostics and the
+    seen-bin set stay in memory; containers and the to_dict tree never
+    accumulate.
+    
+    Output matches process_excel + save_results for the same rows (fmt='json').
+    With instances=True each bay also gets an instancing batch file; the
+    batches keep one id and translation per container, so memory is no
+    longer flat in that case. The same holds for shards=True (per-rack
+    SlotRecord files), which keeps one record per container until close.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # ---- Pass 1: scan -------------------------------------------------------
+    states = defaultdict(BayScanState)
+    row_logs = defaultdict(lambda: DiagnosticLog(max_examples))  # bay -> NON_NUMERIC_VALUE
+    container_counts = defaultdict(int)
+    rack_rows = defaultdict(set)
+    buildings, bays, present = {}, {}, set()
+    
+    with RowStream(filepath, sheet_name) as stream:
+        print(f"  Streaming: '{filepath}'" + (f" sheet '{stream.sheet}'" if stream.sheet else ""))
+        load_diagnostics = stream.diagnostics
+        if is_fatal(load_diagnostics):
+            save_results({"UNKNOWN": {"UNKNOWN": load_error_bay(load_diagnostics)}}, output_dir,
+                         instances, shards)
+            return
+        
+        for row in stream:
+            for diagnostic in non_numeric_diagnostics(row):
+                row_logs[diagnostic.bay].add(diagnostic)
+            coerce_numeric(row)
+            building, bay = row.get('BLDG'), row.get('AREA (BAY)')
+            if not is_missing(building):
+                buildings.setdefault(building, None)
+            if is_missing(bay):
+                continue
+            bays.setdefault(bay, None)
+            present.add((building, bay))
+            
+            parsed = parse_bin_name(row.get('Storage Bin'))
+            first = states[bay].add(row, parsed)
+            if (first and parsed is not None and not parsed.get('special')
+                    and not is_missing(row.get('POS X (ft)')) and not is_missing(row.get('POS Y'))):
+                container_counts[bay] += 1
+                rack_rows[bay].add(parsed['row'])
+    
+    # ---- Per-bay height model + writers ------------------------------------
+    height_maps, logs, writers, outputs = {}, {}, defaultdict(list), []
+    empty_writers = []  # incomplete bays: header + errors only, closed at the end
+    batchers = defaultdict(InstanceBatcher)  # bay -> batches, with instances=True
+    sharders = defaultdict(RackSharder)      # bay -> slots per rack, with shards=True
+    
+    for building in buildings:
+        building_key = building.replace(' ', '').lower()  # "BLDG 22" -> "bldg22"
+        for bay in bays:
+            if (building, bay) not in present:
+                continue
+            
+            filename = f"{building_key}_bay{bay}_containers{EXTENSIONS[fmt]}"
+            filepath_out = os.path.join(output_dir, filename)
+            
+            if bay not in logs:
+                logs[bay] = DiagnosticLog(max_examples)
+                is_complete, completeness = states[bay].completeness(bay)
+                logs[bay].extend(completeness)
+                if is_complete:
+                    height_maps[bay], height_diagnostics = states[bay].height_model(bay, config)
+                    logs[bay].extend(height_diagnostics)
+            
+            bay_data = BayData(building=building, bay=bay, diagnostics=logs[bay])
+            if bay not in height_maps:
+                bay_data.errors = [d.message for d in logs[bay].examples[BAY_MISSING_POSITIONS.name]]
+                empty_writers.append((BayFileWriter(filepath_out, bay_data.header_dict(), fmt), bay_data))
+                outputs.append((building_key, filename, bay_data))
+                continue
+            
+            header = bay_data.header_dict(total_containers=container_counts[bay],
+                                          total_racks=len(rack_rows[bay]))
+            writers[bay].append(BayFileWriter(filepath_out, header, fmt, chunk_size))
+            outputs.append((building_key, filename, bay_data))
+    
+    # ---- Pass 2: geometry -> writers ---------------------------------------
+    racks = defaultdict(RackAccumulator)
+    
+    with RowStream(filepath, sheet_name) as stream:
+        for row in stream:
+            bay = row.get('AREA (BAY)')
+            if bay not in writers:
+                continue
+            
+            # First occurrence only: the seen-bin set from pass 1 drains as we go
+            bin_name = row.get('Storage Bin')
+            pending = states[bay].bins
+            key = None if is_missing(bin_name) else bin_name
+            if key not in pending:
+                continue
+            pending.discard(key)
+            
+            container, diagnostic = build_container(coerce_numeric(row), height_maps[bay], config)
+            if diagnostic:
+                logs[bay].add(diagnostic)
+            if container:
+                racks[bay].add(container)
+                record = container.to_dict()
+                for writer in writers[bay]:
+                    writer.write_container(record)
+                if instances:
+                    batchers[bay].add(record)
+                if shards:
+                    sharders[bay].add(record)
+    
+    # ---- Close files + summary ---------------------------------------------
+    # Header diagnostics, then the bay's non-numeric cells: the order process_excel logs them in
+    for bay, log in logs.items():
+        log.extend(load_diagnostics)
+        log.merge(row_logs[bay])
+    
+    rack_dicts = {}
+    for bay, bay_writers in writers.items():
+        rack_dicts[bay] = [r.to_dict() for r in racks[bay].racks()]
+        for writer in bay_writers:
+            writer.close(racks=rack_dicts[bay], errors=[], diagnostics=dict(logs[bay].counts),
+                         warnings=logs[bay].example_messages())
+    for writer, bay_data in empty_writers:
+        writer.close(racks=[], errors=bay_data.errors, diagnostics=dict(bay_data.diagnostics.counts),
+                     warnings=bay_data.diagnostics.example_messages())
+    
+    for building_key, filename, bay_data in outputs:
+        if instances:
+            save_instances(batchers[bay_data.bay].to_dict(bay_data.building, bay_data.bay),
+                           os.path.join(output_dir, instances_filename(building_key, bay_data.bay)))
+        if shards:
+            sharders[bay_data.bay].write(os.path.join(output_dir, shards_dirname(building_key, bay_data.bay)),
+                                         bay_data.building, bay_data.bay, rack_dicts.get(bay_data.bay, []))
+        diag_file = save_diagnostics(bay_data, output_dir, building_key)
+        if bay_data.errors:
+            print_bay_summary(filename, 0, 0, bay_data.errors, bay_data.diagnostics, diag_file)
+        else:
+            print_bay_summary(filename, container_counts[bay_data.bay], len(rack_rows[bay_data.bay]),
+                              [], bay_data.diagnostics, diag_file)
 
 
 # ============================================================================
@@ -733,9 +1400,9 @@ def save_results(results: Dict[str, Dict[str, BayData]], output_dir: str):
 
 def main():
     parser = argparse.ArgumentParser(
-        description='Generate warehouse container JSON files from Excel inventory data'
+        description='Generate warehouse container JSON files from Excel/CSV inventory data'
     )
-    parser.add_argument('input_file', help='Input Excel file path')
+    parser.add_argument('input_file', help='Input Excel (.xlsx) or CSV file path')
     parser.add_argument('--output-dir', '-o', default='./output', 
                        help='Output directory for JSON files')
     parser.add_argument('--sheet', '-s', default=None,
@@ -744,9 +1411,35 @@ def main():
                        help='Shelf thickness in inches (default: 3.0)')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Verbose output')
+    parser.add_argument('--check', action='store_true',
+                       help='Validate only: stream rows through parsing, completeness and '
+                            'height checks without generating output')
+    parser.add_argument('--max-errors', type=int, default=0,
+                       help='With --check, stop after this many errors (default: 0 = no limit)')
+    parser.add_argument('--report', default=None,
+                       help='With --check, write the JSON report here instead of stdout')
+    parser.add_argument('--stream', action='store_true',
+                       help='Constant-memory mode: stream rows in two passes and write '
+                            'containers incrementally')
+    parser.add_argument('--format', choices=FORMATS, default='json',
+                       help='With --stream, output format: json (same as normal run) or jsonl')
+    parser.add_argument('--chunk-size', type=int, default=1000,
+                       help='With --stream, containers buffered per write (default: 1000)')
+    parser.add_argument('--max-examples', type=int, default=20,
+                       help='Example records kept per diagnostic code (default: 20, 0 = all)')
+    parser.add_argument('--instances', action='store_true',
+                       help='Also write {building}_bay{bay}_instances.json: containers grouped '
+                            'into instancing batches by dimensions for the viewer')
+    parser.add_argument('--shards', action='store_true',
+                       help='Also write {building}_bay{bay}_racks/: one SlotRecord file per rack '
+                            'plus index.json with rack bounds and shard sizes')
     
     args = parser.parse_args()
     
+    if args.check:
+        sys.exit(run_check(args.input_file, args.sheet, args.max_errors, args.report,
+                           args.max_examples))
+    
     # Initialize config
     config = Config(shelf_thickness_inches=args.shelf_thickness)
     
@@ -755,11 +1448,19 @@ def main():
           f"level_1_offset={config.level_1_floor_offset_inches}in")
     print()
     
+    if args.stream:
+        stream_process(args.input_file, config, args.output_dir, args.sheet,
+                       args.format, args.chunk_size, args.max_examples, args.instances,
+                       args.shards)
+        print()
+        print(f"Output saved to: {args.output_dir}/")
+        return
+    
     # Process
-    results = process_excel(args.input_file, config, args.sheet)
+    results = process_excel(args.input_file, config, args.sheet, args.max_examples)
     
     # Save
-    save_results(results, args.output_dir)
+    save_results(results, args.output_dir, args.instances, args.shards)
     
     print()
     print(f"Output saved to: {args.output_dir}/")
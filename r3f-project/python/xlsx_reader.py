@@ -0,0 +1,189 @@
+"""
+Minimal streaming .xlsx reader (standard library only)
+
+Reads cell values row by row straight from the sheet XML, which is about
+twice as fast as openpyxl's read-only mode for plain data sheets. Finished
+rows are dropped from the tree, so memory stays flat. Only what the bay
+sheets need is supported: shared/inline strings, numbers and booleans. Formulas yield their cached
+value; styles (dates, number formats) are ignored. ISO 8601 date cells (t="d")
+become datetimes, as openpyxl returns them; other cell types (errors) and
+malformed numbers come back as their text.
+
+Usage:
+    names = sheet_names("input.xlsx")
+    for values in iter_sheet_rows("input.xlsx", names[0]):
+        ...  # list of cell values, None for empty cells
+"""
+
+import posixpath
+import zipfile
+from datetime import datetime
+from typing import Any, Iterator, List, Optional
+from xml.etree.ElementTree import Element, ParseError, TreeBuilder, XMLParser, fromstring, iterparse
+
+NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+_SHEET_DATA = f'{NS_MAIN}sheetData'
+_CELL = f'{NS_MAIN}c'
+_VALUE = f'{NS_MAIN}v'
+_INLINE = f'{NS_MAIN}is'
+_TEXT = f'{NS_MAIN}t'
+
+# What reading a missing, non-zip or malformed workbook can raise
+READ_ERRORS = (OSError, zipfile.BadZipFile, ParseError)
+
+
+def _read_xml(zf: zipfile.ZipFile, name: str):
+    try:
+        return fromstring(zf.read(name))
+    except KeyError:
+        raise zipfile.BadZipFile(f"{name} is missing - not an .xlsx workbook") from None
+
+
+def _sheet_paths(zf: zipfile.ZipFile) -> dict:
+    """Sheet name -> path of its XML part inside the archive"""
+    workbook = _read_xml(zf, 'xl/workbook.xml')
+    rels = _read_xml(zf, 'xl/_rels/workbook.xml.rels')
+    targets = {r.get('Id'): r.get('Target') for r in rels.iter(f'{NS_PKG_REL}Relationship')}
+
+    paths = {}
+    for sheet in workbook.iter(f'{NS_MAIN}sheet'):
+        target = targets[sheet.get(f'{NS_REL}id')]
+        # Targets are relative to xl/ unless absolute
+        path = target.lstrip('/') if target.startswith('/') else posixpath.join('xl', target)
+        paths[sheet.get('name')] = posixpath.normpath(path)
+    return paths
+
+
+def _shared_strings(zf: zipfile.ZipFile) -> List[str]:
+    if 'xl/sharedStrings.xml' not in zf.namelist():
+        return []
+    strings = []
+    for _, elem in iterparse(zf.open('xl/sharedStrings.xml')):
+        if elem.tag == f'{NS_MAIN}si':
+            # Rich text is split into runs - join every <t>
+            strings.append(''.join(t.text or '' for t in elem.iter(f'{NS_MAIN}t')))
+            elem.clear()
+    return strings
+
+
+def _column_index(ref: str) -> int:
+    """'G12' -> 6"""
+    index = 0
+    for ch in ref:
+        if ch.isdigit():
+            break
+        index = index * 26 + (ord(ch) - 64)
+    return index - 1
+
+
+def _number(text: str) -> Any:
+    """Integers stay int (as openpyxl returns them), other numbers float, anything else the text"""
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _date(text: str) -> Any:
+    """ISO 8601 date cell -> datetime, the text if it does not parse"""
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return text
+
+
+def sheet_names(filepath: str) -> List[str]:
+    """Sheet names in workbook order"""
+    with zipfile.ZipFile(filepath) as zf:
+        return list(_sheet_paths(zf))
+
+
+def _row_values(row, strings: List[str]) -> List[Any]:
+    """Cell values of one <row> element, None for gaps"""
+    values: List[Any] = []
+    for cell in row.iter(_CELL):
+        ref = cell.get('r')
+        col = _column_index(ref) if ref else len(values)
+        cell_type = cell.get('t', 'n')
+
+        if cell_type == 'inlineStr':
+            inline = cell.find(_INLINE)
+            value = ''.join(t.text or '' for t in inline.iter(_TEXT)) if inline is not None else None
+        else:
+            v = cell.find(_VALUE)
+            text = v.text if v is not None else None
+            if text is None:
+                value = None
+            elif cell_type == 's':
+                value = strings[int(text)]
+            elif cell_type == 'b':
+                value = text == '1'
+            elif cell_type == 'n':
+                value = _number(text)
+            elif cell_type == 'd':
+                value = _date(text)
+            else:
+                # 'str', 'e' (error) and anything else: keep the text
+                value = text
+
+        if col >= len(values):
+            values.extend([None] * (col - len(values) + 1))
+        values[col] = value
+    return values
+
+
+def iter_sheet_rows(filepath: str, sheet_name: Optional[str] = None,
+                    chunk_size: int = 1 << 16) -> Iterator[List[Any]]:
+    """
+    Yield each row of a sheet as a list of cell values (None for empty cells).
+
+    Rows missing from the XML (fully empty) are yielded as empty lists so row
+    numbering is preserved. Defaults to the first sheet.
+    """
+    with zipfile.ZipFile(filepath) as zf:
+        paths = _sheet_paths(zf)
+        path = paths[sheet_name] if sheet_name else next(iter(paths.values()))
+        strings = _shared_strings(zf)
+
+        # The XML is fed in chunks; after each chunk every <row> under
+        # <sheetData> except the last is complete, so those are yielded and
+        # removed from the tree. This keeps memory flat and avoids the cost of
+        # per-element iterparse events.
+        sheet_data = []
+
+        def element_factory(tag, attrib):
+            elem = Element(tag, attrib)
+            if tag == _SHEET_DATA:
+                sheet_data.append(elem)
+            return elem
+
+        parser = XMLParser(target=TreeBuilder(element_factory=element_factory))
+        expected_row = 1
+
+        def drain(keep_last: bool):
+            nonlocal expected_row
+            if not sheet_data:
+                return
+            rows = sheet_data[0][:-1] if keep_last else sheet_data[0][:]
+            del sheet_data[0][:len(rows)]
+            for row in rows:
+                row_number = int(row.get('r', expected_row))
+                while expected_row < row_number:
+                    yield []
+                    expected_row += 1
+                yield _row_values(row, strings)
+                expected_row = row_number + 1
+
+        with zf.open(path) as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                parser.feed(chunk)
+                yield from drain(keep_last=True)
+        parser.close()
+        yield from drain(keep_last=False)
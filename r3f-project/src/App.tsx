@@ -10,6 +10,7 @@ import rawInventory from "./data/inventory.json";
 import type { Inventory } from "../src/types/Inventory";
 import type { InventoryApi } from "./types/InventoryApi";
 import { mapInventory } from "./utils/mapInventory";
+import { useLiveFill } from "./utils/liveOccupancy";
 import { InventoryDropdown } from "./components/InventoryDropdown";
 import companyLogo from "../src/assets/ccsoft_logo_opt.png"
 import { Compass } from "./components/Compass";
@@ -152,13 +153,19 @@ export default function App() {
   // ─────────────────────────────────────────────────
   // Inventory
   // ─────────────────────────────────────────────────
-  const inventoryItems: Inventory[] = useMemo(() => {
+  // Every record in export order (search index ids are positions here), then the usable ones
+  const inventoryRecords: Inventory[] = useMemo(() => {
     const apiItems: InventoryApi[] = Array.isArray(rawInventory)
       ? (rawInventory as InventoryApi[])
       : [rawInventory as InventoryApi];
-    return apiItems.map(mapInventory).filter((x) => x.ok);
+    return apiItems.map(mapInventory);
   }, []);
 
+  const inventoryItems: Inventory[] = useMemo(
+    () => inventoryRecords.filter((x) => x.ok),
+    [inventoryRecords]
+  );
+
   const [selectedSku, setSelectedSku] = useState<string>(
     inventoryItems[0]?.sku ?? ""
   );
@@ -176,6 +183,10 @@ export default function App() {
     return map;
   }, [inventoryItems]);
 
+  // Live fill levels from python/live_occupancy.py when VITE_OCCUPANCY_URL is set
+  // (e.g. http://127.0.0.1:8765/events); otherwise the inventory.json snapshot as is
+  const liveFillByLocation = useLiveFill(import.meta.env.VITE_OCCUPANCY_URL, fillByLocation);
+
   // ─────────────────────────────────────────────────
   // itemsByLocation — binId → Inventory[]
   // All items that share a bin are grouped here so the
@@ -194,9 +205,18 @@ export default function App() {
     return map;
   }, [inventoryItems]);
 
+  // sku → item, built once instead of a linear find() per selection
+  const inventoryBySku = useMemo(() => {
+    const map = new Map<string, Inventory>();
+    for (const item of inventoryItems) {
+      if (!map.has(item.sku)) map.set(item.sku, item);
+    }
+    return map;
+  }, [inventoryItems]);
+
   const selectedInventory = useMemo(
-    () => inventoryItems.find((x) => x.sku === selectedSku),
-    [inventoryItems, selectedSku]
+    () => inventoryBySku.get(selectedSku),
+    [inventoryBySku, selectedSku]
   );
 
   return (
@@ -214,8 +234,10 @@ export default function App() {
           <div style={{ display: "grid", gap: 12 }}>
             <InventoryDropdown
               items={inventoryItems}
+              records={inventoryRecords}
               selectedSku={selectedSku}
               onChangeSku={setSelectedSku}
+              searchIndexUrl={`${import.meta.env.BASE_URL}inventory_index.json`}
             />
 
             {selectedInventory && (
@@ -321,7 +343,7 @@ export default function App() {
                 selection={selection}
                 setSelection={setSelection}
                 onCameraUpdate={handleCameraUpdate}
-                fillByLocation={fillByLocation}
+                fillByLocation={liveFillByLocation}
                 itemsByLocation={itemsByLocation}   
               />
             )}
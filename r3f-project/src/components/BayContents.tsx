@@ -1,18 +1,20 @@
 // src/components/BayContents.tsx
 import * as THREE from "three";
-import { useMemo } from "react";
+import { useEffect, useMemo, useState } from "react";
 import { SpawnInBay } from "../functions/SpawnInBay";
 import { SlotContainer } from "./SlotContainer";
 import { RackHitboxes } from "./RackHitboxes";
+import { InstancedSlots } from "./InstancedSlots";
 import { getCameraForRack, getCameraForSlot } from "../utils/rackUtils";
 import type { ViewMode, Selection } from "../types/viewTypes";
-import type { BayData, SlotRecord } from "../types/slotTypes";
+import type { BayData, BayInstances, SlotRecord } from "../types/slotTypes";
 import type { Inventory } from "../types/Inventory";
 import {
   processBayData,
   filterSlotsByRack,
   parseRackId,
 } from "../utils/bayDataUtils";
+import { fetchRackShard } from "../utils/rackShards";
 
 type BayTransform = {
   position: THREE.Vector3;
@@ -33,6 +35,9 @@ type Props = {
   }) => void;
   fillByLocation: Map<string, number>;
   itemsByLocation: Map<string, Inventory[]>;
+  instances?: BayInstances;  // *_instances.json — draws all slots in bay view, a few draw calls
+  slotsInBayView?: boolean;  // opt-in: bay view shows racks only unless set (instanced boxes have no cage edges)
+  rackShardsUrl?: string;    // {building}_bay{bay}_racks/ — rack view fetches only the selected rack
 };
 
 function normalizeRackRef(ref: string): string {
@@ -50,6 +55,9 @@ export function BayContents({
   onCameraUpdate,
   fillByLocation,
   itemsByLocation,
+  instances,
+  slotsInBayView = false,
+  rackShardsUrl,
 }: Props) {
   const { slots, hitboxes } = useMemo(() => processBayData(bayData), [bayData]);
    bayId == null;
@@ -64,6 +72,17 @@ export function BayContents({
     return parsed ? normalizeRackRef(parsed) : null;
   }, [selection.rackId]);
 
+  // Selected rack's slots from its shard file, when shards are configured
+  const [shard, setShard] = useState<{ rackRef: string; slots: SlotRecord[] } | null>(null);
+  useEffect(() => {
+    if (!rackShardsUrl || !selectedRackRef) return;
+    let cancelled = false;
+    fetchRackShard(rackShardsUrl, selectedRackRef)
+      .then((rackSlots) => { if (!cancelled) setShard({ rackRef: selectedRackRef, slots: rackSlots }); })
+      .catch((err) => console.warn(`[BayContents] Rack shard ${selectedRackRef} failed to load:`, err));
+    return () => { cancelled = true; };
+  }, [rackShardsUrl, selectedRackRef]);
+
   const handleRackClick = (rackRef: string) => {
     const normalizedRef = normalizeRackRef(rackRef);
     const rackId = `rack-${normalizedRef}`;
@@ -88,15 +107,17 @@ export function BayContents({
   const showRackHitboxes    = viewMode === "bay";
   const showGhostRacks      = viewMode === "bay";
   const showContainers      = viewMode === "rack" || viewMode === "slot";
+  const showInstancedSlots  = viewMode === "bay" && slotsInBayView;
   const showSlotLabels      = viewMode === "rack";
   const slotsAreInteractive = viewMode === "rack";
 
   const visibleSlots = useMemo(() => {
+    const shardSlots = shard && shard.rackRef === selectedRackRef ? shard.slots : null;
     let filtered: SlotRecord[];
     if (viewMode === "slot" && selection.slotId) {
-      filtered = slots.filter((s) => s.id === selection.slotId);
+      filtered = (shardSlots ?? slots).filter((s) => s.id === selection.slotId);
     } else if (viewMode === "rack" && selectedRackRef) {
-      filtered = filterSlotsByRack(slots, selectedRackRef);
+      filtered = shardSlots ?? filterSlotsByRack(slots, selectedRackRef);
     } else {
       return [];
     }
@@ -104,7 +125,7 @@ export function BayContents({
       ...s,
       fillPct: fillByLocation.get(s.id) ?? 0,
     }));
-  }, [slots, viewMode, selection.slotId, selectedRackRef, fillByLocation]);
+  }, [slots, shard, viewMode, selection.slotId, selectedRackRef, fillByLocation]);
 
   return (
     <group>
@@ -129,6 +150,12 @@ export function BayContents({
         </SpawnInBay>
       )}
 
+      {showInstancedSlots && instances && (
+        <SpawnInBay bayTransform={bayTransform} localPos={[0, 0, 0]}>
+          <InstancedSlots instances={instances} fillByLocation={fillByLocation} />
+        </SpawnInBay>
+      )}
+
       {viewMode === "rack" && (
         <SpawnInBay bayTransform={bayTransform} localPos={[0, 0, 0]}>
           {hitboxes
@@ -2,13 +2,13 @@
 // No GLB — geometry is fully config-driven from buildingConfigs + bay JSON data.
 
 import * as THREE from "three";
-import { useMemo, useEffect } from "react";
+import { useMemo, useEffect, useState } from "react";
 import { Html } from "@react-three/drei";
 import { Interactable } from "../interaction/Interactable";
 import { BayContents } from "../components/BayContents";
 import { BayMapLayer } from "../components/BayMapLayer";
 import type { ViewMode, Selection } from "../types/viewTypes";
-import type { BayData, MapLayerData } from "../types/slotTypes";
+import type { BayData, BayInstances, MapLayerData } from "../types/slotTypes";
 import type { Inventory } from "../types/Inventory";
 import { validateBayData, extractMapLayer } from "../utils/bayDataUtils";
 import {
@@ -17,12 +17,28 @@ import {
   getBayWorldOrigin,
 } from "../controllers/buildingConfigs";
 
-import bay00NWData from "../data/BLDG-template-Bay00.json";
-
 const BUILDING_ID = "bldg-00";
 
-const BAY_DATA: Record<string, BayData> = {
-  "BAY_00_NW": bay00NWData as unknown as BayData,
+// Bay files are dynamic imports, so Vite splits each into its own chunk and the
+// main bundle does not carry them; they load when the model mounts
+const BAY_DATA_LOADERS: Record<string, () => Promise<{ default: unknown }>> = {
+  "BAY_00_NW": () => import("../data/BLDG-template-Bay00.json"),
+};
+
+// Instancing batches: bay view draws every slot in a few draw calls
+// (python/instancing.py ../src/data/BLDG-template-Bay00.json -o ../src/data)
+const BAY_INSTANCE_LOADERS: Record<string, () => Promise<{ default: unknown }>> = {
+  "BAY_00_NW": () => import("../data/bldg-template_bay00_instances.json"),
+};
+
+// Off by default so bay view keeps its racks-only look; VITE_BAY_SLOTS=1 turns it on
+// (the instancing batches are only fetched then)
+const SLOTS_IN_BAY_VIEW = import.meta.env.VITE_BAY_SLOTS === "1";
+
+// Per-rack shard folders under public/ (python/rack_shards.py ../src/data/BLDG-template-Bay00.json
+// -o ../public/data): rack view fetches only the selected rack
+const BAY_RACK_SHARDS: Record<string, string> = {
+  "BAY_00_NW": `${import.meta.env.BASE_URL}data/bldg-template_bay00_racks`,
 };
 
 type BayTransform = { position: THREE.Vector3; rotation: THREE.Euler };
@@ -53,18 +69,34 @@ export function Bldg00Model({
   const buildingCfg = getBuildingConfig(BUILDING_ID)!;
   const activeBays  = getActiveBays(BUILDING_ID);
 
+  const [bayData, setBayData] = useState<Record<string, BayData>>({});
+  const [bayInstances, setBayInstances] = useState<Record<string, BayInstances>>({});
+
   useEffect(() => {
-    for (const [id, data] of Object.entries(BAY_DATA)) {
-      if (!validateBayData(data)) console.warn(`[Bldg00] JSON shape mismatch for ${id}`);
+    let cancelled = false;
+    for (const [id, load] of Object.entries(BAY_DATA_LOADERS)) {
+      load().then(({ default: json }) => {
+        const data = json as BayData;
+        if (!validateBayData(data)) console.warn(`[Bldg00] JSON shape mismatch for ${id}`);
+        if (!cancelled) setBayData((prev) => ({ ...prev, [id]: data }));
+      });
     }
+    if (SLOTS_IN_BAY_VIEW) {
+      for (const [id, load] of Object.entries(BAY_INSTANCE_LOADERS)) {
+        load().then(({ default: json }) => {
+          if (!cancelled) setBayInstances((prev) => ({ ...prev, [id]: json as BayInstances }));
+        });
+      }
+    }
+    return () => { cancelled = true; };
   }, []);
 
   const baysAreInteractive = viewMode === "building";
   const activeBayId   = selection.bayId ?? null;
-  const activeBayData = activeBayId ? BAY_DATA[activeBayId] : null;
+  const activeBayData = activeBayId ? bayData[activeBayId] : null;
 
   const allBayMapLayers = useMemo<BayMapEntry[]>(() => {
-    return Object.entries(BAY_DATA).flatMap(([bayId, data]) => {
+    return Object.entries(bayData).flatMap(([bayId, data]) => {
       const wo = getBayWorldOrigin(BUILDING_ID, bayId);
       if (!wo) return [];
       return [{
@@ -76,7 +108,7 @@ export function Bldg00Model({
         },
       }];
     });
-  }, []);
+  }, [bayData]);
 
   const activeBayTransform = useMemo<BayTransform | null>(() => {
     if (!activeBayId) return null;
@@ -209,6 +241,9 @@ export function Bldg00Model({
           onCameraUpdate={onCameraUpdate}
           fillByLocation={fillByLocation}
           itemsByLocation={itemsByLocation}  // ← new
+          instances={bayInstances[activeBayId]}
+          slotsInBayView={SLOTS_IN_BAY_VIEW}
+          rackShardsUrl={BAY_RACK_SHARDS[activeBayId]}
         />
       )}
     </>
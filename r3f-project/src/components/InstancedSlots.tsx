@@ -0,0 +1,105 @@
+// src/components/InstancedSlots.tsx
+// Draws every container of a bay from *_instances.json (warehouse_generator_v2.py --instances).
+// One batch = one container size → one shell + one fill InstancedMesh, so a bay costs
+// 2 draw calls per distinct size instead of ~8–10 per slot with SlotContainer.
+// Fill height and color are set per instance from fillByLocation.
+
+import * as THREE from "three";
+import { useLayoutEffect, useRef } from "react";
+import type { ThreeEvent } from "@react-three/fiber";
+import { getFillColor } from "./SlotContainer";
+import type { BayInstances, RawInstanceBatch } from "../types/slotTypes";
+
+type Props = {
+  instances: BayInstances;
+  fillByLocation: Map<string, number>;
+  shrinkPct?: number;
+  onSlotClick?: (slotId: string) => void;
+};
+
+type BatchProps = {
+  batch: RawInstanceBatch;
+  ids: string[];
+  fillByLocation: Map<string, number>;
+  shrinkPct: number;
+  onSlotClick?: (slotId: string) => void;
+};
+
+// Matches SlotContainerVisual
+const SHELL_OPACITY = 0.82;
+const FILL_OPACITY = 0.82;
+
+function InstancedBatch({ batch, ids, fillByLocation, shrinkPct, onSlotClick }: BatchProps) {
+  const shellRef = useRef<THREE.InstancedMesh>(null!);
+  const fillRef = useRef<THREE.InstancedMesh>(null!);
+
+  const w = batch.dimensions.x * shrinkPct;
+  const h = batch.dimensions.y * shrinkPct;
+  const d = batch.dimensions.z * shrinkPct;
+
+  useLayoutEffect(() => {
+    const matrix = new THREE.Matrix4();
+    const rotation = new THREE.Quaternion();
+    const position = new THREE.Vector3();
+    const scale = new THREE.Vector3();
+    const color = new THREE.Color();
+    const t = batch.translations;
+
+    for (let i = 0; i < batch.count; i++) {
+      position.set(t[3 * i], t[3 * i + 1], t[3 * i + 2]);
+      shellRef.current.setMatrixAt(i, matrix.compose(position, rotation, scale.set(1, 1, 1)));
+
+      // Fill box is full height in the geometry, scaled down and resting on the shell floor
+      const fill = Math.max(0, Math.min(1, fillByLocation.get(ids[batch.indices[i]]) ?? 0));
+      position.y = t[3 * i + 1] - h / 2 + (h * fill) / 2;
+      fillRef.current.setMatrixAt(i, matrix.compose(position, rotation, scale.set(1, fill, 1)));
+      fillRef.current.setColorAt(i, color.set(getFillColor(fill)));
+    }
+
+    shellRef.current.instanceMatrix.needsUpdate = true;
+    fillRef.current.instanceMatrix.needsUpdate = true;
+    if (fillRef.current.instanceColor) fillRef.current.instanceColor.needsUpdate = true;
+  }, [batch, ids, fillByLocation, h]);
+
+  const handleClick = onSlotClick
+    ? (e: ThreeEvent<MouseEvent>) => {
+        if (e.instanceId === undefined) return;
+        e.stopPropagation();
+        onSlotClick(ids[batch.indices[e.instanceId]]);
+      }
+    : undefined;
+
+  return (
+    <group>
+      <instancedMesh ref={shellRef} args={[undefined, undefined, batch.count]} onClick={handleClick}>
+        <boxGeometry args={[w * 0.99, h * 0.995, d * 0.99]} />
+        <meshStandardMaterial color="#ffffff" transparent opacity={SHELL_OPACITY} depthWrite={false} />
+      </instancedMesh>
+
+      <instancedMesh ref={fillRef} args={[undefined, undefined, batch.count]} raycast={() => null}>
+        <boxGeometry args={[w * 0.99, h, d * 0.99]} />
+        <meshStandardMaterial color="#ffffff" transparent opacity={FILL_OPACITY} />
+      </instancedMesh>
+    </group>
+  );
+}
+
+export function InstancedSlots({ instances, fillByLocation, shrinkPct = 0.92, onSlotClick }: Props) {
+  return (
+    <group>
+      {instances.batches.map((batch) => {
+        const { x, y, z } = batch.dimensions;
+        return (
+          <InstancedBatch
+            key={`${x}x${y}x${z}`}
+            batch={batch}
+            ids={instances.ids}
+            fillByLocation={fillByLocation}
+            shrinkPct={shrinkPct}
+            onSlotClick={onSlotClick}
+          />
+        );
+      })}
+    </group>
+  );
+}
@@ -1,19 +1,63 @@
 //InventoryDropDown.tsx
 
-
+import { useEffect, useMemo, useState } from "react";
 import type { Inventory } from "../types/Inventory";
+import { loadSearchIndex, search, type SearchIndexData } from "../utils/searchIndex";
 
 type Props = {
   items: Inventory[];
+  // Every mapped record, in inventory.json order; the search index's record ids point here
+  records: Inventory[];
   selectedSku: string;
   onChangeSku: (sku: string) => void;
+  searchIndexUrl?: string;
 };
 
-export function InventoryDropdown({ items, selectedSku, onChangeSku }: Props) {
+const MAX_RESULTS = 50;
+
+export function InventoryDropdown({ items, records, selectedSku, onChangeSku, searchIndexUrl }: Props) {
+  const [query, setQuery] = useState("");
+  const [index, setIndex] = useState<SearchIndexData>();
+
+  useEffect(() => {
+    if (!searchIndexUrl) return;
+    let cancelled = false;
+    loadSearchIndex(searchIndexUrl).then((data) => {
+      // An index built from another export would point at the wrong records
+      if (!cancelled && data && data.count === records.length) setIndex(data);
+    });
+    return () => { cancelled = true; };
+  }, [searchIndexUrl, records.length]);
+
+  // Prefix match on sku / part / inventory number / bin
+  const matches = useMemo(() => {
+    const q = query.trim().toUpperCase();
+    if (!q) return items;
+    if (index) {
+      return search(index, q, MAX_RESULTS).map((id) => records[id]).filter((it) => it?.ok);
+    }
+    // No index (file not generated): walk the list
+    return items.filter((it) =>
+      [it.sku, it.skuPart, it.inventoryNumber, it.binId].some((v) => v.toUpperCase().startsWith(q))
+    ).slice(0, MAX_RESULTS);
+  }, [query, index, items, records]);
+
+  // Keep the current selection listed so the select does not jump to a filtered-out value
+  const selected = items.find((it) => it.sku === selectedSku);
+  const options = selected && !matches.includes(selected) ? [selected, ...matches] : matches;
+
   return (
     <label style={{ display: "grid", gap: 6 }}>
       <span style={{ fontSize: 12, opacity: 0.8 }}>Inventory</span>
 
+      <input
+        type="search"
+        value={query}
+        onChange={(e) => setQuery(e.target.value)}
+        placeholder="Search SKU, part, inventory # or bin"
+        style={{ padding: 8, borderRadius: 6 }}
+      />
+
       <select
         value={selectedSku}
         onChange={(e) => onChangeSku(e.target.value)}
@@ -21,7 +65,7 @@ export function InventoryDropdown({ items, selectedSku, onChangeSku }: Props) {
       >
         <option value="">Please select...</option>
 
-        {items.map((it) => (
+        {options.map((it) => (
           <option key={it.sku} value={it.sku}>
             {it.skuPart} — bin {it.binId} (qty {it.availableQty})
           </option>
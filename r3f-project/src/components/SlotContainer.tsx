@@ -24,7 +24,7 @@ type Props = {
 };
 
 // ── Fill level color — discrete bands ──────────────────────────────────────
-function getFillColor(fillPct: number): string {
+export function getFillColor(fillPct: number): string {
   if (fillPct <= 0) return "#22c55e";
   if (fillPct < 0.33) return "#22c55e";
   if (fillPct < 0.55) return "#84cc16";
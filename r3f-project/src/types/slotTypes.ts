@@ -118,7 +118,58 @@ export type BayData = {
   rack_hitboxes?: RawRackHitbox[];
   containers: RawContainer[];
   errors?: string[];
-  warnings?: string[];
+  warnings?: string[];        // deprecated: example messages only (capped per code); read diagnostics
+  diagnostics?: Record<string, number>;  // diagnostic code -> count
+};
+
+/** One instancing batch from *_instances.json - all containers of one size */
+export type RawInstanceBatch = {
+  dimensions: Vec3;
+  count: number;
+  translations: number[];  // box centers, 3 floats per instance
+  indices: number[];       // instance -> BayInstances.ids index
+};
+
+/** warehouse_generator_v2.py --instances output */
+export type BayInstances = {
+  building: string;
+  bay: string;
+  metadata: {
+    total_instances: number;
+    total_batches: number;
+    units: string;
+    translation: "box center";
+  };
+  ids: string[];
+  batches: RawInstanceBatch[];
+};
+
+/** One rack in {building}_bay{bay}_racks/index.json (warehouse_generator_v2.py --shards) */
+export type RackShardEntry = {
+  rackRef: string;    // "01"
+  id: string;         // "R01"
+  file: string;       // shard file, relative to index.json - holds SlotRecord[]
+  count: number;
+  bytes: number;
+  sections: string[];
+  maxLevel: number;
+  bounds: { min: [number, number, number]; max: [number, number, number] };
+  position: [number, number, number];  // center
+  size: [number, number, number];
+};
+
+/** Per-rack shard index - rack bounds and shard sizes, no containers */
+export type RackShardIndex = {
+  building: string;
+  bay: string;
+  metadata: {
+    total_containers: number;
+    total_racks: number;
+    total_bytes: number;
+    units: string;
+    position: "box center";
+  };
+  racks: RackShardEntry[];
 };
 
 // ============================================
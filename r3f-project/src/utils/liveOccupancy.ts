@@ -0,0 +1,51 @@
+// src/utils/liveOccupancy.ts
+// Live fill levels from python/live_occupancy.py (Server-Sent Events on /events):
+//   "snapshot"   { seq, slots: { containerId: { lofull, inavlq } } }      on every (re)connect
+//   "occupancy"  { seq, changes: { containerId: { lofull, inavlq } | null } }   one per batch
+// Values are absolute, so after a reconnect the next snapshot simply replaces what we had.
+import { useEffect, useMemo, useState } from "react";
+
+export type OccupancyRecord = { lofull: number; inavlq: number };
+
+type SnapshotMessage = { seq: number; slots: Record<string, OccupancyRecord> };
+type OccupancyMessage = { seq: number; changes: Record<string, OccupancyRecord | null> };
+
+export function subscribeOccupancy(
+  url: string,
+  onUpdate: (changes: Record<string, OccupancyRecord | null>, reset: boolean) => void,
+): () => void {
+  const source = new EventSource(url);
+  source.addEventListener("snapshot", (e) => {
+    onUpdate((JSON.parse((e as MessageEvent<string>).data) as SnapshotMessage).slots, true);
+  });
+  source.addEventListener("occupancy", (e) => {
+    onUpdate((JSON.parse((e as MessageEvent<string>).data) as OccupancyMessage).changes, false);
+  });
+  return () => source.close();
+}
+
+// fillByLocation with live fill levels laid over it (0–1, like the base map).
+// A cleared container reads as empty. One state update per batch, not per event.
+export function useLiveFill(url: string | undefined, base: Map<string, number>): Map<string, number> {
+  const [live, setLive] = useState<Map<string, number>>(() => new Map());
+
+  useEffect(() => {
+    if (!url) return;
+    return subscribeOccupancy(url, (changes, reset) => {
+      setLive((prev) => {
+        const next = reset ? new Map<string, number>() : new Map(prev);
+        for (const [id, record] of Object.entries(changes)) {
+          next.set(id, record ? record.lofull / 100 : 0);
+        }
+        return next;
+      });
+    });
+  }, [url]);
+
+  return useMemo(() => {
+    if (live.size === 0) return base;
+    const merged = new Map(base);
+    for (const [id, fill] of live) merged.set(id, fill);
+    return merged;
+  }, [base, live]);
+}
@@ -0,0 +1,37 @@
+// src/utils/rackShards.ts
+// Loads per-rack shard files written by warehouse_generator_v2.py --shards:
+//   {building}_bay{bay}_racks/index.json   rack bounds + shard sizes
+//   {building}_bay{bay}_racks/01.json      SlotRecord[] for rack 01
+// Requests are cached per URL, so selecting a rack again costs nothing.
+import type { RackShardIndex, SlotRecord } from "../types/slotTypes";
+
+const cache = new Map<string, Promise<unknown>>();
+
+function fetchJson<T>(url: string): Promise<T> {
+  let pending = cache.get(url) as Promise<T> | undefined;
+  if (!pending) {
+    pending = fetch(url).then((res) => {
+      if (!res.ok) throw new Error(`${res.status} ${res.statusText}: ${url}`);
+      return res.json() as Promise<T>;
+    });
+    // Drop failures so a later selection retries
+    pending.catch(() => cache.delete(url));
+    cache.set(url, pending);
+  }
+  return pending;
+}
+
+function joinUrl(baseUrl: string, file: string): string {
+  return baseUrl.endsWith("/") ? baseUrl + file : `${baseUrl}/${file}`;
+}
+
+export function loadRackShardIndex(baseUrl: string): Promise<RackShardIndex> {
+  return fetchJson<RackShardIndex>(joinUrl(baseUrl, "index.json"));
+}
+
+export async function fetchRackShard(baseUrl: string, rackRef: string): Promise<SlotRecord[]> {
+  const index = await loadRackShardIndex(baseUrl);
+  const entry = index.racks.find((r) => r.rackRef === rackRef);
+  if (!entry) return [];
+  return fetchJson<SlotRecord[]>(joinUrl(baseUrl, entry.file));
+}
@@ -0,0 +1,139 @@
+// src/utils/searchIndex.ts
+// Lookups over the serialized inventory search index (python/search_index.py -o ...).
+// Per field: sorted unique keys + CSR postings of record ids, so a prefix match is two
+// binary searches and one contiguous slice. Record ids are positions in the inventory
+// export the index was built from (before mapInventory/ok filtering).
+
+export type SearchField = "skskun" | "skpart" | "innumb" | "lolocn";
+
+type RawFieldIndex = {
+  keys: string[];        // sorted, unique, upper-cased
+  offsets: number[];     // keys.length + 1
+  ids: number[];         // record ids grouped by key
+  grams?: {
+    n: number;
+    keys: string[];      // sorted grams
+    offsets: number[];
+    positions: number[]; // key positions containing each gram
+  };
+};
+
+export type SearchIndexData = {
+  version: number;
+  count: number;
+  fields: Partial<Record<SearchField, RawFieldIndex>>;
+};
+
+const FORMAT_VERSION = 1;
+
+export function validateSearchIndex(data: unknown): data is SearchIndexData {
+  const d = data as SearchIndexData;
+  return !!d && d.version === FORMAT_VERSION && typeof d.fields === "object";
+}
+
+// First index i with keys[i] >= value
+function lowerBound(keys: string[], value: string, lo = 0): number {
+  let hi = keys.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (keys[mid] < value) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+function slice(f: RawFieldIndex, lo: number, hi: number, limit: number): number[] {
+  const start = f.offsets[lo];
+  const end = Math.min(f.offsets[hi], start + limit);
+  return f.ids.slice(start, end);
+}
+
+export function exactSearch(index: SearchIndexData, field: SearchField, value: string): number[] {
+  const f = index.fields[field];
+  if (!f) return [];
+  const v = value.trim().toUpperCase();
+  const i = lowerBound(f.keys, v);
+  return i < f.keys.length && f.keys[i] === v ? slice(f, i, i + 1, Infinity) : [];
+}
+
+export function prefixSearch(
+  index: SearchIndexData,
+  field: SearchField,
+  prefix: string,
+  limit = 20
+): number[] {
+  const f = index.fields[field];
+  if (!f) return [];
+  const p = prefix.trim().toUpperCase();
+  if (!p) return slice(f, 0, f.keys.length, limit);
+  const lo = lowerBound(f.keys, p);
+  const end = p.slice(0, -1) + String.fromCharCode(p.charCodeAt(p.length - 1) + 1);
+  return slice(f, lo, lowerBound(f.keys, end, lo), limit);
+}
+
+export function substringSearch(
+  index: SearchIndexData,
+  field: SearchField,
+  text: string,
+  limit = 20
+): number[] {
+  const f = index.fields[field];
+  if (!f) return [];
+  const q = text.trim().toUpperCase();
+
+  let candidates: number[];
+  const g = f.grams;
+  if (!g || q.length < g.n) {
+    candidates = [];
+    f.keys.forEach((k, i) => { if (k.includes(q)) candidates.push(i); });
+  } else {
+    const postings: number[][] = [];
+    for (let i = 0; i + g.n <= q.length; i++) {
+      const gram = q.slice(i, i + g.n);
+      const at = lowerBound(g.keys, gram);
+      if (g.keys[at] !== gram) return [];
+      postings.push(g.positions.slice(g.offsets[at], g.offsets[at + 1]));
+    }
+    postings.sort((a, b) => a.length - b.length);
+    candidates = postings[0];
+    for (const other of postings.slice(1)) {
+      const members = new Set(other);
+      candidates = candidates.filter((k) => members.has(k));
+    }
+    candidates = candidates.filter((k) => f.keys[k].includes(q));
+  }
+
+  const out: number[] = [];
+  for (const k of candidates) {
+    for (let j = f.offsets[k]; j < f.offsets[k + 1]; j++) {
+      out.push(f.ids[j]);
+      if (out.length >= limit) return out;
+    }
+  }
+  return out;
+}
+
+const FIELDS: SearchField[] = ["skskun", "skpart", "innumb", "lolocn"];
+
+// Prefix match on every field, de-duplicated in field order (SearchIndex.search in Python)
+export function search(index: SearchIndexData, text: string, limit = 20): number[] {
+  const seen = new Set<number>();
+  for (const field of FIELDS) {
+    for (const id of prefixSearch(index, field, text, limit)) {
+      seen.add(id);
+      if (seen.size >= limit) return [...seen];
+    }
+  }
+  return [...seen];
+}
+
+let pending: Promise<SearchIndexData | undefined> | undefined;
+
+// Fetched once per session; resolves undefined if the file is missing or another version
+export function loadSearchIndex(url: string): Promise<SearchIndexData | undefined> {
+  pending ??= fetch(url)
+    .then((res) => (res.ok ? res.json() : undefined))
+    .then((data) => (validateSearchIndex(data) ? data : undefined))
+    .catch(() => undefined);
+  return pending;
+}